@@ -0,0 +1,266 @@
+"""CFA Tools 框架性能基准 - 使用假的maya.cmds在普通Linux/Windows机器上运行
+
+生成包含 10/100/1000 个插件的临时插件目录 (部分插件在模块级做大量计算，部分插件的
+元数据无法静态读取)，测量 discover_plugins、load_plugin、create_menu、
+show_plugin_manager 等阶段的耗时，结果以JSON输出。
+
+用法:
+    python benchmarks/bench_framework.py --sizes 10 100 --repeat 3 --output bench.json
+    python benchmarks/bench_framework.py --baseline bench.json --tolerance 1.5
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+FRAMEWORK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if FRAMEWORK_DIR not in sys.path:
+    sys.path.insert(0, FRAMEWORK_DIR)
+
+from benchmarks import fake_maya
+
+
+PLUGIN_TEMPLATE = '''import maya.cmds as cmds
+{heavy}
+
+def get_plugin_info():
+    return {info}
+
+def register_commands():
+    return [
+{commands}
+    ]
+
+{functions}
+'''
+
+HEAVY_SOURCE = "_TABLE = [i * i for i in range({items})]"
+
+
+def generate_plugins(directory, count, prefix, heavy_every=10, dynamic_every=7, heavy_items=200000):
+    """生成合成插件，返回插件名列表"""
+    names = []
+    for index in range(count):
+        name = f"{prefix}_{index:04d}"
+        heavy = HEAVY_SOURCE.format(items=heavy_items) if index % heavy_every == 0 else ""
+
+        info = (
+            f"{{'name': '插件{index}', 'version': '1.0', "
+            f"'description': '基准测试插件', 'author': 'bench'}}"
+        )
+        if index % dynamic_every == 3:
+            # 元数据不是字面量，框架必须导入模块
+            info = f"dict(name='插件{index}', version='1.0', description='基准测试插件', author='bench')"
+
+        commands = "\n".join(
+            f"        {{'label': '命令{j}', 'command': command_{j}}}," for j in range(3)
+        )
+        functions = "\n".join(
+            f"def command_{j}(*args):\n    cmds.confirmDialog(message='命令{j}')\n" for j in range(3)
+        )
+
+        source = PLUGIN_TEMPLATE.format(heavy=heavy, info=info, commands=commands, functions=functions)
+        with open(os.path.join(directory, name + '.py'), 'w', encoding='utf-8') as f:
+            f.write(source)
+        names.append(name)
+    return names
+
+
+def purge_modules(names, plugins_dir):
+    """移除已导入的合成插件，保证每次测量都重新导入"""
+    for name in names:
+        sys.modules.pop(f"cfa_plugins.{name}", None)
+    package = sys.modules.get('cfa_plugins')
+    if package is not None:
+        for name in names:
+            package.__dict__.pop(name, None)
+
+
+class Bench:
+    """在一个合成插件目录上运行所有基准"""
+
+    def __init__(self, framework_module, cmds, plugins_dir, prefs_dir, names, repeat):
+        self.framework_module = framework_module
+        self.cmds = cmds
+        self.plugins_dir = plugins_dir
+        self.prefs_dir = prefs_dir
+        self.names = names
+        self.repeat = repeat
+
+    def new_framework(self, lazy=True, clear_cache=False):
+        if clear_cache:
+            shutil.rmtree(os.path.join(self.prefs_dir, 'cfa_tools_cache'), ignore_errors=True)
+        purge_modules(self.names, self.plugins_dir)
+        self.cmds.reset()
+
+        framework = self.framework_module.CFAToolsFramework()
+        framework.plugins_dir = self.plugins_dir
+        framework.lazy_loading = lazy
+        framework.startup_mode = 'sync'
+        framework.menu.applied = None
+        framework.menu.sections = {}
+        return framework
+
+    def measure(self, setup, action):
+        """setup() 返回传给 action() 的对象，只统计 action 的耗时"""
+        samples = []
+        calls = 0
+        for _ in range(self.repeat):
+            target = setup()
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                action(target)
+                samples.append(time.perf_counter() - start)
+            calls = len(self.cmds.calls)
+        return {
+            'min': min(samples),
+            'mean': sum(samples) / len(samples),
+            'max': max(samples),
+            'maya_calls': calls
+        }
+
+    def run(self):
+        results = {}
+
+        def warm_framework(lazy=True):
+            framework = self.new_framework(lazy=lazy)
+            with contextlib.redirect_stdout(io.StringIO()):
+                framework.create_menu()
+            purge_modules(self.names, self.plugins_dir)
+            self.cmds.reset()
+            return framework
+
+        results['discover_plugins'] = self.measure(
+            lambda: self.new_framework(), lambda fw: fw.discover_plugins()
+        )
+        results['prepare_specs_cold'] = self.measure(
+            lambda: self.new_framework(clear_cache=True),
+            lambda fw: fw.prepare_plugin_specs(self.names)
+        )
+        results['prepare_specs_warm'] = self.measure(
+            warm_framework, lambda fw: fw.prepare_plugin_specs(self.names)
+        )
+        results['load_plugin_all'] = self.measure(
+            lambda: self.new_framework(lazy=False),
+            lambda fw: [fw.load_plugin(name) for name in self.names]
+        )
+        results['create_menu_lazy_cold'] = self.measure(
+            lambda: self.new_framework(clear_cache=True), lambda fw: fw.create_menu()
+        )
+        results['create_menu_lazy_warm'] = self.measure(
+            warm_framework, lambda fw: fw.create_menu()
+        )
+        results['create_menu_eager'] = self.measure(
+            lambda: self.new_framework(lazy=False, clear_cache=True), lambda fw: fw.create_menu()
+        )
+        results['initialize_framework_deferred'] = self.measure(
+            self._deferred_framework, self._run_deferred_startup
+        )
+        results['show_plugin_manager'] = self.measure(
+            warm_framework, lambda fw: fw.show_plugin_manager()
+        )
+        return results
+
+    def _deferred_framework(self):
+        framework = self.new_framework()
+        framework.startup_mode = 'deferred'
+        return framework
+
+    def _run_deferred_startup(self, framework):
+        self.cmds.batch = False
+        try:
+            framework.initialize_framework()
+            self.cmds.run_deferred()
+        finally:
+            self.cmds.batch = True
+
+
+def run_benchmarks(sizes, repeat, heavy_items):
+    work_dir = tempfile.mkdtemp(prefix='cfa_bench_')
+    prefs_dir = os.path.join(work_dir, 'prefs')
+    os.makedirs(prefs_dir)
+    cmds = fake_maya.install(prefs_dir)
+
+    import cfa_tools_framework
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'results': []
+    }
+
+    try:
+        for size in sizes:
+            plugins_dir = os.path.join(work_dir, f'plugins_{size}')
+            os.makedirs(plugins_dir)
+            names = generate_plugins(plugins_dir, size, f'bench{size}', heavy_items=heavy_items)
+
+            bench = Bench(cfa_tools_framework, cmds, plugins_dir, prefs_dir, names, repeat)
+            for name, timing in bench.run().items():
+                row = {'plugins': size, 'benchmark': name}
+                row.update(timing)
+                report['results'].append(row)
+                print(f"{size:>5} {name:<32} {timing['min'] * 1000:10.2f} ms", file=sys.stderr)
+
+            purge_modules(names, plugins_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return report
+
+
+def compare_with_baseline(report, baseline, tolerance):
+    """返回比基线慢 tolerance 倍以上的结果列表"""
+    previous = {(row['plugins'], row['benchmark']): row['min'] for row in baseline['results']}
+    regressions = []
+    for row in report['results']:
+        key = (row['plugins'], row['benchmark'])
+        if key in previous and previous[key] > 0 and row['min'] > previous[key] * tolerance:
+            regressions.append({
+                'plugins': row['plugins'],
+                'benchmark': row['benchmark'],
+                'baseline': previous[key],
+                'current': row['min']
+            })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CFA Tools 框架性能基准")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--heavy-items', type=int, default=200000,
+                        help="重型插件模块级计算的规模")
+    parser.add_argument('--output', help="结果JSON文件 (默认输出到stdout)")
+    parser.add_argument('--baseline', help="与之前的结果JSON比较")
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help="比基线慢多少倍视为性能退化")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.repeat, args.heavy_items)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report['regressions'] = compare_with_baseline(report, json.load(f), args.tolerance)
+        if report['regressions']:
+            exit_code = 1
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""进程内的假 maya.cmds / maya.mel - 记录所有调用，用于在没有Maya的机器上测试框架性能"""
+import sys
+import types
+
+
+class FakeCmds(types.ModuleType):
+    """记录调用的 maya.cmds 替身，只模拟框架用到的菜单相关行为"""
+
+    def __init__(self, prefs_dir, batch=True):
+        types.ModuleType.__init__(self, 'maya.cmds')
+        self.prefs_dir = prefs_dir
+        # about(batch=True) 的返回值
+        self.batch = batch
+        self.calls = []
+        self.ui = {}
+        self.deferred = []
+        self._counter = 0
+
+    def _record(self, name, args, kwargs):
+        self.calls.append((name, args, kwargs))
+
+    def _new_path(self, parent, prefix):
+        self._counter += 1
+        return f"{parent}|{prefix}{self._counter}"
+
+    def menu(self, *args, **kwargs):
+        self._record('menu', args, kwargs)
+        name = args[0] if args else None
+        if kwargs.get('exists'):
+            return name in self.ui
+        if kwargs.get('edit'):
+            return None
+        path = name or self._new_path(kwargs.get('parent', ''), 'menu')
+        self.ui[path] = kwargs
+        return path
+
+    def menuItem(self, *args, **kwargs):
+        self._record('menuItem', args, kwargs)
+        if kwargs.get('exists'):
+            return args[0] in self.ui
+        if kwargs.get('edit'):
+            return None
+        path = self._new_path(kwargs.get('parent', ''), 'menuItem')
+        self.ui[path] = kwargs
+        return path
+
+    def deleteUI(self, *args, **kwargs):
+        self._record('deleteUI', args, kwargs)
+        for path in args:
+            for child in [p for p in self.ui if p == path or p.startswith(path + '|')]:
+                del self.ui[child]
+
+    def internalVar(self, **kwargs):
+        self._record('internalVar', (), kwargs)
+        return self.prefs_dir
+
+    def about(self, **kwargs):
+        self._record('about', (), kwargs)
+        return self.batch if kwargs.get('batch') else '2024'
+
+    def evalDeferred(self, *args, **kwargs):
+        self._record('evalDeferred', args, kwargs)
+        self.deferred.append(args[0])
+
+    def run_deferred(self):
+        """执行所有排队的 evalDeferred 回调 (包括执行过程中新加入的)"""
+        while self.deferred:
+            self.deferred.pop(0)()
+
+    def confirmDialog(self, *args, **kwargs):
+        self._record('confirmDialog', args, kwargs)
+        return kwargs.get('defaultButton', '')
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        def command(*args, **kwargs):
+            self._record(name, args, kwargs)
+            return None
+        return command
+
+    def reset(self):
+        """清空调用记录和界面状态"""
+        self.calls = []
+        self.ui = {}
+        self.deferred = []
+
+
+def install(prefs_dir):
+    """把假的maya模块注册到 sys.modules，返回 FakeCmds 实例
+
+    maya.utils.executeDeferred 与 cmds.evalDeferred 使用同一个队列，由 cmds.run_deferred() 执行
+    """
+    cmds = FakeCmds(prefs_dir)
+    mel = types.ModuleType('maya.mel')
+    mel.eval = lambda *args, **kwargs: None
+    utils = types.ModuleType('maya.utils')
+    utils.executeDeferred = lambda function, *args: cmds.deferred.append(lambda: function(*args))
+
+    maya = types.ModuleType('maya')
+    maya.cmds = cmds
+    maya.mel = mel
+    maya.utils = utils
+
+    sys.modules['maya'] = maya
+    sys.modules['maya.cmds'] = cmds
+    sys.modules['maya.mel'] = mel
+    sys.modules['maya.utils'] = utils
+    return cmds
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""CFA Tools 框架核心库 - 不依赖Maya的公共模块"""
@@ -0,0 +1,97 @@
+"""按内容查找重复的ABC文件 (不依赖Maya)
+
+只有大小相同的文件才可能重复，所以只对这些文件计算哈希。哈希用 mmap 分块读取，
+在线程池中并发计算 (hashlib 计算大块数据时释放GIL)，结果按 路径+修改时间+大小 缓存。
+"""
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from cfa_core.file_cache import FileResultCache
+
+
+CHUNK_SIZE = 8 * 1024 * 1024
+MAX_WORKERS = 4
+CACHE_VERSION = 1
+
+
+def file_digest(path, chunk_size=CHUNK_SIZE):
+    """计算文件内容的SHA1"""
+    hasher = hashlib.sha1()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, chunk_size):
+                        hasher.update(view[offset:offset + chunk_size])
+                finally:
+                    view.release()
+    return hasher.hexdigest()
+
+
+class ContentHashCache:
+    """按 路径+修改时间+大小 缓存文件内容哈希"""
+
+    def __init__(self, cache_path):
+        self.cache = FileResultCache(cache_path, version=CACHE_VERSION)
+
+    def digest(self, path):
+        signature = FileResultCache.file_signature(path)
+        digest = self.cache.get(path, signature)
+        if digest is None:
+            digest = file_digest(path)
+            self.cache.put(path, digest, signature)
+        return digest
+
+    def save(self):
+        return self.cache.save()
+
+
+def find_duplicates(paths, cache=None, max_workers=MAX_WORKERS):
+    """返回 (唯一文件列表, {重复文件: 内容相同的第一个文件})，保持输入顺序
+
+    无法读取的文件视为唯一文件
+    """
+    sizes = {}
+    for path in paths:
+        try:
+            sizes[path] = os.path.getsize(path)
+        except OSError:
+            pass
+
+    size_counts = {}
+    for size in sizes.values():
+        size_counts[size] = size_counts.get(size, 0) + 1
+    candidates = [path for path in sizes if size_counts[sizes[path]] > 1]
+
+    def digest(path):
+        try:
+            return cache.digest(path) if cache is not None else file_digest(path)
+        except OSError:
+            return None
+
+    digests = {}
+    if candidates:
+        workers = min(max_workers, len(candidates))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            digests = dict(zip(candidates, executor.map(digest, candidates)))
+        if cache is not None:
+            cache.save()
+
+    unique = []
+    duplicates = {}
+    first_by_content = {}
+    for path in paths:
+        if digests.get(path) is None:
+            unique.append(path)
+            continue
+        key = (sizes[path], digests[path])
+        if key in first_by_content:
+            duplicates[path] = first_by_content[key]
+        else:
+            first_by_content[key] = path
+            unique.append(path)
+    return unique, duplicates
@@ -0,0 +1,79 @@
+"""Alembic文件头预检查 - 在导入前并发检查文件格式和完整性 (不依赖Maya)
+
+只读取文件开头几个字节:
+* Ogawa: 'Ogawa' + 冻结标志(0xff表示写入完成) + 版本号(2字节) + 根组偏移(uint64)
+* HDF5: 8字节签名 (旧版Alembic格式)
+"""
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+
+OGAWA_MAGIC = b'Ogawa'
+OGAWA_FROZEN = 0xff
+OGAWA_HEADER_SIZE = 16
+HDF5_MAGIC = b'\x89HDF\r\n\x1a\n'
+
+FORMAT_OGAWA = 'ogawa'
+FORMAT_HDF5 = 'hdf5'
+
+MAX_WORKERS = 8
+
+
+def check_abc_file(path):
+    """检查单个文件，返回 {'path', 'size', 'format', 'ok', 'reason'}"""
+    result = {'path': path, 'size': None, 'format': None, 'ok': False, 'reason': None}
+
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            header = f.read(OGAWA_HEADER_SIZE)
+    except OSError as e:
+        result['reason'] = f"无法读取: {e.strerror or str(e)}"
+        return result
+
+    result['size'] = size
+    if size == 0:
+        result['reason'] = "文件为空"
+        return result
+
+    if header.startswith(OGAWA_MAGIC):
+        result['format'] = FORMAT_OGAWA
+        if len(header) < OGAWA_HEADER_SIZE:
+            result['reason'] = "Ogawa文件头不完整"
+            return result
+        if header[5] != OGAWA_FROZEN:
+            result['reason'] = "Ogawa文件未写入完成"
+            return result
+        root_offset = struct.unpack('<Q', header[8:16])[0]
+        if root_offset >= size:
+            result['reason'] = "Ogawa文件已截断"
+            return result
+        result['ok'] = True
+        return result
+
+    if header.startswith(HDF5_MAGIC):
+        result['format'] = FORMAT_HDF5
+        result['ok'] = True
+        return result
+
+    result['reason'] = "不是Alembic文件 (既不是Ogawa也不是HDF5格式)"
+    return result
+
+
+def prescan_abc_files(paths, max_workers=None):
+    """在线程池中并发检查文件，返回结果顺序与输入一致"""
+    paths = list(paths)
+    if not paths:
+        return []
+
+    workers = min(max_workers or MAX_WORKERS, len(paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(check_abc_file, paths))
+
+
+def split_prescan_results(results):
+    """拆分为 (可导入的路径列表, [(路径, 原因), ...])"""
+    valid = [result['path'] for result in results if result['ok']]
+    skipped = [(result['path'], result['reason']) for result in results if not result['ok']]
+    return valid, skipped
@@ -0,0 +1,125 @@
+"""ABC导入统计 - 记录每次导入的文件大小、耗时、DAG节点数和内存变化，可导出为JSON/CSV
+
+本模块不导入Maya，maya.cmds 由调用方传入。
+"""
+import csv
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+def dag_node_count(cmds):
+    """场景中的DAG节点数 (需要列出整个场景的节点，场景较大时较慢)"""
+    return len(cmds.ls(dag=True) or [])
+
+
+def heap_memory(cmds):
+    """Maya已使用的堆内存 (MB)，无法查询时返回None"""
+    try:
+        memory = cmds.memory(heapMemory=True, megaByte=True)
+    except Exception:
+        return None
+    if isinstance(memory, (list, tuple)):
+        memory = memory[0] if memory else None
+    return float(memory) if memory is not None else None
+
+
+class ImportMetrics:
+    """保存最近 limit 次导入的记录 (环形缓冲区，超出时丢弃最早的记录)
+
+    count_nodes 为默认是否统计导入前后的DAG节点数。统计时每次导入前后各列出一次整个场景的节点，
+    批量导入时耗时随场景增大而增加，所以默认不统计 (nodes_before/nodes_after 为None)
+    """
+
+    COLUMNS = ('time', 'path', 'mode', 'ok', 'file_size', 'seconds', 'nodes_before', 'nodes_after',
+               'memory_before', 'memory_after', 'error')
+
+    def __init__(self, limit=1000, count_nodes=False):
+        self.records = deque(maxlen=limit)
+        self.count_nodes = count_nodes
+
+    def __len__(self):
+        return len(self.records)
+
+    def clear(self):
+        self.records.clear()
+
+    def last(self):
+        """最近一次导入的记录，没有记录时返回None"""
+        return self.records[-1] if self.records else None
+
+    @contextmanager
+    def measure(self, cmds, file_path, mode='import', count_nodes=None):
+        """统计with语句块 (一次导入) 前后的耗时、DAG节点数和内存，返回记录字典
+
+        mode 为导入方式 (例如 import、proxy、instance)；count_nodes 省略时使用 self.count_nodes；
+        出错时记录错误信息后继续抛出
+        """
+        if count_nodes is None:
+            count_nodes = self.count_nodes
+        try:
+            file_size = os.path.getsize(file_path)
+        except OSError:
+            file_size = None
+        record = {
+            'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'path': file_path,
+            'mode': mode,
+            'ok': False,
+            'file_size': file_size,
+            'seconds': 0.0,
+            'nodes_before': dag_node_count(cmds) if count_nodes else None,
+            'nodes_after': None,
+            'memory_before': heap_memory(cmds),
+            'memory_after': None,
+            'error': None
+        }
+        start = time.perf_counter()
+        try:
+            yield record
+            record['ok'] = True
+        except Exception as e:
+            record['error'] = str(e)
+            raise
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            if count_nodes:
+                record['nodes_after'] = dag_node_count(cmds)
+            record['memory_after'] = heap_memory(cmds)
+            self.records.append(record)
+
+    def to_list(self):
+        """按时间顺序返回所有记录"""
+        return [dict(record) for record in self.records]
+
+    def export_json(self, path):
+        """导出为JSON文件"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_list(), f, ensure_ascii=False, indent=2)
+
+    def export_csv(self, path):
+        """导出为CSV文件 (每次导入一行)"""
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=self.COLUMNS, extrasaction='ignore')
+            writer.writeheader()
+            for record in self.records:
+                writer.writerow(record)
+
+    def export(self, path):
+        """根据扩展名导出为CSV或JSON"""
+        if path.lower().endswith('.csv'):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+
+
+def format_record(record):
+    """生成一次导入的简要说明，例如 1.20s, +350 节点, +48.5 MB"""
+    parts = [f"{record['seconds']:.2f}s"]
+    if record['nodes_before'] is not None and record['nodes_after'] is not None:
+        parts.append(f"{record['nodes_after'] - record['nodes_before']:+d} 节点")
+    if record['memory_before'] is not None and record['memory_after'] is not None:
+        parts.append(f"{record['memory_after'] - record['memory_before']:+.1f} MB")
+    return ", ".join(parts)
@@ -0,0 +1,114 @@
+"""ABC导入的场景操作 - 插件和mayapy工作进程共用
+
+本模块不导入Maya，maya.cmds 由调用方传入。
+"""
+import os
+import re
+
+
+def _node_name(file_path):
+    """由文件名生成合法的节点名"""
+    name = re.sub(r'\W', '_', os.path.splitext(os.path.basename(file_path))[0], flags=re.ASCII)
+    return name if name and not name[0].isdigit() else '_' + name
+
+
+def ensure_plugin(cmds, plugin):
+    if not cmds.pluginInfo(plugin, query=True, loaded=True):
+        cmds.loadPlugin(plugin)
+
+
+def create_gpu_cache(cmds, file_path):
+    """以gpuCache节点引入整个归档 (只用于显示，不创建DAG几何体)，返回创建的变换节点列表"""
+    ensure_plugin(cmds, 'gpuCache')
+    name = _node_name(file_path)
+    transform = cmds.createNode('transform', name=name + '_gpu')
+    shape = cmds.createNode('gpuCache', name=name + '_gpuShape', parent=transform)
+    cmds.setAttr(shape + '.cacheFileName', file_path, type='string')
+    cmds.setAttr(shape + '.cacheGeomPath', '|', type='string')
+    return cmds.ls(transform, long=True)
+
+
+def instance_roots(cmds, roots, file_path):
+    """为已导入的顶层节点创建实例 (共享形状节点，不再读取几何体)，返回新的顶层节点列表
+
+    实例名称为 file_path 的文件名加原节点名
+    """
+    name = _node_name(file_path)
+    instances = []
+    for root in roots:
+        short_name = root.rpartition('|')[2].rpartition(':')[2]
+        instances.extend(cmds.instance(root, name=f'{name}_{short_name}'))
+    return cmds.ls(instances, long=True)
+
+
+def disconnect_time(cmds, alembic_nodes):
+    """断开AlembicNode与场景时间的连接，几何体停留在当前帧"""
+    for node in alembic_nodes:
+        sources = cmds.listConnections(node + '.time', source=True, destination=False, plugs=True) or []
+        for source in sources:
+            cmds.disconnectAttr(source, node + '.time')
+
+
+def clamp_time_range(cmds, alembic_nodes, start, end):
+    """把AlembicNode读取的时间限制在 start-end 帧之间，范围外保持首尾帧
+
+    AbcImport没有导入帧范围的参数，这里在场景时间和AlembicNode之间插入一条
+    线性的 animCurveTT (与时间扭曲相同的做法)
+    """
+    for node in alembic_nodes:
+        sources = cmds.listConnections(node + '.time', source=True, destination=False, plugs=True) or []
+        if not sources:
+            continue
+        curve = cmds.createNode('animCurveTT', name=node + '_timeRange')
+        cmds.setKeyframe(curve, time=start, value=start)
+        cmds.setKeyframe(curve, time=end, value=end)
+        cmds.keyTangent(curve, inTangentType='linear', outTangentType='linear')
+        cmds.connectAttr(sources[0], curve + '.input')
+        cmds.connectAttr(curve + '.output', node + '.time', force=True)
+
+
+def flatten_hierarchy(cmds, roots):
+    """把带形状节点的变换节点移到世界下，删除因此变空的组，返回新的顶层节点列表"""
+    transforms = list(roots) + (
+        cmds.listRelatives(roots, allDescendents=True, type='transform', fullPath=True) or []
+    )
+    # 由深到浅处理，移动子节点不会改变尚未处理的父节点路径
+    transforms.sort(key=lambda node: -node.count('|'))
+
+    flattened = []
+    groups = []
+    for node in transforms:
+        if cmds.listRelatives(node, shapes=True, fullPath=True):
+            if node.count('|') > 1:
+                node = cmds.parent(node, world=True)[0]
+            flattened.append(cmds.ls(node, long=True)[0])
+        else:
+            groups.append(node)
+
+    for group in groups:
+        if cmds.objExists(group) and not cmds.listRelatives(group, children=True, fullPath=True):
+            cmds.delete(group)
+    return flattened
+
+
+def import_archive(cmds, file_path, connect_time=True, preserve_hierarchy=True, frame_range=None,
+                   **abc_flags):
+    """执行AbcImport并按设置处理导入的节点，返回新的顶层节点列表
+
+    frame_range 为 (起始帧, 结束帧)，abc_flags 直接传给 AbcImport (例如 filterObjects)
+    """
+    ensure_plugin(cmds, 'AbcImport')
+    assemblies = set(cmds.ls(assemblies=True, long=True) or [])
+    alembic_nodes = set(cmds.ls(type='AlembicNode') or [])
+
+    cmds.AbcImport(file_path, mode='import', **abc_flags)
+
+    roots = [node for node in cmds.ls(assemblies=True, long=True) or [] if node not in assemblies]
+    new_alembic_nodes = [node for node in cmds.ls(type='AlembicNode') or [] if node not in alembic_nodes]
+    if not connect_time:
+        disconnect_time(cmds, new_alembic_nodes)
+    elif frame_range:
+        clamp_time_range(cmds, new_alembic_nodes, frame_range[0], frame_range[1])
+    if not preserve_hierarchy and roots:
+        roots = flatten_hierarchy(cmds, roots)
+    return roots
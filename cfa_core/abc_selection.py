@@ -0,0 +1,79 @@
+"""选择性导入 - 把对象路径通配符转换为 AbcImport 的 -filterObjects / -excludeFilterObjects 参数
+
+AbcImport 的过滤参数是以空格分隔的正则表达式，与对象名 (不是完整路径) 匹配，
+匹配的对象连同其子对象一起导入。有层级信息 (cfa_core.ogawa) 时先用通配符匹配完整路径，
+再生成只匹配这些对象名的表达式；没有层级信息 (HDF5格式) 时把通配符的最后一段直接转换为表达式。
+不同路径下的同名对象无法区分，会一起导入。
+"""
+import fnmatch
+import re
+
+
+class SelectionError(Exception):
+    """过滤条件在文件中没有匹配的对象"""
+
+
+def split_patterns(text):
+    """把以空格或逗号分隔的输入拆分为通配符列表"""
+    return [pattern for pattern in re.split(r'[\s,]+', text or '') if pattern]
+
+
+def _matches(path, patterns):
+    name = path.rpartition('/')[2]
+    return any(fnmatch.fnmatchcase(path, pattern) or fnmatch.fnmatchcase(name, pattern)
+               for pattern in patterns)
+
+
+def match_objects(objects, patterns):
+    """返回完整路径或对象名与任一通配符匹配的对象"""
+    return [entry for entry in objects if _matches(entry['path'], patterns)]
+
+
+def _escape(text):
+    # 参数以空格分隔，名称中的空格写成 \s
+    return re.escape(text).replace('\\ ', '\\s')
+
+
+def names_to_expression(names):
+    """生成只匹配这些对象名的表达式"""
+    return ' '.join(f'^{_escape(name)}$' for name in sorted(set(names)))
+
+
+def glob_to_regex(pattern):
+    """把通配符转换为AbcImport能识别的正则表达式 (只使用最后一段路径)"""
+    name = pattern.rstrip('/').rpartition('/')[2] or '*'
+    parts = []
+    for char in name:
+        if char == '*':
+            parts.append('.*')
+        elif char == '?':
+            parts.append('.')
+        else:
+            parts.append(_escape(char))
+    return '^' + ''.join(parts) + '$'
+
+
+def build_filter_flags(objects, include=None, exclude=None):
+    """生成 AbcImport 的过滤参数字典
+
+    objects 为归档的对象列表 (没有层级信息时为None)。
+    include 在层级中没有匹配的对象时返回None (不应导入该文件)
+    """
+    flags = {}
+    if include:
+        if objects is None:
+            flags['filterObjects'] = ' '.join(glob_to_regex(pattern) for pattern in include)
+        else:
+            matched = match_objects(objects, include)
+            if not matched:
+                return None
+            flags['filterObjects'] = names_to_expression(entry['name'] for entry in matched)
+
+    if exclude:
+        if objects is None:
+            flags['excludeFilterObjects'] = ' '.join(glob_to_regex(pattern) for pattern in exclude)
+        else:
+            matched = match_objects(objects, exclude)
+            if matched:
+                flags['excludeFilterObjects'] = names_to_expression(entry['name'] for entry in matched)
+    return flags
@@ -0,0 +1,188 @@
+"""批量导入的文件查找和导入日志 (不依赖Maya)
+
+* walk_files: 用 os.scandir 递归查找指定扩展名的文件，支持包含/排除通配符、只保留最新版本和按大小排序
+  (walk_abc_files 查找ABC文件)
+* ImportJournal: 每个场景一个导入日志，记录已导入文件的 路径+修改时间+大小 和创建的顶层节点，
+  重新运行批量导入时跳过未变化且节点仍在场景中的文件
+"""
+import fnmatch
+import hashlib
+import os
+import re
+import time
+
+from cfa_core.file_cache import FileResultCache
+
+
+ABC_EXTENSIONS = ('.abc',)
+
+ORDER_PATH = 'path'
+ORDER_SIZE = 'size'            # 从小到大
+ORDER_SIZE_DESC = 'size_desc'  # 从大到小
+
+# 路径中的版本号，例如 v001/ 或 asset_v003.abc
+VERSION_PATTERN = re.compile(r'(?<![a-z])v(\d+)', re.IGNORECASE)
+
+JOURNAL_VERSION = 2
+# 导入日志每记录 JOURNAL_SAVE_EVERY 个文件或距上次写入超过 JOURNAL_SAVE_INTERVAL 秒时写入磁盘
+JOURNAL_SAVE_EVERY = 20
+JOURNAL_SAVE_INTERVAL = 5.0
+
+
+def _matches(relative_path, patterns):
+    """通配符与相对路径 (使用 / 分隔) 或文件名匹配"""
+    name = relative_path.rpartition('/')[2]
+    return any(fnmatch.fnmatch(relative_path, pattern) or fnmatch.fnmatch(name, pattern)
+               for pattern in patterns)
+
+
+def walk_files(root, extensions=None, include=None, exclude=None, latest_only=False, order=ORDER_PATH,
+               follow_symlinks=False):
+    """递归查找文件，返回 [{'path', 'relative_path', 'size', 'mtime'}, ...]
+
+    extensions 为扩展名元组 (例如 ('.ma',))，为None时包含所有文件；
+    include 为空时包含所有扩展名匹配的文件；exclude 与目录匹配时不进入该目录
+    """
+    include = list(include or [])
+    exclude = list(exclude or [])
+    if extensions is not None:
+        extensions = tuple(extension.lower() for extension in extensions)
+
+    entries = []
+    stack = [(root, '')]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            iterator = os.scandir(directory)
+        except OSError as e:
+            print(f"无法读取目录 {directory}: {str(e)}")
+            continue
+
+        with iterator:
+            for entry in iterator:
+                relative_path = prefix + entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        if not _matches(relative_path, exclude):
+                            stack.append((entry.path, relative_path + '/'))
+                        continue
+                    if not entry.is_file(follow_symlinks=follow_symlinks):
+                        continue
+                    if extensions is not None and not entry.name.lower().endswith(extensions):
+                        continue
+                    if include and not _matches(relative_path, include):
+                        continue
+                    if _matches(relative_path, exclude):
+                        continue
+                    stat = entry.stat(follow_symlinks=follow_symlinks)
+                except OSError:
+                    continue
+
+                entries.append({
+                    'path': entry.path,
+                    'relative_path': relative_path,
+                    'size': stat.st_size,
+                    'mtime': stat.st_mtime
+                })
+
+    if latest_only:
+        entries = select_latest_versions(entries)
+    return sort_entries(entries, order)
+
+
+def walk_abc_files(root, **options):
+    """递归查找ABC文件，参数同 walk_files"""
+    return walk_files(root, ABC_EXTENSIONS, **options)
+
+
+def version_key(relative_path):
+    """返回 (去掉版本号后的路径, 版本号元组)，同一资产的不同版本前者相同"""
+    versions = tuple(int(number) for number in VERSION_PATTERN.findall(relative_path))
+    return VERSION_PATTERN.sub('v#', relative_path).lower(), versions
+
+
+def select_latest_versions(entries):
+    """同一资产的多个版本 (shot/asset/v001/asset_v001.abc 等) 只保留版本号最大的"""
+    latest = {}
+    for entry in entries:
+        key, versions = version_key(entry['relative_path'])
+        current = latest.get(key)
+        if current is None or versions > current[0]:
+            latest[key] = (versions, entry)
+    return [entry for _, entry in latest.values()]
+
+
+def sort_entries(entries, order=ORDER_PATH):
+    if order == ORDER_SIZE:
+        return sorted(entries, key=lambda entry: (entry['size'], entry['path']))
+    if order == ORDER_SIZE_DESC:
+        return sorted(entries, key=lambda entry: (-entry['size'], entry['path']))
+    return sorted(entries, key=lambda entry: entry['relative_path'])
+
+
+def journal_path(journal_dir, scene_path):
+    """场景对应的导入日志文件，未保存的场景使用 untitled"""
+    if not scene_path:
+        return os.path.join(journal_dir, 'untitled.json')
+    scene_hash = hashlib.sha1(os.path.abspath(scene_path).encode('utf-8')).hexdigest()[:8]
+    scene_name = os.path.splitext(os.path.basename(scene_path))[0]
+    return os.path.join(journal_dir, f"{scene_name}-{scene_hash}.json")
+
+
+class ImportJournal:
+    """场景的导入日志，文件修改时间或大小变化后视为未导入
+
+    记录的顶层节点不在场景中时 (例如导入后场景没有保存或Maya崩溃) 也视为未导入。
+    记录分批写入磁盘，批量导入结束时调用 flush() 写入剩余的记录
+    """
+
+    def __init__(self, path, save_every=JOURNAL_SAVE_EVERY, save_interval=JOURNAL_SAVE_INTERVAL):
+        self.path = path
+        self.entries = FileResultCache(path, version=JOURNAL_VERSION)
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self._unsaved = 0
+        self._last_save = time.perf_counter()
+
+    def is_imported(self, file_path, signature=None, node_exists=None):
+        """node_exists 为检查节点是否存在的函数 (例如 cmds.objExists)，省略时不检查"""
+        entry = self.entries.get(file_path, signature)
+        if entry is None:
+            return False
+        if node_exists is not None:
+            return all(node_exists(node) for node in entry.get('nodes', []))
+        return True
+
+    def split(self, file_paths, signatures=None, node_exists=None):
+        """拆分为 (需要导入的文件, 已导入且未变化的文件)"""
+        signatures = signatures or {}
+        pending, imported = [], []
+        for file_path in file_paths:
+            if self.is_imported(file_path, signatures.get(file_path), node_exists):
+                imported.append(file_path)
+            else:
+                pending.append(file_path)
+        return pending, imported
+
+    def record(self, file_path, nodes=None, **details):
+        """记录一个导入完成的文件和它创建的顶层节点，达到批量大小或间隔时间时写入磁盘"""
+        details['nodes'] = list(nodes or [])
+        details['imported_at'] = time.time()
+        try:
+            self.entries.put(file_path, details)
+        except OSError:
+            return
+        self._unsaved += 1
+        if (self._unsaved >= self.save_every
+                or time.perf_counter() - self._last_save >= self.save_interval):
+            self.flush()
+
+    def flush(self):
+        """把未写入的记录写入磁盘"""
+        self._unsaved = 0
+        self._last_save = time.perf_counter()
+        return self.entries.save()
+
+    def clear(self):
+        self.entries.invalidate()
+        self.flush()
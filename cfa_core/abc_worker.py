@@ -0,0 +1,62 @@
+"""ABC导入工作进程 - 在 mayapy 中运行，由 cfa_core.abc_workers.WorkerPool 启动
+
+    mayapy -u -m cfa_core.abc_worker
+
+初始化Maya后输出就绪消息，然后从标准输入逐行读取任务 {'id', 'path', 'output', 'options'}，
+按 options (传给 abc_scene.import_archive) 把ABC文件导入到新场景并另存为 .mb，每个任务输出一行结果。
+"""
+import json
+import os
+import sys
+import time
+import traceback
+
+from cfa_core import abc_scene
+from cfa_core.abc_workers import RESULT_PREFIX
+
+
+def emit(message):
+    """输出一行结果 (其他输出由父进程写入日志)"""
+    sys.stdout.write(RESULT_PREFIX + json.dumps(message) + '\n')
+    sys.stdout.flush()
+
+
+def import_to_scene(cmds, task):
+    """在新场景中导入ABC文件并保存为 .mb"""
+    result = {'id': task['id'], 'ok': False, 'error': None, 'seconds': 0.0}
+    start = time.perf_counter()
+    try:
+        cmds.file(new=True, force=True)
+        abc_scene.import_archive(cmds, task['path'], **task.get('options', {}))
+
+        output_dir = os.path.dirname(task['output'])
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        cmds.file(rename=task['output'])
+        cmds.file(save=True, type='mayaBinary', force=True)
+        result['ok'] = True
+    except Exception as e:
+        traceback.print_exc()
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def main():
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+    try:
+        import maya.cmds as cmds
+        abc_scene.ensure_plugin(cmds, 'AbcImport')
+
+        emit({'ready': True, 'pid': os.getpid()})
+        for line in sys.stdin:
+            line = line.strip()
+            if line:
+                emit(import_to_scene(cmds, json.loads(line)))
+    finally:
+        maya.standalone.uninitialize()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,359 @@
+"""分布式ABC导入 - 把文件分配给多个无界面 mayapy 工作进程并行导入 (父进程部分不依赖Maya)
+
+每个工作进程只启动一次Maya (cfa_core.abc_worker)，之后从标准输入逐行读取任务，
+把每个ABC文件导入到新场景并另存为 .mb，结果以 RESULT_PREFIX 开头的一行JSON写到标准输出。
+工作进程的其他输出写入各自的日志文件。
+
+任务放在共享队列中，空闲的工作进程依次领取。导入失败的文件重新排队 (最多重试 max_retries 次)，
+工作进程意外退出或超时时重新启动。
+
+启动方式由 launcher 决定，可以用普通Python和假的maya模块代替mayapy:
+    launcher = MayapyLauncher(sys.executable, extra_env={'PYTHONPATH': '/path/to/stub'})
+"""
+import hashlib
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+
+RESULT_PREFIX = 'CFA_RESULT '
+WORKER_MODULE = 'cfa_core.abc_worker'
+FRAMEWORK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_EOF = object()
+
+
+class WorkerError(Exception):
+    """工作进程无法启动、意外退出或超时"""
+
+
+def find_mayapy():
+    """查找mayapy: 环境变量 CFA_MAYAPY，其次是当前Maya可执行文件所在目录和 MAYA_LOCATION/bin"""
+    executable = os.environ.get('CFA_MAYAPY')
+    if executable:
+        return executable
+
+    name = 'mayapy.exe' if os.name == 'nt' else 'mayapy'
+    candidates = [os.path.join(os.path.dirname(sys.executable), name)]
+    if os.environ.get('MAYA_LOCATION'):
+        candidates.append(os.path.join(os.environ['MAYA_LOCATION'], 'bin', name))
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    raise WorkerError("找不到mayapy，请设置环境变量 CFA_MAYAPY")
+
+
+class WorkerLauncher:
+    """工作进程启动方式: command() 返回命令行参数列表，environment() 返回环境变量"""
+
+    def command(self):
+        raise NotImplementedError
+
+    def environment(self):
+        return dict(os.environ)
+
+
+class MayapyLauncher(WorkerLauncher):
+    """用 mayapy (或任意兼容的Python解释器) 以模块方式运行工作进程
+
+    extra_env 中的 PYTHONPATH 加在前面，其他变量直接覆盖
+    """
+
+    def __init__(self, executable=None, extra_env=None, module=WORKER_MODULE):
+        self.executable = executable
+        self.extra_env = dict(extra_env or {})
+        self.module = module
+
+    def command(self):
+        executable = self.executable or find_mayapy()
+        return [executable, '-u', '-m', self.module]
+
+    def environment(self):
+        env = dict(os.environ)
+        extra_env = dict(self.extra_env)
+
+        # 工作进程需要能导入 cfa_core
+        python_path = [FRAMEWORK_DIR]
+        if extra_env.get('PYTHONPATH'):
+            python_path.insert(0, extra_env.pop('PYTHONPATH'))
+        if env.get('PYTHONPATH'):
+            python_path.append(env['PYTHONPATH'])
+        env['PYTHONPATH'] = os.pathsep.join(python_path)
+        env['PYTHONIOENCODING'] = 'utf-8'
+        env.update(extra_env)
+        return env
+
+
+class WorkerProcess:
+    """一个工作进程，按顺序执行任务"""
+
+    def __init__(self, index, launcher, log_path):
+        self.index = index
+        self.launcher = launcher
+        self.log_path = log_path
+        self.process = None
+        self.messages = None
+        self.log_file = None
+
+    def log(self, text):
+        if self.log_file is not None:
+            self.log_file.write(f"[{time.strftime('%H:%M:%S')}] {text}\n".encode('utf-8'))
+            self.log_file.flush()
+
+    def start(self, timeout=None):
+        """启动进程并等待Maya初始化完成"""
+        command = self.launcher.command()
+        self.log_file = open(self.log_path, 'ab')
+        self.log(f"启动工作进程: {' '.join(command)}")
+        try:
+            self.process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=self.log_file,
+                env=self.launcher.environment()
+            )
+        except OSError as e:
+            self.stop()
+            raise WorkerError(f"无法启动工作进程: {str(e)}")
+
+        self.messages = queue.Queue()
+        reader = threading.Thread(target=self._read_output, args=(self.process.stdout, self.messages))
+        reader.daemon = True
+        reader.start()
+
+        message = self._receive(timeout, "工作进程启动超时")
+        if not message.get('ready'):
+            self.stop()
+            raise WorkerError(f"工作进程启动失败，详见日志 {self.log_path}")
+        self.log(f"工作进程已就绪 (pid {self.process.pid})")
+
+    def _read_output(self, stream, messages):
+        """读取标准输出: 结果行放入队列，其他输出写入日志"""
+        for line in iter(stream.readline, b''):
+            text = line.decode('utf-8', 'replace')
+            if text.startswith(RESULT_PREFIX):
+                try:
+                    messages.put(json.loads(text[len(RESULT_PREFIX):]))
+                    continue
+                except ValueError:
+                    pass
+            if self.log_file is not None and not self.log_file.closed:
+                self.log_file.write(line)
+                self.log_file.flush()
+        messages.put(_EOF)
+
+    def _receive(self, timeout, timeout_message):
+        try:
+            message = self.messages.get(timeout=timeout)
+        except queue.Empty:
+            self.kill()
+            raise WorkerError(timeout_message)
+        if message is _EOF:
+            returncode = self.process.wait()
+            self.log(f"工作进程意外退出 (返回值 {returncode})")
+            self.stop()
+            raise WorkerError(f"工作进程意外退出 (返回值 {returncode})，详见日志 {self.log_path}")
+        return message
+
+    def run_task(self, task, timeout=None):
+        """发送一个任务并等待结果"""
+        self.log(f"导入 {task['path']} (第 {task['attempts']} 次)")
+        try:
+            self.process.stdin.write((json.dumps(task) + '\n').encode('utf-8'))
+            self.process.stdin.flush()
+        except OSError:
+            # 进程已退出，读取线程会放入 _EOF
+            pass
+        result = self._receive(timeout, f"导入超时: {task['path']}")
+        self.log(f"{'完成' if result.get('ok') else '失败'} {task['path']} ({result.get('seconds', 0):.2f}s)")
+        return result
+
+    def stop(self, timeout=30):
+        """关闭标准输入让工作进程退出，超时未退出时强制结束"""
+        if self.process is not None:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            try:
+                self.process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self.kill()
+            self.process = None
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+
+    def kill(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.log("工作进程已强制结束")
+        self.stop()
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+
+class WorkerPool:
+    """把ABC文件分配给 workers 个工作进程导入，每个文件输出一个 .mb 场景
+
+    import_options 传给工作进程中的 abc_scene.import_archive (例如 connect_time)
+    """
+
+    def __init__(self, launcher, output_dir, log_dir, workers=4, max_retries=1,
+                 task_timeout=None, startup_timeout=600, import_options=None):
+        self.launcher = launcher
+        self.import_options = dict(import_options or {})
+        self.output_dir = output_dir
+        self.log_dir = log_dir
+        self.workers = max(1, workers)
+        self.max_retries = max_retries
+        self.task_timeout = task_timeout
+        self.startup_timeout = startup_timeout
+
+        self._tasks = queue.Queue()
+        self._results = {}
+        self._completed = []
+        self._paths = []
+        self._threads = []
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._launch_errors = []
+
+    def output_path(self, path):
+        """输出场景路径，包含源文件路径的哈希，不同目录下的同名文件互不覆盖"""
+        path_hash = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:8]
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.output_dir, f"{name}-{path_hash}.mb")
+
+    def log_path(self, index):
+        return os.path.join(self.log_dir, f"worker_{index:02d}.log")
+
+    def start(self, paths, options=None):
+        """开始导入 (立即返回)，options 为 {路径: 导入参数}，覆盖该文件的 import_options"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        self._paths = list(paths)
+        self._tasks = queue.Queue()
+        self._results = {}
+        self._completed = []
+        self._cancelled = False
+        self._launch_errors = []
+        for index, path in enumerate(self._paths):
+            self._tasks.put({
+                'id': index,
+                'path': path,
+                'output': self.output_path(path),
+                'options': dict(self.import_options, **(options or {}).get(path, {})),
+                'attempts': 0
+            })
+
+        self._threads = []
+        for index in range(min(self.workers, len(self._paths))):
+            thread = threading.Thread(target=self._worker_loop, args=(index,))
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def wait(self, timeout=None):
+        """等待全部完成，返回是否已完成"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+            if thread.is_alive():
+                return False
+        return True
+
+    def cancel(self):
+        """取消: 正在导入的文件完成后停止，未开始的文件不再导入"""
+        self._cancelled = True
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    @property
+    def completed(self):
+        return len(self._results)
+
+    def completed_results(self):
+        """按完成顺序返回已完成文件的结果"""
+        with self._lock:
+            return [self._results[index] for index in self._completed]
+
+    def results(self):
+        """按输入顺序返回每个文件的 {'path', 'ok', 'output', 'error', 'attempts', 'worker', 'seconds'}"""
+        reason = "已取消" if self._cancelled else "; ".join(self._launch_errors) or "未导入"
+        results = []
+        for index, path in enumerate(self._paths):
+            result = self._results.get(index)
+            if result is None:
+                result = {'path': path, 'ok': False, 'output': None, 'error': reason,
+                          'attempts': 0, 'worker': None, 'seconds': 0.0}
+            results.append(result)
+        return results
+
+    def run(self, paths, options=None):
+        """导入并等待完成，返回 results()"""
+        self.start(paths, options)
+        self.wait()
+        return self.results()
+
+    def _finished(self):
+        with self._lock:
+            return len(self._results) >= len(self._paths)
+
+    def _record(self, task, worker_index, result):
+        """记录结果，失败且还能重试时重新排队"""
+        ok = bool(result.get('ok'))
+        if not ok and task['attempts'] <= self.max_retries and not self._cancelled:
+            self._tasks.put(task)
+            return
+        with self._lock:
+            self._results[task['id']] = {
+                'path': task['path'],
+                'ok': ok,
+                'output': task['output'] if ok else None,
+                'error': result.get('error'),
+                'attempts': task['attempts'],
+                'worker': worker_index,
+                'seconds': result.get('seconds', 0.0)
+            }
+            self._completed.append(task['id'])
+
+    def _worker_loop(self, index):
+        worker = WorkerProcess(index, self.launcher, self.log_path(index))
+        try:
+            while not self._cancelled and not self._finished():
+                try:
+                    task = self._tasks.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+
+                if not worker.alive:
+                    try:
+                        worker.start(self.startup_timeout)
+                    except WorkerError as e:
+                        # 无法启动时把任务交还给其他工作进程
+                        self._tasks.put(task)
+                        with self._lock:
+                            self._launch_errors.append(str(e))
+                        return
+
+                task['attempts'] += 1
+                try:
+                    result = worker.run_task(task, self.task_timeout)
+                except WorkerError as e:
+                    result = {'ok': False, 'error': str(e)}
+                self._record(task, index, result)
+        finally:
+            worker.stop()
@@ -0,0 +1,145 @@
+"""文件结果缓存 - 以 路径+修改时间+大小 为键把任意可JSON序列化的结果保存到磁盘"""
+import json
+import os
+import threading
+
+
+class FileResultCache:
+    """文件未变化 (修改时间和大小相同) 时返回之前保存的结果，可在线程池中并发使用"""
+
+    def __init__(self, cache_path, version=1):
+        self.cache_path = cache_path
+        self.version = version
+        self.entries = {}
+        self.dirty = False
+        self.lock = threading.RLock()
+        self._loaded = False
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    @staticmethod
+    def file_signature(path):
+        """返回文件的 (修改时间, 大小)"""
+        stat = os.stat(path)
+        return stat.st_mtime, stat.st_size
+
+    def _reset(self):
+        self.entries = {}
+
+    def _restore(self, data):
+        """从读取的JSON恢复缓存内容 (子类可保存其他部分)"""
+        self.entries = data.get('entries', {})
+
+    def _snapshot(self):
+        """要写入磁盘的JSON内容"""
+        return {'version': self.version, 'entries': self.entries}
+
+    def load(self):
+        """从磁盘读取缓存，文件不存在、已损坏或版本不同时使用空缓存"""
+        with self.lock:
+            self._reset()
+            self.dirty = False
+            self._loaded = True
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                return False
+            if not isinstance(data, dict) or data.get('version') != self.version:
+                return False
+            self._restore(data)
+            return True
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def _write(self):
+        temp_path = self.cache_path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._snapshot(), f, ensure_ascii=False)
+        except (TypeError, ValueError):
+            os.remove(temp_path)
+            raise
+        os.replace(temp_path, self.cache_path)
+
+    def _drop_unserializable(self):
+        """删除无法序列化为JSON的条目，返回删除的数量"""
+        dropped = []
+        for key, entry in self.entries.items():
+            try:
+                json.dumps(entry)
+            except (TypeError, ValueError):
+                dropped.append(key)
+        for key in dropped:
+            del self.entries[key]
+        return len(dropped)
+
+    def save(self):
+        """写回磁盘 (先写临时文件再替换)，无法序列化的条目会被丢弃"""
+        with self.lock:
+            if not self.dirty:
+                return True
+            try:
+                cache_dir = os.path.dirname(self.cache_path)
+                if cache_dir:
+                    os.makedirs(cache_dir, exist_ok=True)
+                try:
+                    self._write()
+                except (TypeError, ValueError) as e:
+                    if not self._drop_unserializable():
+                        raise
+                    print(f"缓存中有无法保存的条目，已丢弃 {self.cache_path}: {str(e)}")
+                    self._write()
+                self.dirty = False
+                return True
+            except (OSError, TypeError, ValueError) as e:
+                print(f"缓存保存失败 {self.cache_path}: {str(e)}")
+                return False
+
+    def get(self, path, signature=None):
+        """返回文件对应的结果，文件已变化或没有缓存时返回None
+
+        signature 为已取得的 (修改时间, 大小)，省略时读取文件状态
+        """
+        with self.lock:
+            self._ensure_loaded()
+            entry = self.entries.get(self._key(path))
+        if entry is None:
+            return None
+
+        if signature is None:
+            try:
+                signature = self.file_signature(path)
+            except OSError:
+                return None
+
+        if entry['mtime'] != signature[0] or entry['size'] != signature[1]:
+            return None
+        return entry['value']
+
+    def put(self, path, value, signature=None):
+        """保存文件对应的结果"""
+        if signature is None:
+            signature = self.file_signature(path)
+        with self.lock:
+            self._ensure_loaded()
+            self.entries[self._key(path)] = {
+                'mtime': signature[0],
+                'size': signature[1],
+                'value': value
+            }
+            self.dirty = True
+
+    def invalidate(self, path=None):
+        """使单个文件或全部缓存失效"""
+        with self.lock:
+            self._ensure_loaded()
+            if path is None:
+                self.entries = {}
+            else:
+                self.entries.pop(self._key(path), None)
+            self.dirty = True
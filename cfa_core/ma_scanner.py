@@ -0,0 +1,265 @@
+"""离线扫描和清理感染 PuTianTongQing 病毒的Maya ASCII (.ma) 文件 (不需要打开Maya)
+
+在Maya中打开感染的场景会执行其中的脚本节点，本模块直接读取文件 (mmap) 查找
+`createNode script` 块，按与 plugins/CleanPuTianTongQing.py 共用的特征库 (cfa_core.scene_signatures) 判断是否感染，
+可以另存一份删除了感染节点的副本。扫描整个目录时使用进程池，结果按 路径+修改时间+大小 缓存。
+
+    python -m cfa_core.ma_scanner <目录> [--clean-dir 输出目录] [--workers N] [--signatures 特征库] [--json]
+"""
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from cfa_core.abc_walker import walk_files
+from cfa_core.file_cache import FileResultCache
+from cfa_core.scene_signatures import SignatureError, load_signatures
+
+
+CACHE_VERSION = 1
+
+# 每个进程读取过的特征库 {路径: SignatureDatabase}
+_signatures = {}
+
+MA_HEADER = b'//Maya ASCII'
+SCRIPT_NODE_MARKER = b'\ncreateNode script '
+
+_NAME_RE = re.compile(rb'\s-n\s+"((?:[^"\\]|\\.)*)"')
+# 长字符串写为多行时用 + 连接，可能带括号: -type "string" (\n\t\t"..."\n\t\t+ "...");
+_BEFORE_RE = re.compile(
+    rb'\n\s*setAttr\s+"\.(?:b|before)"\s+-type\s+"string"\s*'
+    rb'(\(\s*(?:"(?:[^"\\]|\\.)*"\s*\+?\s*)+\)|(?:"(?:[^"\\]|\\.)*"\s*\+?\s*)+)\s*;'
+)
+_STRING_RE = re.compile(rb'"((?:[^"\\]|\\.)*)"')
+_ESCAPE_RE = re.compile(rb'\\(.)', re.DOTALL)
+_ESCAPES = {b'n': b'\n', b't': b'\t', b'r': b'\r'}
+
+
+class ScanError(Exception):
+    """文件不是Maya ASCII格式或无法读取"""
+
+
+def default_cache_path():
+    """当前用户的缓存文件: Windows为 %LOCALAPPDATA%，其他系统为 $XDG_CACHE_HOME 或 ~/.cache，都没有时使用临时目录"""
+    cache_dir = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME')
+    if not cache_dir:
+        home = os.path.expanduser('~')
+        cache_dir = os.path.join(home, '.cache') if home != '~' else tempfile.gettempdir()
+    return os.path.join(cache_dir, 'cfa_tools_cache', 'ma_scan.json')
+
+
+DEFAULT_CACHE_PATH = default_cache_path()
+
+
+def _unescape(data):
+    return _ESCAPE_RE.sub(lambda match: _ESCAPES.get(match.group(1), match.group(1)), data)
+
+
+def _decode(data):
+    return data.decode('utf-8', 'replace')
+
+
+def _block_end(data, start):
+    """节点块在下一个不以制表符开头的行之前结束"""
+    position = start
+    while True:
+        newline = data.find(b'\n', position)
+        if newline == -1:
+            return len(data)
+        if data[newline + 1:newline + 2] != b'\t':
+            return newline + 1
+        position = newline + 1
+
+
+def parse_before_script(block):
+    """从节点块中读取 .before 脚本，没有时返回None"""
+    match = _BEFORE_RE.search(block)
+    if not match:
+        return None
+    return _decode(_unescape(b''.join(_STRING_RE.findall(match.group(1)))))
+
+
+def iter_script_nodes(data):
+    """查找所有脚本节点，生成 {'name', 'block', 'start', 'end'}
+
+    data 为文件内容 (bytes 或 mmap)，start/end 为节点块 (包括其下的 setAttr 等行) 的字节范围，
+    脚本内容用 parse_before_script(block) 读取
+    """
+    position = data.find(SCRIPT_NODE_MARKER)
+    while position != -1:
+        start = position + 1
+        end = _block_end(data, start)
+        block = data[start:end]
+
+        first_line_end = block.find(b'\n')
+        match = _NAME_RE.search(block, 0, first_line_end if first_line_end != -1 else len(block))
+        name = _decode(_unescape(match.group(1))) if match else ''
+        yield {'name': name, 'block': block, 'start': start, 'end': end}
+
+        position = data.find(SCRIPT_NODE_MARKER, end - 1)
+
+
+def get_signatures(path=None):
+    """读取特征库 (每个进程每个路径只读取一次)"""
+    if path not in _signatures:
+        _signatures[path] = load_signatures(path)
+    return _signatures[path]
+
+
+def _find_infected(data, signatures):
+    if data[:len(MA_HEADER)] != MA_HEADER:
+        raise ScanError("不是Maya ASCII文件")
+    findings = []
+    for node in iter_script_nodes(data):
+        # 只有节点名与需要检查内容的规则匹配时才解析脚本内容
+        rule = signatures.match_script_node(node['name'], lambda: parse_before_script(node['block']))
+        if rule is not None:
+            findings.append({'node': node['name'], 'reason': rule['id'], 'start': node['start'], 'end': node['end']})
+    return findings
+
+
+def _map_file(f):
+    if os.fstat(f.fileno()).st_size == 0:
+        raise ScanError("空文件")
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def scan_file(path, signatures_path=None):
+    """扫描单个文件，返回 [{'node', 'reason'}, ...]，没有感染时为空列表 (reason 为特征库中规则的id)"""
+    signatures = get_signatures(signatures_path)
+    try:
+        with open(path, 'rb') as f, _map_file(f) as data:
+            findings = _find_infected(data, signatures)
+    except (OSError, ValueError) as e:
+        raise ScanError(str(e))
+    return [{'node': finding['node'], 'reason': finding['reason']} for finding in findings]
+
+
+def clean_file(path, output_path, signatures_path=None):
+    """把删除了感染脚本节点的副本写到 output_path，返回删除的节点列表 (没有感染时不写文件)"""
+    signatures = get_signatures(signatures_path)
+    try:
+        with open(path, 'rb') as f, _map_file(f) as data:
+            findings = _find_infected(data, signatures)
+            if not findings:
+                return []
+
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            temp_path = output_path + '.tmp'
+            with open(temp_path, 'wb') as out:
+                position = 0
+                for finding in findings:
+                    out.write(data[position:finding['start']])
+                    position = finding['end']
+                out.write(data[position:])
+        os.replace(temp_path, output_path)
+    except (OSError, ValueError) as e:
+        raise ScanError(str(e))
+    return [{'node': finding['node'], 'reason': finding['reason']} for finding in findings]
+
+
+def _scan_task(task):
+    """进程池任务: (路径, 清理后副本的路径或None, 特征库路径) -> 结果字典"""
+    path, clean_path, signatures_path = task
+    result = {'path': path, 'infected': False, 'findings': [], 'cleaned': None, 'error': None}
+    try:
+        result['findings'] = scan_file(path, signatures_path)
+        result['infected'] = bool(result['findings'])
+        if result['infected'] and clean_path:
+            clean_file(path, clean_path, signatures_path)
+            result['cleaned'] = clean_path
+    except ScanError as e:
+        result['error'] = str(e)
+    return result
+
+
+def scan_tree(root, clean_dir=None, workers=None, cache_path=DEFAULT_CACHE_PATH, exclude=None,
+              signatures_path=None):
+    """扫描目录中所有 .ma 文件，返回每个文件的 {'path', 'infected', 'findings', 'cleaned', 'error', 'cached'}
+
+    clean_dir 不为空时把感染文件删除病毒节点后的副本按相同的相对路径写到该目录。
+    cache_path 为None时不使用缓存；文件和特征库都未变化时直接使用缓存的结果 (需要写副本的感染文件除外)
+    """
+    # 在启动进程池之前读取特征库，格式错误时直接报错
+    digest = get_signatures(signatures_path).digest
+    entries = walk_files(root, ('.ma',), exclude=exclude)
+    cache = FileResultCache(cache_path, version=CACHE_VERSION) if cache_path else None
+
+    results = {}
+    tasks = []
+    file_signatures = {}
+    for entry in entries:
+        signature = file_signatures[entry['path']] = (entry['mtime'], entry['size'])
+        cached = cache.get(entry['path'], signature) if cache is not None else None
+        if cached is not None and cached.get('signatures') == digest and not (cached['infected'] and clean_dir):
+            results[entry['path']] = dict(cached, cached=True)
+            del results[entry['path']]['signatures']
+            continue
+        clean_path = os.path.join(clean_dir, entry['relative_path']) if clean_dir else None
+        tasks.append((entry['path'], clean_path, signatures_path))
+
+    if tasks:
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(_scan_task, tasks, chunksize=4):
+                results[result['path']] = dict(result, cached=False)
+                if cache is not None and result['error'] is None:
+                    cache.put(result['path'], {
+                        'path': result['path'],
+                        'infected': result['infected'],
+                        'findings': result['findings'],
+                        'cleaned': None,
+                        'error': None,
+                        'signatures': digest
+                    }, file_signatures[result['path']])
+        if cache is not None:
+            cache.save()
+
+    return [results[entry['path']] for entry in entries]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="离线扫描感染 PuTianTongQing 病毒的 .ma 文件")
+    parser.add_argument('root', help="要扫描的目录")
+    parser.add_argument('--clean-dir', help="把感染文件清理后的副本写到此目录 (保持相对路径)")
+    parser.add_argument('--workers', type=int, help="进程数 (默认为CPU核数)")
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help="扫描结果缓存文件")
+    parser.add_argument('--no-cache', action='store_true', help="重新扫描所有文件")
+    parser.add_argument('--signatures', help="特征库JSON文件 (默认为 cfa_core/scene_signatures.json)")
+    parser.add_argument('--exclude', nargs='*', default=[], help="排除的通配符 (与相对路径或文件名匹配)")
+    parser.add_argument('--json', action='store_true', help="以JSON输出所有结果")
+    args = parser.parse_args(argv)
+
+    try:
+        results = scan_tree(args.root, args.clean_dir, args.workers,
+                            None if args.no_cache else args.cache, args.exclude, args.signatures)
+    except SignatureError as e:
+        print(str(e))
+        return 2
+    infected = [result for result in results if result['infected']]
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        for result in results:
+            if result['error']:
+                print(f"无法扫描 {result['path']}: {result['error']}")
+        for result in infected:
+            nodes = ", ".join(f"{finding['node']} ({finding['reason']})" for finding in result['findings'])
+            print(f"感染: {result['path']}: {nodes}")
+            if result['cleaned']:
+                print(f"  已写入清理后的副本: {result['cleaned']}")
+        cached_count = sum(1 for result in results if result['cached'])
+        print(f"扫描了 {len(results)} 个文件 (其中 {cached_count} 个未变化，使用缓存)，"
+              f"{len(infected)} 个感染")
+    return 1 if infected else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
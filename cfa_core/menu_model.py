@@ -0,0 +1,250 @@
+"""声明式菜单模型 - 用菜单项描述树表示菜单，比较新旧两棵树后只执行必要的 创建/修改/删除
+
+框架和旧版 plug-ins/cfa_tools.py 通过 get_shared_menu() 取得同一个 MenuTree，
+各自注册一个分区 (section)，互不覆盖对方的菜单项。
+
+apply() 接收 maya.cmds (或具有相同接口的对象)，本模块本身不依赖Maya。
+"""
+
+
+class MenuCallback:
+    """可比较的菜单回调 - 函数和参数相同即视为相同命令，避免重复修改菜单项"""
+
+    def __init__(self, function, *args):
+        self.function = function
+        self.args = args
+
+    def __call__(self, *maya_args):
+        return self.function(*self.args)
+
+    def __eq__(self, other):
+        return (isinstance(other, MenuCallback)
+                and self.function == other.function and self.args == other.args)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.function, self.args))
+
+
+class MenuItemSpec:
+    """菜单项描述，创建后不应再修改 (需要变化时创建新对象)"""
+
+    def __init__(self, key, label=None, command=None, sub_menu=False, divider=False,
+                 tear_off=False, check_box=None, enable=True, children=()):
+        self.key = key
+        self.label = label
+        self.command = command
+        self.sub_menu = sub_menu
+        self.divider = divider
+        self.tear_off = tear_off
+        self.check_box = check_box
+        self.enable = enable
+        self.children = tuple(children)
+
+    def same_kind(self, other):
+        """类型相同的菜单项可以原地修改，否则需要删除后重建"""
+        return (self.sub_menu == other.sub_menu and self.divider == other.divider
+                and self.tear_off == other.tear_off
+                and (self.check_box is None) == (other.check_box is None))
+
+    def flags(self):
+        """可以通过 menuItem -edit 修改的标志"""
+        if self.divider:
+            return {}
+        flags = {'label': self.label, 'enable': self.enable}
+        if not self.sub_menu:
+            flags['command'] = self.command
+        if self.check_box is not None:
+            flags['checkBox'] = self.check_box
+        return flags
+
+
+class _AppliedItem:
+    """已创建到Maya中的菜单项"""
+
+    __slots__ = ('spec', 'path', 'children')
+
+    def __init__(self, spec, path, children):
+        self.spec = spec
+        self.path = path
+        self.children = children
+
+
+def _longest_increasing(keys, index):
+    """返回 index[key] 严格递增的最长子序列 (这些菜单项无需移动)"""
+    tails = []
+    tail_keys = []
+    previous = {}
+    for key in keys:
+        value = index[key]
+        low, high = 0, len(tails)
+        while low < high:
+            middle = (low + high) // 2
+            if tails[middle] < value:
+                low = middle + 1
+            else:
+                high = middle
+        previous[key] = tail_keys[low - 1] if low else None
+        if low == len(tails):
+            tails.append(value)
+            tail_keys.append(key)
+        else:
+            tails[low] = value
+            tail_keys[low] = key
+
+    result = []
+    key = tail_keys[-1] if tail_keys else None
+    while key is not None:
+        result.append(key)
+        key = previous[key]
+    return set(result)
+
+
+def _create(cmds, parent, spec, insert_after, stats):
+    flags = {'parent': parent, 'insertAfter': insert_after}
+    if spec.divider:
+        flags['divider'] = True
+    else:
+        flags.update(spec.flags())
+        if spec.sub_menu:
+            flags['subMenu'] = True
+            flags['tearOff'] = spec.tear_off
+        if flags.get('command') is None:
+            flags.pop('command', None)
+
+    path = cmds.menuItem(**flags)
+    stats['create'] += 1
+
+    children = []
+    if spec.sub_menu:
+        children = _reconcile(cmds, path, [], [(child.key, child) for child in spec.children], stats)
+    return _AppliedItem(spec, path, children)
+
+
+def _update(cmds, item, spec, stats):
+    if item.spec is spec:
+        return item
+
+    old_flags = item.spec.flags()
+    changed = {}
+    for name, value in spec.flags().items():
+        if old_flags.get(name) != value:
+            changed[name] = value
+    if changed:
+        cmds.menuItem(item.path, edit=True, **changed)
+        stats['edit'] += 1
+
+    children = item.children
+    if spec.sub_menu:
+        children = _reconcile(
+            cmds, item.path, item.children, [(child.key, child) for child in spec.children], stats
+        )
+    return _AppliedItem(spec, item.path, children)
+
+
+def _delete(cmds, item, stats):
+    cmds.deleteUI(item.path, menuItem=True)
+    stats['delete'] += 1
+
+
+def _reconcile(cmds, parent, old_items, new_entries, stats):
+    """把 parent 下的菜单项从 old_items 调整为 new_entries [(key, spec), ...]，返回新的已创建列表"""
+    old_by_key = {}
+    old_index = {}
+    for index, (key, item) in enumerate(old_items):
+        old_by_key[key] = item
+        old_index[key] = index
+
+    # 保留类型相同且相对顺序不变的菜单项，其余删除后重建
+    survivors = [
+        key for key, spec in new_entries
+        if key in old_by_key and old_by_key[key].spec.same_kind(spec)
+    ]
+    keep = _longest_increasing(survivors, old_index)
+
+    for key, item in old_items:
+        if key not in keep:
+            _delete(cmds, item, stats)
+
+    result = []
+    previous_path = ""
+    for key, spec in new_entries:
+        if key in keep:
+            item = _update(cmds, old_by_key[key], spec, stats)
+        else:
+            item = _create(cmds, parent, spec, previous_path, stats)
+        result.append((key, item))
+        previous_path = item.path
+    return result
+
+
+class MenuTree:
+    """一个顶层菜单的声明式模型，由多个分区按顺序组成"""
+
+    def __init__(self, menu_name, label, parent='MayaWindow'):
+        self.menu_name = menu_name
+        self.label = label
+        self.parent = parent
+        self.sections = {}
+        self.applied = None
+        self.applied_label = None
+
+    def set_section(self, name, specs, order=0):
+        """设置分区内容 (替换该分区原有的菜单项)"""
+        self.sections[name] = (order, tuple(specs))
+
+    def remove_section(self, name):
+        """移除分区"""
+        self.sections.pop(name, None)
+
+    def desired_entries(self):
+        """按分区顺序展开的 [(键, 菜单项描述)]，键中包含分区名避免不同分区冲突"""
+        entries = []
+        for name in sorted(self.sections, key=lambda section: (self.sections[section][0], section)):
+            for spec in self.sections[name][1]:
+                entries.append(((name, spec.key), spec))
+        return entries
+
+    def apply(self, cmds):
+        """把模型同步到Maya菜单，返回 {'create': n, 'edit': n, 'delete': n}"""
+        stats = {'create': 0, 'edit': 0, 'delete': 0}
+
+        if not self.sections:
+            self.delete(cmds)
+            return stats
+
+        if self.applied is None or not cmds.menu(self.menu_name, exists=True):
+            # 菜单内容未知 (例如由旧版本代码创建)，只能重新创建
+            if cmds.menu(self.menu_name, exists=True):
+                cmds.deleteUI(self.menu_name)
+            cmds.menu(self.menu_name, label=self.label, parent=self.parent)
+            self.applied = []
+            self.applied_label = self.label
+        elif self.applied_label != self.label:
+            cmds.menu(self.menu_name, edit=True, label=self.label)
+            self.applied_label = self.label
+            stats['edit'] += 1
+
+        self.applied = _reconcile(cmds, self.menu_name, self.applied, self.desired_entries(), stats)
+        return stats
+
+    def delete(self, cmds):
+        """删除整个菜单"""
+        if cmds.menu(self.menu_name, exists=True):
+            cmds.deleteUI(self.menu_name)
+        self.applied = None
+        self.applied_label = None
+
+
+_shared_menus = {}
+
+
+def get_shared_menu(menu_name, label):
+    """获取进程内共享的菜单模型，同名菜单的所有使用者注册到同一棵树"""
+    menu = _shared_menus.get(menu_name)
+    if menu is None:
+        menu = MenuTree(menu_name, label)
+        _shared_menus[menu_name] = menu
+    return menu
@@ -0,0 +1,424 @@
+"""Alembic (Ogawa) 元数据读取 - 不依赖Maya和Alembic SDK
+
+用 mmap 映射文件，通过 memoryview 切片零拷贝读取，只访问组索引和少量元数据块，
+不读取几何数据本身。
+
+Ogawa 容器格式:
+* 文件头16字节: 'Ogawa' + 冻结标志 + 版本号(2字节) + 根组偏移(uint64)
+* 组: uint64 子项数量 + 每个子项的 uint64 偏移，最高位为1表示数据块，否则为组
+* 数据块: uint64 大小 + 内容，偏移为0表示空组/空数据块
+
+Alembic 在 Ogawa 之上的布局 (AbcCoreOgawa):
+* 根组: [0]归档版本 [1]库版本 [2]顶层对象组 [3]归档元数据 [4]时间采样 [5]索引元数据
+* 对象组: [0]属性组 [1..n-2]子对象组 [n-1]子对象头 (末尾32字节为哈希)
+"""
+import mmap
+import os
+import struct
+import sys
+
+from cfa_core.file_cache import FileResultCache
+
+
+OGAWA_MAGIC = b'Ogawa'
+HEADER_SIZE = 16
+DATA_FLAG = 0x8000000000000000
+POSITION_MASK = 0x7FFFFFFFFFFFFFFF
+OBJECT_HEADER_HASH_SIZE = 32
+METADATA_INLINE = 0xff
+
+# Alembic中非周期时间采样的标记值
+ACYCLIC_TIME_PER_CYCLE = sys.float_info.max / 32.0
+
+SAMPLING_UNIFORM = 'uniform'
+SAMPLING_CYCLIC = 'cyclic'
+SAMPLING_ACYCLIC = 'acyclic'
+
+CACHE_VERSION = 1
+
+# 组和对象层级的最大深度，超过时视为文件损坏
+MAX_DEPTH = 256
+
+_UINT32 = struct.Struct('<I')
+_INT32 = struct.Struct('<i')
+_UINT64 = struct.Struct('<Q')
+_DOUBLE = struct.Struct('<d')
+
+
+class OgawaError(Exception):
+    """不是Ogawa文件或文件结构损坏"""
+
+
+class OgawaArchive:
+    """只读的Ogawa容器，按偏移访问组和数据块"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self.size = os.fstat(self._file.fileno()).st_size
+            if self.size < HEADER_SIZE:
+                raise OgawaError("文件过小，不是Ogawa文件")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+        self.view = memoryview(self._mmap)
+
+        if self.view[:5] != OGAWA_MAGIC:
+            self.close()
+            raise OgawaError("不是Ogawa文件")
+        self.frozen = self.view[5] == 0xff
+        self.root = self.uint64(8)
+
+    def close(self):
+        if self.view is not None:
+            self.view.release()
+            self.view = None
+            try:
+                self._mmap.close()
+            except BufferError:
+                # 仍有切片引用映射 (例如异常回溯中)，最后一个切片释放时自动解除映射
+                pass
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def uint64(self, position):
+        if position + 8 > self.size:
+            raise OgawaError(f"偏移超出文件范围: {position}")
+        return _UINT64.unpack_from(self.view, position)[0]
+
+    @staticmethod
+    def is_data(child):
+        return bool(child & DATA_FLAG)
+
+    def children(self, group):
+        """返回组的子项偏移列表"""
+        position = group & POSITION_MASK
+        if position == 0:
+            return []
+        count = self.uint64(position)
+        end = position + 8 + count * 8
+        if end > self.size:
+            raise OgawaError(f"组索引超出文件范围: {position}")
+        return list(struct.unpack_from(f'<{count}Q', self.view, position + 8))
+
+    def data_size(self, data):
+        position = data & POSITION_MASK
+        if position == 0:
+            return 0
+        size = self.uint64(position)
+        if position + 8 + size > self.size:
+            raise OgawaError(f"数据块超出文件范围: {position}")
+        return size
+
+    def data(self, data):
+        """返回数据块内容的memoryview (不复制)"""
+        size = self.data_size(data)
+        if size == 0:
+            return self.view[0:0]
+        position = (data & POSITION_MASK) + 8
+        return self.view[position:position + size]
+
+
+def parse_metadata(text):
+    """解析Alembic元数据字符串 'key=value;key=value'"""
+    metadata = {}
+    for item in text.split(';'):
+        key, separator, value = item.partition('=')
+        if separator:
+            metadata[key] = value
+    return metadata
+
+
+def _decode(view):
+    return bytes(view).decode('utf-8', 'replace')
+
+
+def _read_indexed_metadata(view):
+    """索引元数据: 每项为 uint8 长度 + 字符串，索引0固定为空元数据"""
+    entries = [{}]
+    position = 0
+    while position < len(view):
+        size = view[position]
+        position += 1
+        entries.append(parse_metadata(_decode(view[position:position + size])))
+        position += size
+    return entries
+
+
+def _read_time_samplings(view):
+    """时间采样: 每项为 uint32 最大采样数 + double 周期时长 + uint32 每周期采样数 + double采样时间"""
+    samplings = []
+    position = 0
+    while position + 16 <= len(view):
+        max_samples = _UINT32.unpack_from(view, position)[0]
+        time_per_cycle = _DOUBLE.unpack_from(view, position + 4)[0]
+        count = _UINT32.unpack_from(view, position + 12)[0]
+        position += 16
+        if position + count * 8 > len(view):
+            raise OgawaError("时间采样数据不完整")
+        times = struct.unpack_from(f'<{count}d', view, position)
+        position += count * 8
+
+        if time_per_cycle == ACYCLIC_TIME_PER_CYCLE:
+            kind = SAMPLING_ACYCLIC
+        elif count == 1:
+            kind = SAMPLING_UNIFORM
+        else:
+            kind = SAMPLING_CYCLIC
+
+        start = times[0] if times else 0.0
+        end = start
+        if max_samples > 0 and times:
+            last = max_samples - 1
+            if kind == SAMPLING_ACYCLIC:
+                end = times[min(last, count - 1)]
+            else:
+                end = times[last % count] + (last // count) * time_per_cycle
+
+        samplings.append({
+            'index': len(samplings),
+            'type': kind,
+            'time_per_cycle': None if kind == SAMPLING_ACYCLIC else time_per_cycle,
+            'samples_per_cycle': count,
+            'max_samples': max_samples,
+            'start': start,
+            'end': end
+        })
+    return samplings
+
+
+def _read_object_headers(view, indexed_metadata):
+    """子对象头: uint32 名称长度 + 名称 + uint8 元数据索引 (0xff时后跟 uint32 长度 + 元数据)"""
+    headers = []
+    end = len(view) - OBJECT_HEADER_HASH_SIZE
+    position = 0
+    while position < end:
+        name_size = _UINT32.unpack_from(view, position)[0]
+        position += 4
+        name = _decode(view[position:position + name_size])
+        position += name_size
+        index = view[position]
+        position += 1
+        if index == METADATA_INLINE:
+            size = _UINT32.unpack_from(view, position)[0]
+            position += 4
+            metadata = parse_metadata(_decode(view[position:position + size]))
+            position += size
+        elif index < len(indexed_metadata):
+            metadata = indexed_metadata[index]
+        else:
+            metadata = {}
+        headers.append((name, metadata))
+    if position != max(end, 0):
+        raise OgawaError("对象头数据不完整")
+    return headers
+
+
+class _SizeCounter:
+    """统计组下所有数据块的大小，被多处引用的数据块和组只计一次"""
+
+    def __init__(self, archive):
+        self.archive = archive
+        self.seen = set()
+        self.seen_groups = set()
+
+    def group_size(self, group):
+        """组结构存在循环或层级超过 MAX_DEPTH 时抛出 OgawaError"""
+        total = 0
+        # 当前路径上的组 (用于检测循环)，(位置, False) 表示进入组，(位置, True) 表示离开组
+        ancestors = set()
+        stack = [(group & POSITION_MASK, False)]
+        while stack:
+            position, leaving = stack.pop()
+            if leaving:
+                ancestors.discard(position)
+                continue
+            if not position or position in self.seen_groups:
+                continue
+            if len(ancestors) >= MAX_DEPTH:
+                raise OgawaError(f"组层级过深: {position}")
+            self.seen_groups.add(position)
+            ancestors.add(position)
+            stack.append((position, True))
+
+            for child in self.archive.children(position):
+                child_position = child & POSITION_MASK
+                if OgawaArchive.is_data(child):
+                    if child_position and child_position not in self.seen:
+                        self.seen.add(child_position)
+                        total += self.archive.data_size(child)
+                elif child_position in ancestors:
+                    raise OgawaError(f"组结构存在循环: {child_position}")
+                elif child_position:
+                    stack.append((child_position, False))
+        return total
+
+    def data_size(self, data):
+        position = data & POSITION_MASK
+        if not position or position in self.seen:
+            return 0
+        self.seen.add(position)
+        return self.archive.data_size(data)
+
+
+def _read_objects(archive, group, parent_path, indexed_metadata, sizes, objects, depth=0, ancestors=None):
+    """深度优先读取对象层级，返回该组下所有对象的数据量合计
+
+    ancestors 为当前路径上的对象组，对象组循环引用或层级超过 MAX_DEPTH 时抛出 OgawaError
+    """
+    if depth > MAX_DEPTH:
+        raise OgawaError(f"对象层级过深: {parent_path}")
+    children = archive.children(group)
+    if not children or not OgawaArchive.is_data(children[-1]):
+        return 0
+
+    position = group & POSITION_MASK
+    if ancestors is None:
+        ancestors = set()
+    if position in ancestors:
+        raise OgawaError(f"对象层级存在循环: {parent_path}")
+    ancestors.add(position)
+
+    headers = _read_object_headers(archive.data(children[-1]), indexed_metadata)
+    if len(headers) > len(children) - 2:
+        raise OgawaError(f"对象数量与组结构不符: {parent_path or '/'}")
+
+    total = 0
+    for index, (name, metadata) in enumerate(headers):
+        child_group = children[index + 1]
+        path = f"{parent_path}/{name}"
+        entry = {
+            'path': path,
+            'name': name,
+            'depth': depth,
+            'schema': metadata.get('schema', ''),
+            'size': 0,
+            'total_size': 0
+        }
+        objects.append(entry)
+
+        if sizes is not None:
+            grandchildren = archive.children(child_group)
+            if grandchildren and not OgawaArchive.is_data(grandchildren[0]):
+                entry['size'] += sizes.group_size(grandchildren[0])
+            if grandchildren and OgawaArchive.is_data(grandchildren[-1]):
+                entry['size'] += sizes.data_size(grandchildren[-1])
+
+        descendants = _read_objects(
+            archive, child_group, path, indexed_metadata, sizes, objects, depth + 1, ancestors
+        )
+        entry['total_size'] = entry['size'] + descendants
+        total += entry['total_size']
+    ancestors.discard(position)
+    return total
+
+
+def frame_range(samplings):
+    """归档的时间范围 (秒)，优先使用动画时间采样 (索引0为默认的静态采样)"""
+    animated = [s for s in samplings[1:] if s['max_samples'] > 0]
+    if not animated:
+        animated = [s for s in samplings if s['max_samples'] > 0]
+    if not animated:
+        return None
+    return min(s['start'] for s in animated), max(s['end'] for s in animated)
+
+
+def read_archive(path, compute_sizes=True):
+    """读取归档信息，返回可JSON序列化的字典
+
+    {'path', 'file_size', 'archive_version', 'library_version', 'metadata',
+     'time_samplings', 'start_time', 'end_time', 'fps', 'objects'}
+
+    objects 按深度优先顺序排列，每项 {'path', 'name', 'depth', 'schema', 'size', 'total_size'}，
+    size 为对象自身属性的数据量 (近似，不含子对象)
+    """
+    try:
+        return _read_archive(path, compute_sizes)
+    except (struct.error, IndexError, RecursionError) as e:
+        raise OgawaError(f"文件结构损坏: {str(e)}")
+
+
+def _read_archive(path, compute_sizes):
+    with OgawaArchive(path) as archive:
+        if not archive.frozen:
+            raise OgawaError("Ogawa文件未写入完成")
+
+        root = archive.children(archive.root)
+        if (len(root) < 5 or not all(OgawaArchive.is_data(root[i]) for i in (0, 1, 3, 4))
+                or OgawaArchive.is_data(root[2])):
+            raise OgawaError("不是Alembic归档")
+
+        def read_int(child):
+            view = archive.data(child)
+            return _INT32.unpack_from(view)[0] if len(view) == 4 else None
+
+        indexed_metadata = [{}]
+        if len(root) > 5 and OgawaArchive.is_data(root[5]):
+            indexed_metadata = _read_indexed_metadata(archive.data(root[5]))
+
+        samplings = _read_time_samplings(archive.data(root[4]))
+        objects = []
+        sizes = _SizeCounter(archive) if compute_sizes else None
+        _read_objects(archive, root[2], '', indexed_metadata, sizes, objects)
+
+        info = {
+            'path': path,
+            'file_size': archive.size,
+            'archive_version': read_int(root[0]),
+            'library_version': read_int(root[1]),
+            'metadata': parse_metadata(_decode(archive.data(root[3]))),
+            'time_samplings': samplings,
+            'start_time': None,
+            'end_time': None,
+            'fps': None,
+            'objects': objects
+        }
+
+    time_range = frame_range(samplings)
+    if time_range is not None:
+        info['start_time'], info['end_time'] = time_range
+    uniform = [s for s in samplings[1:] if s['type'] == SAMPLING_UNIFORM and s['time_per_cycle'] > 0]
+    if uniform:
+        info['fps'] = round(1.0 / uniform[0]['time_per_cycle'], 3)
+    return info
+
+
+def summarize(info, top_level_limit=None):
+    """汇总对象数量: {'objects', 'by_schema': {schema: 数量}, 'top_level': [路径, ...]}"""
+    by_schema = {}
+    for entry in info['objects']:
+        schema = entry['schema'] or '未知'
+        by_schema[schema] = by_schema.get(schema, 0) + 1
+    top_level = [entry['path'] for entry in info['objects'] if entry['depth'] == 0]
+    if top_level_limit is not None:
+        top_level = top_level[:top_level_limit]
+    return {'objects': len(info['objects']), 'by_schema': by_schema, 'top_level': top_level}
+
+
+class ArchiveInfoCache:
+    """按 路径+修改时间+大小 缓存 read_archive 的结果"""
+
+    def __init__(self, cache_path):
+        self.cache = FileResultCache(cache_path, version=CACHE_VERSION)
+
+    def read(self, path, compute_sizes=True):
+        """返回归档信息，文件未变化时直接使用缓存"""
+        signature = FileResultCache.file_signature(path)
+        info = self.cache.get(path, signature)
+        if info is not None and (info['sizes_computed'] or not compute_sizes):
+            return info
+
+        info = read_archive(path, compute_sizes=compute_sizes)
+        info['sizes_computed'] = compute_sizes
+        self.cache.put(path, info, signature)
+        return info
+
+    def save(self):
+        return self.cache.save()
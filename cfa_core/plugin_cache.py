@@ -0,0 +1,103 @@
+import os
+import hashlib
+
+from cfa_core.file_cache import FileResultCache
+
+
+class PluginManifestCache(FileResultCache):
+    """插件清单缓存 - 以 路径+修改时间+大小 为键保存插件元数据到磁盘
+    
+    get/put 可以在插件发现线程池中并发调用。读写和临时文件替换由 FileResultCache 处理，
+    每个条目的值为 {'sha1', 'metadata'}，另外保存插件目录的文件列表
+    """
+    
+    CACHE_VERSION = 3
+    
+    def __init__(self, cache_path):
+        self.directories = {}
+        super().__init__(cache_path, version=self.CACHE_VERSION)
+    
+    @staticmethod
+    def file_hash(path):
+        """计算文件内容的SHA1"""
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+    
+    def _reset(self):
+        super()._reset()
+        self.directories = {}
+    
+    def _restore(self, data):
+        super()._restore(data)
+        self.directories = data.get('directories', {})
+    
+    def _snapshot(self):
+        data = super()._snapshot()
+        data['directories'] = self.directories
+        return data
+    
+    def list_directory(self, directory, suffix='.py'):
+        """列出目录中的文件名，目录修改时间未变时直接返回缓存结果"""
+        key = self._key(directory)
+        mtime = os.stat(directory).st_mtime
+        
+        with self.lock:
+            self._ensure_loaded()
+            cached = self.directories.get(key)
+            if cached is not None and cached['mtime'] == mtime:
+                return list(cached['entries'])
+        
+        entries = sorted(item for item in os.listdir(directory) if item.endswith(suffix))
+        with self.lock:
+            self.directories[key] = {'mtime': mtime, 'entries': entries}
+            self.dirty = True
+        return entries
+    
+    def get(self, path):
+        """返回仍然有效的插件元数据，文件已变化时返回None
+        
+        修改时间变化但大小相同(例如重新拷贝)时比较内容哈希，内容未变则继续使用
+        """
+        with self.lock:
+            self._ensure_loaded()
+            entry = self.entries.get(self._key(path))
+        if entry is None:
+            return None
+        
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        
+        if stat.st_size != entry['size']:
+            return None
+        
+        if stat.st_mtime != entry['mtime']:
+            if self.file_hash(path) != entry['value']['sha1']:
+                return None
+            with self.lock:
+                entry['mtime'] = stat.st_mtime
+                self.dirty = True
+        
+        return entry['value']['metadata']
+    
+    def put(self, path, metadata, sha1=None):
+        """记录插件元数据 (已读取过源码时可传入sha1避免再次读取文件)
+        
+        无法序列化为JSON的元数据在保存时丢弃
+        """
+        signature = self.file_signature(path)
+        value = {'sha1': sha1 or self.file_hash(path), 'metadata': metadata}
+        super().put(path, value, signature)
+    
+    def invalidate(self, path=None):
+        """使单个插件或全部缓存失效"""
+        with self.lock:
+            super().invalidate(path)
+            if path is None:
+                self.directories = {}
+            else:
+                self.directories.pop(self._key(os.path.dirname(path)), None)
@@ -0,0 +1,116 @@
+"""插件发现 - 在线程池中并发准备插件描述 (不调用任何Maya命令)
+
+读取源码、计算哈希、ast解析、语法检查和编译都在工作线程中完成，
+结果按输入顺序返回，菜单创建仍由调用方在主线程中按顺序进行。
+"""
+import ast
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cfa_core import plugin_metadata
+
+
+# 插件状态
+STATUS_LAZY = 'lazy'        # 已取得静态元数据，可延迟导入
+STATUS_IMPORT = 'import'    # 元数据不是字面量，需要在启动时导入
+STATUS_INVALID = 'invalid'  # 不是插件或源码有错误，跳过
+
+MAX_WORKERS = 16
+
+
+def prepare_plugin_spec(plugin_name, plugin_path, cache=None, static_metadata=True):
+    """准备单个插件的描述字典，耗时记录在 spec['prepare_time']
+
+    static_metadata 为False时不读取静态元数据，所有有效插件都标记为需要导入
+    """
+    start_time = time.perf_counter()
+    spec = _prepare_plugin_spec(plugin_name, plugin_path, cache, static_metadata)
+    spec['prepare_time'] = time.perf_counter() - start_time
+    return spec
+
+
+def _prepare_plugin_spec(plugin_name, plugin_path, cache, static_metadata):
+    spec = {
+        'name': plugin_name,
+        'path': plugin_path,
+        'status': None,
+        'metadata': None,
+        'code': None,
+        'source_stat': None,
+        'cached': False,
+        'message': None
+    }
+
+    if static_metadata and cache is not None:
+        metadata = cache.get(plugin_path)
+        if metadata is not None:
+            spec.update(status=STATUS_LAZY, metadata=metadata, cached=True)
+            return spec
+
+    try:
+        with open(plugin_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            source = f.read()
+        spec['source_stat'] = (stat.st_mtime, stat.st_size)
+        tree = ast.parse(source, plugin_path)
+    except (OSError, SyntaxError, ValueError) as e:
+        spec.update(status=STATUS_INVALID, message=str(e))
+        return spec
+
+    if static_metadata:
+        try:
+            spec['metadata'] = plugin_metadata.extract_tree_metadata(tree)
+            spec['status'] = STATUS_LAZY
+            if cache is not None:
+                try:
+                    cache.put(plugin_path, spec['metadata'], sha1=hashlib.sha1(source).hexdigest())
+                except OSError:
+                    pass
+            return spec
+        except plugin_metadata.NotAPluginError as e:
+            spec.update(status=STATUS_INVALID, message=str(e))
+            return spec
+        except plugin_metadata.DynamicMetadataError as e:
+            spec['message'] = f"元数据无法静态读取，将直接导入: {str(e)}"
+
+    # 启动时需要导入的插件提前在线程中编译，编译错误的插件不会进入主线程导入
+    try:
+        spec['code'] = compile(tree, plugin_path, 'exec')
+    except (SyntaxError, ValueError) as e:
+        spec.update(status=STATUS_INVALID, message=str(e))
+        return spec
+
+    spec['status'] = STATUS_IMPORT
+    return spec
+
+
+def prepare_plugin_specs(plugins, cache=None, static_metadata=True, max_workers=None):
+    """并发准备插件描述
+
+    plugins 为 (插件名, 源文件路径) 列表，返回的描述列表顺序与输入一致
+    """
+    plugins = list(plugins)
+    if not plugins:
+        return []
+
+    workers = min(max_workers or MAX_WORKERS, len(plugins))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(prepare_plugin_spec, name, path, cache, static_metadata)
+            for name, path in plugins
+        ]
+
+        specs = []
+        for (name, path), future in zip(plugins, futures):
+            try:
+                specs.append(future.result())
+            except Exception as e:
+                # 单个插件的意外错误不影响其他插件
+                specs.append({
+                    'name': name, 'path': path, 'status': STATUS_INVALID, 'metadata': None,
+                    'code': None, 'source_stat': None, 'cached': False, 'message': str(e),
+                    'prepare_time': 0.0
+                })
+        return specs
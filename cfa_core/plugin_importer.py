@@ -0,0 +1,166 @@
+"""插件导入器 - 以 cfa_plugins.<插件名> 导入插件，不修改 sys.path
+
+插件目录不再加入 sys.path，进程中其他模块的导入不会多扫描一个(可能在网络共享上的)
+路径，插件名也不会与真实模块 (例如 json) 冲突。字节码缓存写到本地缓存目录，
+而不是插件目录下的 __pycache__。
+"""
+import hashlib
+import importlib.machinery
+import importlib.util
+import marshal
+import os
+import sys
+
+
+PACKAGE_NAME = 'cfa_plugins'
+
+
+def _pack_uint32(value):
+    return (int(value) & 0xFFFFFFFF).to_bytes(4, 'little')
+
+
+class CachedSourceLoader(importlib.machinery.SourceFileLoader):
+    """从源码加载插件，字节码缓存保存在指定目录
+
+    code 为插件发现阶段在线程池中预先编译好的代码对象，源文件的修改时间和大小
+    与 source_stat 一致时直接使用，省去主线程上的编译
+    """
+
+    def __init__(self, fullname, path, bytecode_dir=None, code=None, source_stat=None):
+        super().__init__(fullname, path)
+        self.bytecode_dir = bytecode_dir
+        self.precompiled = code
+        self.source_stat = source_stat
+
+    def bytecode_path(self):
+        """字节码缓存路径 (包含源文件路径的哈希，不同目录下的同名插件互不影响)"""
+        path_hash = hashlib.sha1(os.path.abspath(self.path).encode('utf-8')).hexdigest()[:10]
+        name = self.name.rpartition('.')[2]
+        return os.path.join(
+            self.bytecode_dir, f"{name}-{path_hash}.{sys.implementation.cache_tag}.pyc"
+        )
+
+    def _header(self, stat):
+        # PEP 552 基于时间戳的pyc头: magic, flags, mtime, size
+        return (importlib.util.MAGIC_NUMBER + _pack_uint32(0)
+                + _pack_uint32(stat.st_mtime) + _pack_uint32(stat.st_size))
+
+    def _read_bytecode(self, header):
+        try:
+            with open(self.bytecode_path(), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if data[:16] != header:
+            return None
+        try:
+            return marshal.loads(data[16:])
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def _write_bytecode(self, header, code):
+        if sys.dont_write_bytecode:
+            return
+        bytecode_path = self.bytecode_path()
+        temp_path = f"{bytecode_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.bytecode_dir, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(header + marshal.dumps(code))
+            os.replace(temp_path, bytecode_path)
+        except OSError:
+            # 缓存写入失败不影响导入
+            pass
+
+    def get_code(self, fullname):
+        if self.bytecode_dir is None:
+            return super().get_code(fullname)
+
+        stat = os.stat(self.path)
+        header = self._header(stat)
+
+        code = self._read_bytecode(header)
+        if code is not None:
+            return code
+
+        source_stat = (stat.st_mtime, stat.st_size)
+        if self.precompiled is not None and self.source_stat == source_stat:
+            code = self.precompiled
+        else:
+            code = compile(self.get_data(self.path), self.path, 'exec', dont_inherit=True)
+
+        self._write_bytecode(header, code)
+        return code
+
+
+class PluginImporter:
+    """把插件目录中的文件导入为 cfa_plugins 包的子模块"""
+
+    def __init__(self, plugins_dir, bytecode_dir=None, package=PACKAGE_NAME):
+        self.plugins_dir = plugins_dir
+        self.bytecode_dir = bytecode_dir
+        self.package = package
+
+    def ensure_package(self):
+        """创建 (或更新) 虚拟包模块，插件之间可以用相对导入互相引用"""
+        package = sys.modules.get(self.package)
+        if package is None:
+            spec = importlib.machinery.ModuleSpec(self.package, None, is_package=True)
+            spec.submodule_search_locations = [self.plugins_dir]
+            package = importlib.util.module_from_spec(spec)
+            sys.modules[self.package] = package
+        elif self.plugins_dir not in package.__path__:
+            package.__path__.append(self.plugins_dir)
+        return package
+
+    def module_name(self, plugin_name):
+        return f"{self.package}.{plugin_name}"
+
+    def plugin_path(self, plugin_name):
+        return os.path.join(self.plugins_dir, plugin_name + '.py')
+
+    def _make_spec(self, plugin_name, code=None, source_stat=None):
+        fullname = self.module_name(plugin_name)
+        path = self.plugin_path(plugin_name)
+        loader = CachedSourceLoader(fullname, path, self.bytecode_dir, code, source_stat)
+        return importlib.util.spec_from_file_location(fullname, path, loader=loader)
+
+    def import_plugin(self, plugin_name, code=None, source_stat=None):
+        """导入插件模块，已导入时直接返回"""
+        fullname = self.module_name(plugin_name)
+        module = sys.modules.get(fullname)
+        if module is not None:
+            return module
+
+        package = self.ensure_package()
+        spec = self._make_spec(plugin_name, code, source_stat)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[fullname] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            sys.modules.pop(fullname, None)
+            raise
+
+        setattr(package, plugin_name, module)
+        return module
+
+    def reload_plugin(self, module):
+        """在原模块对象上重新执行插件源码 (与 importlib.reload 相同的语义)
+
+        不使用 importlib.reload，因为它会通过默认查找器重新定位模块，
+        把字节码写回插件目录
+        """
+        plugin_name = module.__name__.rpartition('.')[2]
+        spec = self._make_spec(plugin_name)
+        module.__spec__ = spec
+        module.__loader__ = spec.loader
+        spec.loader.exec_module(module)
+        return module
+
+    def unload_plugin(self, plugin_name):
+        """从 sys.modules 和虚拟包中移除插件模块"""
+        sys.modules.pop(self.module_name(plugin_name), None)
+        package = sys.modules.get(self.package)
+        if package is not None and hasattr(package, plugin_name):
+            delattr(package, plugin_name)
@@ -0,0 +1,222 @@
+"""插件元数据静态提取 - 使用ast解析插件源码，不导入模块也不执行任何插件代码
+
+get_plugin_info() 的返回字典和 register_commands() 的命令标签/函数名在以下写法下可以
+静态读取:
+
+* 字面量 (字符串、数字、列表、字典等)
+* 模块级或函数内事先赋值的常量名
+* 字符串拼接 ('CFA ' + TOOL_NAME)
+
+其余写法抛出 DynamicMetadataError，由调用方退回到真正导入模块。
+"""
+import ast
+
+
+class PluginMetadataError(Exception):
+    """插件元数据提取错误基类"""
+
+
+class DynamicMetadataError(PluginMetadataError):
+    """元数据不是字面量，必须导入模块才能获取"""
+
+
+class NotAPluginError(PluginMetadataError):
+    """模块中没有定义插件接口函数"""
+
+
+REQUIRED_FUNCTIONS = ('get_plugin_info', 'register_commands')
+
+
+def _evaluate(node, scope):
+    """在常量作用域内计算表达式节点，无法静态计算时抛出 DynamicMetadataError"""
+    if isinstance(node, ast.Name):
+        if node.id in scope:
+            return scope[node.id]
+        raise DynamicMetadataError(f"第{node.lineno}行: 名称 '{node.id}' 不是常量")
+
+    if isinstance(node, ast.Dict):
+        result = {}
+        for key, value in zip(node.keys, node.values):
+            if key is None:
+                raise DynamicMetadataError(f"第{node.lineno}行: 不支持 ** 展开")
+            result[_evaluate(key, scope)] = _evaluate(value, scope)
+        return result
+
+    if isinstance(node, (ast.List, ast.Tuple)):
+        values = [_evaluate(element, scope) for element in node.elts]
+        return values if isinstance(node, ast.List) else tuple(values)
+
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        try:
+            return _evaluate(node.left, scope) + _evaluate(node.right, scope)
+        except TypeError:
+            raise DynamicMetadataError(f"第{node.lineno}行: 无法计算的拼接表达式")
+
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        raise DynamicMetadataError(
+            f"第{getattr(node, 'lineno', '?')}行: 不支持的表达式 {type(node).__name__}"
+        )
+
+
+def _collect_constants(statements, scope):
+    """收集语句块中 NAME = <常量表达式> 形式的赋值"""
+    for statement in statements:
+        if not isinstance(statement, ast.Assign):
+            continue
+        if len(statement.targets) != 1 or not isinstance(statement.targets[0], ast.Name):
+            continue
+        try:
+            scope[statement.targets[0].id] = _evaluate(statement.value, scope)
+        except DynamicMetadataError:
+            # 后续引用该名称时才会报错
+            scope.pop(statement.targets[0].id, None)
+    return scope
+
+
+def _get_return_node(function_node, module_scope):
+    """返回函数唯一一个顶层 return 的表达式节点和函数内常量作用域"""
+    returns = [node for node in ast.walk(function_node) if isinstance(node, ast.Return)]
+    if len(returns) != 1 or returns[0] not in function_node.body or returns[0].value is None:
+        raise DynamicMetadataError(f"{function_node.name}() 必须只有一个顶层 return 语句")
+
+    local_scope = _collect_constants(function_node.body, dict(module_scope))
+    return returns[0].value, local_scope
+
+
+def _find_local_list(name, function_node, return_node):
+    """查找 return 的变量名在函数内对应的列表/元组字面量
+
+    变量必须只在函数顶层赋值一次，之后除 return 外不能再出现 (append、+=、
+    在 if/for/try 中重新赋值等都会改变列表内容)
+    """
+    assignments = [
+        statement for statement in function_node.body
+        if (isinstance(statement, ast.Assign) and len(statement.targets) == 1
+            and isinstance(statement.targets[0], ast.Name)
+            and statement.targets[0].id == name)
+    ]
+    if len(assignments) != 1:
+        raise DynamicMetadataError(f"{function_node.name}() 返回的 '{name}' 必须只在顶层赋值一次")
+
+    assigned = assignments[0]
+    for node in ast.walk(function_node):
+        if isinstance(node, (ast.Global, ast.Nonlocal)) and name in node.names:
+            raise DynamicMetadataError(f"第{node.lineno}行: '{name}' 不是局部变量")
+        if isinstance(node, ast.Name) and node.id == name and node not in (assigned.targets[0], return_node):
+            raise DynamicMetadataError(f"第{node.lineno}行: 返回的 '{name}' 在赋值之外被使用或修改")
+
+    if isinstance(assigned.value, (ast.List, ast.Tuple)):
+        return assigned.value
+    raise DynamicMetadataError(f"{function_node.name}() 返回的 '{name}' 不是列表字面量")
+
+
+def _extract_commands(function_node, module_scope):
+    """提取 register_commands() 中每个命令的标签和函数名"""
+    node, scope = _get_return_node(function_node, module_scope)
+    if isinstance(node, ast.Name):
+        node = _find_local_list(node.id, function_node, node)
+    if not isinstance(node, (ast.List, ast.Tuple)):
+        raise DynamicMetadataError("register_commands() 必须返回列表字面量")
+
+    commands = []
+    for element in node.elts:
+        if not isinstance(element, ast.Dict):
+            raise DynamicMetadataError(f"第{element.lineno}行: 命令必须是字典字面量")
+
+        fields = {}
+        for key, value in zip(element.keys, element.values):
+            if key is None:
+                raise DynamicMetadataError(f"第{element.lineno}行: 不支持 ** 展开")
+            fields[_evaluate(key, scope)] = value
+
+        if 'label' not in fields:
+            raise DynamicMetadataError(f"第{element.lineno}行: 命令缺少 'label'")
+
+        command_node = fields.get('command')
+        commands.append({
+            'label': _evaluate(fields['label'], scope),
+            # 命令函数只记录名称，lambda等其他写法在导入后按标签解析
+            'function': command_node.id if isinstance(command_node, ast.Name) else None
+        })
+    return commands
+
+
+def _module_bindings(tree):
+    """返回模块级绑定的名称，以及是否存在 from x import *"""
+    names = set()
+    star_import = False
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name == '*':
+                    star_import = True
+                else:
+                    names.add((alias.asname or alias.name).split('.')[0])
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                for child in ast.walk(target):
+                    if isinstance(child, ast.Name):
+                        names.add(child.id)
+        else:
+            # if/try 等语句块中的定义无法静态确定
+            for child in ast.walk(node):
+                if isinstance(child, (ast.FunctionDef, ast.ClassDef)):
+                    names.add(child.name)
+                elif isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
+                    names.add(child.id)
+                elif isinstance(child, (ast.Import, ast.ImportFrom)):
+                    for alias in child.names:
+                        if alias.name == '*':
+                            star_import = True
+                        else:
+                            names.add((alias.asname or alias.name).split('.')[0])
+    return names, star_import
+
+
+def extract_metadata(source, filename='<plugin>'):
+    """从插件源码中提取元数据
+
+    返回 {'info': {...}, 'commands': [{'label': ..., 'function': ...}, ...]}
+    源码有语法错误时抛出 SyntaxError，不是插件时抛出 NotAPluginError，
+    无法静态读取时抛出 DynamicMetadataError
+    """
+    return extract_tree_metadata(ast.parse(source, filename))
+
+
+def extract_tree_metadata(tree):
+    """从已解析的模块语法树中提取元数据，异常与 extract_metadata 相同"""
+    functions = {}
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            functions[node.name] = node
+
+    missing = [name for name in REQUIRED_FUNCTIONS if name not in functions]
+    if missing:
+        names, star_import = _module_bindings(tree)
+        if star_import or any(name in names for name in missing):
+            raise DynamicMetadataError(f"接口函数不是普通的模块级函数: {', '.join(missing)}")
+        raise NotAPluginError(f"缺少必要的接口: {', '.join(missing)}")
+
+    module_scope = _collect_constants(tree.body, {})
+
+    info_node, info_scope = _get_return_node(functions['get_plugin_info'], module_scope)
+    info = _evaluate(info_node, info_scope)
+    if not isinstance(info, dict):
+        raise DynamicMetadataError("get_plugin_info() 必须返回字典")
+
+    return {
+        'info': info,
+        'commands': _extract_commands(functions['register_commands'], module_scope)
+    }
+
+
+def extract_file_metadata(path):
+    """读取插件文件并提取元数据"""
+    with open(path, 'rb') as f:
+        source = f.read()
+    return extract_metadata(source, path)
@@ -0,0 +1,273 @@
+"""插件本地镜像 - 按网络共享上的清单文件增量同步插件目录到本地磁盘
+
+共享目录根部放一个清单文件 (plugins_manifest.json，记录 相对路径 -> 大小/SHA1)，
+启动时读取这一个文件，与本地镜像的清单比较后并发复制有变化的文件，之后框架从
+本地磁盘加载插件。共享目录中没有清单文件时不使用镜像。
+
+除清单外每次同步还比较共享目录和镜像中文件的 修改时间+大小 (只读取目录，不读取文件内容)，
+共享目录中的文件修改后没有重新生成清单、或镜像中的文件被改动时也会重新复制。
+
+生成清单 (发布插件时运行):
+    python -m cfa_core.plugin_mirror d:/MAYA_LIB/plugins
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+
+MANIFEST_NAME = 'plugins_manifest.json'
+MANIFEST_VERSION = 1
+EXCLUDED_DIRS = ('__pycache__',)
+EXCLUDED_SUFFIXES = ('.pyc', '.tmp')
+
+
+class MirrorError(Exception):
+    """镜像同步失败"""
+
+
+def file_sha1(path):
+    """计算文件内容的SHA1"""
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def build_manifest(source_dir, write=True):
+    """扫描目录生成清单，write为True时写入 source_dir/plugins_manifest.json"""
+    files = {}
+    for root, dirs, names in os.walk(source_dir):
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS)
+        for name in sorted(names):
+            if name == MANIFEST_NAME or name.endswith(EXCLUDED_SUFFIXES):
+                continue
+            path = os.path.join(root, name)
+            relative_path = os.path.relpath(path, source_dir).replace(os.sep, '/')
+            files[relative_path] = {'size': os.path.getsize(path), 'sha1': file_sha1(path)}
+
+    # 版本号由文件列表内容决定，内容不变时版本号不变
+    digest = hashlib.sha1(json.dumps(files, sort_keys=True).encode('utf-8')).hexdigest()
+    manifest = {'version': MANIFEST_VERSION, 'revision': digest, 'files': files}
+
+    if write:
+        _write_json(os.path.join(source_dir, MANIFEST_NAME), manifest)
+    return manifest
+
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(path, data):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def scan_stats(directory):
+    """返回目录中所有文件的 {相对路径: [修改时间, 大小]} (跳过清单和临时文件)，目录不存在时返回空字典"""
+    stats = {}
+    stack = [(directory, '')]
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            iterator = os.scandir(current)
+        except OSError:
+            continue
+        with iterator:
+            for entry in iterator:
+                try:
+                    if entry.is_dir():
+                        if entry.name not in EXCLUDED_DIRS:
+                            stack.append((entry.path, prefix + entry.name + '/'))
+                        continue
+                    if entry.name == MANIFEST_NAME or entry.name.endswith(EXCLUDED_SUFFIXES):
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                stats[prefix + entry.name] = [stat.st_mtime, stat.st_size]
+    return stats
+
+
+class PluginMirror:
+    """把共享目录 share_dir 同步到本地目录 mirror_dir
+
+    本地清单除共享清单的内容外还记录每个文件复制时共享文件和镜像文件的 修改时间+大小
+    (share_stats / local_stats)，用于发现清单没有反映的修改
+    """
+
+    def __init__(self, share_dir, mirror_dir, max_workers=8):
+        self.share_dir = share_dir
+        self.mirror_dir = mirror_dir
+        self.max_workers = max_workers
+
+    @property
+    def remote_manifest_path(self):
+        return os.path.join(self.share_dir, MANIFEST_NAME)
+
+    @property
+    def local_manifest_path(self):
+        return os.path.join(self.mirror_dir, MANIFEST_NAME)
+
+    def available(self):
+        """共享目录中是否提供了清单文件"""
+        return os.path.isfile(self.remote_manifest_path)
+
+    def _load_local_manifest(self):
+        empty = {'files': {}, 'share_stats': {}, 'local_stats': {}}
+        try:
+            manifest = _read_json(self.local_manifest_path)
+        except (OSError, ValueError):
+            return empty
+        if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+            return empty
+        for key in empty:
+            manifest.setdefault(key, {})
+        return manifest
+
+    def _load_remote_manifest(self):
+        try:
+            remote = _read_json(self.remote_manifest_path)
+        except (OSError, ValueError) as e:
+            raise MirrorError(f"无法读取共享清单: {str(e)}")
+        if not isinstance(remote, dict) or remote.get('version') != MANIFEST_VERSION:
+            raise MirrorError(f"不支持的清单版本: {remote.get('version') if isinstance(remote, dict) else None}")
+        return remote
+
+    def _local_path(self, relative_path):
+        mirror_dir = os.path.normpath(self.mirror_dir)
+        path = os.path.normpath(os.path.join(mirror_dir, relative_path))
+        # 清单中的路径不能跳出镜像目录 (Windows下位于其他盘符时 commonpath 抛出 ValueError)
+        try:
+            inside = os.path.commonpath([path, mirror_dir]) == mirror_dir
+        except ValueError:
+            inside = False
+        if not inside:
+            raise MirrorError(f"清单中的路径无效: {relative_path}")
+        return path
+
+    def _copy_file(self, relative_path, expected):
+        """复制单个文件，返回 (相对路径, 清单条目, 共享文件状态, 镜像文件状态)，先写临时文件再替换
+
+        expected 为共享清单中的条目，内容与清单不同 (修改后没有重新生成清单) 时以共享目录中的文件为准
+        """
+        source = os.path.join(self.share_dir, relative_path)
+        target = self._local_path(relative_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        before = os.stat(source)
+        temp_path = target + '.tmp'
+        shutil.copyfile(source, temp_path)
+        after = os.stat(source)
+        if (before.st_mtime, before.st_size) != (after.st_mtime, after.st_size):
+            os.remove(temp_path)
+            raise MirrorError(f"文件在复制过程中发生变化: {relative_path}")
+
+        entry = {'size': os.path.getsize(temp_path), 'sha1': file_sha1(temp_path)}
+        if expected is not None and entry != expected:
+            print(f"共享目录中的 {relative_path} 与清单不一致 (修改后未重新生成清单)，使用共享目录中的文件")
+        os.replace(temp_path, target)
+        stat = os.stat(target)
+        return relative_path, entry, [after.st_mtime, after.st_size], [stat.st_mtime, stat.st_size]
+
+    def plan(self, remote, local, share_stats, local_stats):
+        """比较清单和文件状态，返回 (需要复制的路径, 需要删除的路径)
+
+        share_stats/local_stats 为共享目录和镜像的 scan_stats() 结果。以下文件需要复制:
+        镜像中没有的、共享清单版本变化且条目不同的、共享文件或镜像文件的 修改时间+大小 与上次复制时不同的
+        """
+        remote_files = remote['files']
+        local_files = local['files']
+        manifest_changed = local.get('revision') != remote.get('revision')
+
+        to_copy = []
+        for relative_path in sorted(share_stats):
+            if relative_path not in local_files:
+                changed = True
+            elif manifest_changed and relative_path in remote_files:
+                changed = local_files[relative_path] != remote_files[relative_path]
+            else:
+                changed = False
+            if (changed
+                    or local['share_stats'].get(relative_path) != share_stats[relative_path]
+                    or local['local_stats'].get(relative_path) != local_stats.get(relative_path)):
+                to_copy.append(relative_path)
+
+        # 镜像中多出的文件 (包括不是由同步复制的文件) 都删除
+        to_remove = sorted(path for path in set(local_files) | set(local_stats) if path not in share_stats)
+        return to_copy, to_remove
+
+    def sync(self, force=False):
+        """同步镜像，返回 {'changed': bool, 'copied': [...], 'removed': [...], 'revision': ...}
+
+        force 为True时重新复制所有文件
+        """
+        result = {'changed': False, 'copied': [], 'removed': [], 'revision': None}
+
+        remote = self._load_remote_manifest()
+        local = self._load_local_manifest()
+        if force:
+            local = {'files': {}, 'share_stats': {}, 'local_stats': {}}
+        result['revision'] = remote.get('revision')
+
+        share_stats = scan_stats(self.share_dir)
+        local_stats = scan_stats(self.mirror_dir)
+        to_copy, to_remove = self.plan(remote, local, share_stats, local_stats)
+        if not to_copy and not to_remove and local.get('revision') == remote.get('revision'):
+            return result
+
+        os.makedirs(self.mirror_dir, exist_ok=True)
+        files = dict(local['files'])
+        share_records = dict(local['share_stats'])
+        local_records = dict(local['local_stats'])
+
+        if to_copy:
+            workers = min(self.max_workers, len(to_copy))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(self._copy_file, path, remote['files'].get(path)) for path in to_copy
+                ]
+                try:
+                    copied = [future.result() for future in futures]
+                except (OSError, MirrorError) as e:
+                    raise MirrorError(f"复制插件失败: {str(e)}")
+            for relative_path, entry, share_stat, local_stat in copied:
+                files[relative_path] = entry
+                share_records[relative_path] = share_stat
+                local_records[relative_path] = local_stat
+                result['copied'].append(relative_path)
+
+        for relative_path in to_remove:
+            try:
+                os.remove(self._local_path(relative_path))
+            except (OSError, MirrorError):
+                pass
+            for records in (files, share_records, local_records):
+                records.pop(relative_path, None)
+        result['removed'] = to_remove
+
+        # 所有文件就绪后才写入本地清单，中断的同步下次会重新进行
+        _write_json(self.local_manifest_path, {
+            'version': MANIFEST_VERSION,
+            'revision': remote.get('revision'),
+            'files': files,
+            'share_stats': share_records,
+            'local_stats': local_records
+        })
+        result['changed'] = bool(result['copied'] or result['removed'])
+        return result
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("用法: python -m cfa_core.plugin_mirror <插件目录>")
+        sys.exit(2)
+    manifest = build_manifest(sys.argv[1])
+    print(f"已生成清单: {len(manifest['files'])} 个文件, 版本 {manifest['revision']}")
@@ -0,0 +1,44 @@
+"""插件目录监视 - 通过轮询文件修改时间发现新增、删除和修改的插件"""
+import os
+
+
+class PluginWatcher:
+    """轮询插件目录，比较两次快照之间的差异"""
+
+    def __init__(self, directory, suffix='.py'):
+        self.directory = directory
+        self.suffix = suffix
+        self.snapshot = {}
+
+    def scan(self):
+        """返回 {插件名: (修改时间, 大小)}"""
+        result = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(self.suffix) or entry.name.startswith('__'):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    result[entry.name[:-len(self.suffix)]] = (stat.st_mtime, stat.st_size)
+        except OSError:
+            pass
+        return result
+
+    def reset(self):
+        """以当前目录状态作为基准"""
+        self.snapshot = self.scan()
+
+    def poll(self):
+        """返回自上次轮询以来的 (新增, 删除, 修改) 插件名列表"""
+        current = self.scan()
+        added = sorted(name for name in current if name not in self.snapshot)
+        removed = sorted(name for name in self.snapshot if name not in current)
+        changed = sorted(
+            name for name in current
+            if name in self.snapshot and current[name] != self.snapshot[name]
+        )
+        self.snapshot = current
+        return added, removed, changed
@@ -0,0 +1,137 @@
+"""插件加载性能统计 - 记录每个插件各阶段耗时，可导出为JSON/CSV"""
+import csv
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class LoadProfiler:
+    """记录框架启动和每个插件各加载阶段的耗时 (可选记录内存变化)"""
+
+    STAGES = ('discovery', 'import', 'get_plugin_info', 'register_commands', 'submenu')
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.plugins = {}
+        self.total_time = None
+        self.total_memory = None
+        self._start_time = None
+        self._start_memory = None
+        self._started_tracemalloc = False
+
+    def start(self):
+        """开始统计框架初始化总耗时"""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._start_memory = self._current_memory()
+        self._start_time = time.perf_counter()
+
+    def stop(self):
+        """结束总耗时统计"""
+        if self._start_time is None:
+            return
+        self.total_time = time.perf_counter() - self._start_time
+        if self._start_memory is not None:
+            self.total_memory = self._current_memory() - self._start_memory
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self._start_time = None
+
+    def _current_memory(self):
+        if self.trace_memory and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        return None
+
+    def record(self, plugin_name, stage, seconds, memory=None):
+        """记录一个阶段的耗时，同一阶段多次记录时累加"""
+        stages = self.plugins.setdefault(plugin_name, {})
+        entry = stages.setdefault(stage, {'time': 0.0, 'memory': None})
+        entry['time'] += seconds
+        if memory is not None:
+            entry['memory'] = (entry['memory'] or 0) + memory
+
+    @contextmanager
+    def measure(self, plugin_name, stage):
+        """统计with语句块的耗时"""
+        start_memory = self._current_memory()
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            memory = None
+            if start_memory is not None:
+                memory = self._current_memory() - start_memory
+            self.record(plugin_name, stage, elapsed, memory)
+
+    def plugin_total(self, plugin_name):
+        """插件所有阶段的总耗时"""
+        return sum(entry['time'] for entry in self.plugins.get(plugin_name, {}).values())
+
+    def sorted_plugins(self):
+        """按总耗时从高到低排序的插件名列表"""
+        return sorted(self.plugins, key=self.plugin_total, reverse=True)
+
+    def to_dict(self):
+        """转换为可序列化的字典"""
+        plugins = []
+        for plugin_name in self.sorted_plugins():
+            row = {'plugin': plugin_name, 'total': self.plugin_total(plugin_name)}
+            for stage, entry in self.plugins[plugin_name].items():
+                row[stage] = entry['time']
+                if entry['memory'] is not None:
+                    row[stage + '_memory'] = entry['memory']
+            plugins.append(row)
+
+        return {
+            'total_time': self.total_time,
+            'total_memory': self.total_memory,
+            'plugins': plugins
+        }
+
+    def export_json(self, path):
+        """导出为JSON文件"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def export_csv(self, path):
+        """导出为CSV文件 (每个插件一行，每个阶段一列)"""
+        columns = ['plugin', 'total']
+        for stage in self.STAGES:
+            columns.append(stage)
+            if self.trace_memory:
+                columns.append(stage + '_memory')
+
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+            for row in self.to_dict()['plugins']:
+                writer.writerow(row)
+
+    def export(self, path):
+        """根据扩展名导出为CSV或JSON"""
+        if path.lower().endswith('.csv'):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+
+    def format_report(self, limit=10):
+        """生成按耗时排序的文字报告"""
+        lines = []
+        if self.total_time is not None:
+            line = f"框架初始化总耗时: {self.total_time * 1000:.1f} ms"
+            if self.total_memory is not None:
+                line += f" (内存 {self.total_memory / 1024.0:+.1f} KB)"
+            lines.append(line)
+
+        for plugin_name in self.sorted_plugins()[:limit]:
+            stages = self.plugins[plugin_name]
+            details = ", ".join(
+                f"{stage} {stages[stage]['time'] * 1000:.1f}"
+                for stage in self.STAGES if stage in stages
+            )
+            lines.append(f"{plugin_name}: {self.plugin_total(plugin_name) * 1000:.1f} ms ({details})")
+        return "\n".join(lines)
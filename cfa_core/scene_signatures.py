@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""场景病毒特征库 - plugins/CleanPuTianTongQing.py (Maya中) 和 cfa_core/ma_scanner.py (离线) 共用
+
+特征保存在JSON文件中 (默认为同目录的 scene_signatures.json，可用环境变量 CFA_SCENE_SIGNATURES 指定):
+
+* script_nodes: 脚本节点规则 {'id', 'node': [节点名子串], 'body': [脚本内容子串], 'action', 'user_scripts'}，
+  节点名包含任一 node 子串，且 (没有 body 时直接匹配) 脚本内容包含任一 body 子串时匹配。
+  action 为 'delete' 时直接删除节点，默认 'clear' 先清空脚本再删除；
+  user_scripts 为匹配时要从用户脚本目录删除的文件
+* procs: 病毒定义的MEL过程名 (完全匹配)
+* script_jobs: scriptJob 描述中的子串
+
+每类子串编译为一个正则表达式，一次扫描找出所有出现的子串，特征增加时扫描次数不变。
+特征库文件缺失或格式错误时，清理插件使用 BUILTIN_SIGNATURES (默认特征库的内置副本)。
+清理插件在 Python 2 的Maya中运行，本模块需要同时兼容 Python 2 和 3。
+"""
+import hashlib
+import io
+import json
+import os
+import re
+
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scene_signatures.json')
+PATH_ENV = 'CFA_SCENE_SIGNATURES'
+DATABASE_VERSION = 1
+
+ACTION_CLEAR = 'clear'
+ACTION_DELETE = 'delete'
+
+try:
+    _STRING_TYPES = (str, unicode)
+except NameError:
+    _STRING_TYPES = (str,)
+
+
+def _native(value):
+    """消息中的值转为原生字符串: Python 2 中 unicode (如Maya传入的路径、JSON中的字符串) 编码为UTF-8，
+    与中文字节串消息拼接时不会出现 UnicodeDecodeError"""
+    if str is bytes and isinstance(value, _STRING_TYPES[-1]):
+        return value.encode('utf-8')
+    return value if isinstance(value, str) else str(value)
+
+# scene_signatures.json 的内置副本，修改默认特征库时同步更新
+BUILTIN_SIGNATURES = {
+    'version': DATABASE_VERSION,
+    'script_nodes': [
+        {
+            'id': 'vaccine_gene',
+            'node': ['vaccine_gene'],
+            'action': ACTION_DELETE,
+            'user_scripts': ['vaccine.py', 'vaccine.pyc', 'userSetup.py']
+        },
+        {
+            'id': 'PuTianTongQing',
+            'node': ['MayaMelUIConfigurationFile'],
+            'body': ['PuTianTongQing', 'fuck_All_U']
+        },
+        {
+            'id': 'uiConfigurationScriptNode_look',
+            'node': ['uiConfigurationScriptNode'],
+            'body': ['look']
+        }
+    ],
+    'procs': [
+        'autoUpdatcAttrEd',
+        'autoUpdateAttrEd_SelectSystem',
+        'UI_Mel_Configuration_think',
+        'UI_Mel_Configuration_think_a',
+        'UI_Mel_Configuration_think_b',
+        'autoUpdatoAttrEnd'
+    ],
+    'script_jobs': [
+        'autoUpdatoAttrEnd',
+        'leukocyte.antivirus'
+    ]
+}
+
+
+class SignatureError(Exception):
+    """特征库文件无法读取或格式错误"""
+
+
+def _literal_list(data, key, item_type=None):
+    """data[key] 必须是列表 (缺省为空列表)，item_type 省略时每项为非空字符串
+
+    单个字符串会被拆成字符、空字符串会匹配任何文本，都会让清理插件误删节点
+    """
+    value = data.get(key, [])
+    if not isinstance(value, list):
+        raise ValueError("%s 必须是列表" % key)
+    for item in value:
+        if item_type is not None:
+            if not isinstance(item, item_type):
+                raise ValueError("%s 的项目类型错误: %r" % (key, item))
+        elif not isinstance(item, _STRING_TYPES) or not item:
+            raise ValueError("%s 包含无效的特征: %r" % (key, item))
+    return list(value)
+
+
+class LiteralMatcher(object):
+    """一次扫描找出文本中出现的所有子串"""
+
+    def __init__(self, literals):
+        # 同一位置只报告最长的子串，包含在其中的较短子串由 _contained 补充
+        self.literals = sorted(set(literals), key=lambda literal: (-len(literal), literal))
+        self._contained = dict(
+            (literal, [other for other in self.literals if other != literal and other in literal])
+            for literal in self.literals
+        )
+        self._regex = None
+        self._search_regex = None
+        if self.literals:
+            alternation = '|'.join(re.escape(literal) for literal in self.literals)
+            self._regex = re.compile('(?=(%s))' % alternation)
+            self._search_regex = re.compile(alternation)
+
+    def find(self, text):
+        """返回文本中出现的子串集合"""
+        found = set()
+        if self._regex is None or not text:
+            return found
+        for match in self._regex.finditer(text):
+            literal = match.group(1)
+            if literal not in found:
+                found.add(literal)
+                found.update(self._contained[literal])
+        return found
+
+    def search(self, text):
+        """文本中是否出现任一子串"""
+        return bool(self._search_regex is not None and text and self._search_regex.search(text))
+
+
+class SignatureDatabase(object):
+    """编译后的特征库"""
+
+    def __init__(self, data):
+        if not isinstance(data, dict) or data.get('version') != DATABASE_VERSION:
+            raise SignatureError("不支持的特征库版本: %s" % _native(data.get('version') if isinstance(data, dict) else None))
+        try:
+            self.rules = [self._compile_rule(rule) for rule in _literal_list(data, 'script_nodes', dict)]
+            self.procs = frozenset(_literal_list(data, 'procs'))
+            script_jobs = _literal_list(data, 'script_jobs')
+        except (KeyError, TypeError, ValueError) as e:
+            raise SignatureError("特征库格式错误: %s" % _native(e))
+
+        self.digest = hashlib.sha1(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+        self._node_matcher = LiteralMatcher(
+            literal for rule in self.rules for literal in rule['node']
+        )
+        self._body_matcher = LiteralMatcher(
+            literal for rule in self.rules for literal in rule['body']
+        )
+        self._job_matcher = LiteralMatcher(script_jobs)
+
+    @staticmethod
+    def _compile_rule(rule):
+        compiled = {
+            'id': rule['id'],
+            'node': _literal_list(rule, 'node'),
+            'body': _literal_list(rule, 'body'),
+            'action': rule.get('action', ACTION_CLEAR),
+            'user_scripts': _literal_list(rule, 'user_scripts')
+        }
+        if not compiled['node']:
+            raise ValueError("规则 %s 没有节点名特征" % _native(compiled['id']))
+        if compiled['action'] not in (ACTION_CLEAR, ACTION_DELETE):
+            raise ValueError("规则 %s 的 action 无效: %s" % (_native(compiled['id']), _native(compiled['action'])))
+        return compiled
+
+    def match_script_node(self, name, body):
+        """返回脚本节点匹配的第一条规则，未匹配时返回None
+
+        body 为脚本内容，或返回脚本内容的函数 (只在节点名匹配需要检查内容的规则时调用)
+        """
+        name_hits = self._node_matcher.find(name)
+        if not name_hits:
+            return None
+
+        body_hits = None
+        for rule in self.rules:
+            if not name_hits.intersection(rule['node']):
+                continue
+            if not rule['body']:
+                return rule
+            if body_hits is None:
+                if callable(body):
+                    body = body()
+                body_hits = self._body_matcher.find(body)
+            if body_hits.intersection(rule['body']):
+                return rule
+        return None
+
+    def match_script_job(self, job):
+        """scriptJob 描述 (scriptJob -listJobs 的一项) 是否为病毒创建"""
+        return self._job_matcher.search(job)
+
+
+def load_signatures(path=None):
+    """读取并编译特征库，path 省略时使用环境变量 CFA_SCENE_SIGNATURES 或默认文件"""
+    path = path or os.environ.get(PATH_ENV) or DEFAULT_PATH
+    try:
+        with io.open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (IOError, OSError, ValueError) as e:
+        raise SignatureError("无法读取特征库 %s: %s" % (_native(path), _native(e)))
+    return SignatureDatabase(data)
+
+
+def builtin_signatures():
+    """编译内置特征库 (特征库文件无法使用时的后备)"""
+    return SignatureDatabase(BUILTIN_SIGNATURES)
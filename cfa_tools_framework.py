@@ -1,8 +1,53 @@
 import maya.cmds as cmds
 import maya.mel as mel
 import os
-import sys
-import importlib
+import threading
+from collections import deque
+
+from cfa_core import menu_model
+from cfa_core import plugin_discovery
+from cfa_core.plugin_cache import PluginManifestCache
+from cfa_core.plugin_importer import PluginImporter
+from cfa_core.plugin_mirror import MirrorError, PluginMirror
+from cfa_core.plugin_watcher import PluginWatcher
+from cfa_core.profiler import LoadProfiler
+
+
+class LazyCommand:
+    """延迟命令代理 - 首次点击菜单项时才导入插件模块并解析真实命令"""
+    
+    def __init__(self, framework, plugin_name, label):
+        self.framework = framework
+        self.plugin_name = plugin_name
+        self.label = label
+    
+    def resolve(self):
+        """加载插件并返回与标签对应的真实命令"""
+        if not self.framework.ensure_plugin_loaded(self.plugin_name):
+            return None
+        
+        for command in self.framework.loaded_plugins[self.plugin_name]['commands']:
+            if command['label'] == self.label and command['command'] is not self:
+                return command['command']
+        
+        print(f"插件 '{self.plugin_name}' 中未找到命令: {self.label}")
+        return None
+    
+    def __call__(self, *args):
+        command = self.resolve()
+        if command is not None:
+            return command(*args)
+    
+    def __eq__(self, other):
+        return (isinstance(other, LazyCommand) and self.framework is other.framework
+                and self.plugin_name == other.plugin_name and self.label == other.label)
+    
+    def __ne__(self, other):
+        return not self.__eq__(other)
+    
+    def __hash__(self):
+        return hash((id(self.framework), self.plugin_name, self.label))
+
 
 class CFAToolsFramework:
     """CFA Tools 插件框架 - 统一管理所有公司插件"""
@@ -12,14 +57,121 @@ class CFAToolsFramework:
         self.menu_name = "CFAToolsMenu"
         self.plugins_dir = "plugins"
         self.loaded_plugins = {}
+        # 延迟加载: 根据插件元数据创建菜单，首次点击时才导入插件模块
+        self.lazy_loading = True
+        # 插件清单缓存: 未修改的插件跳过解析和导入
+        self.use_plugin_cache = True
+        self.plugin_cache = None
+        # 插件以 cfa_plugins.<插件名> 导入，字节码缓存在本地缓存目录
+        self.plugin_importer = None
+        # 本地镜像: 共享插件目录提供清单文件时增量同步到本地后从本地加载
+        self.use_plugin_mirror = True
+        self.plugin_mirror = None
+        self.active_plugins_dir = None
+        # 插件发现线程数 (None表示使用默认值)
+        self.discovery_workers = None
+        # 加载性能统计 (记录内存变化会明显拖慢导入，默认关闭)
+        self.profile_memory = False
+        self.profiler = LoadProfiler()
+        # 共享菜单模型，与旧版 cfa_tools 插件注册到同一个菜单
+        self.menu = menu_model.get_shared_menu(self.menu_name, "CFA Tools")
+        # 每个插件的子菜单描述，未变化的插件复用同一对象，同步菜单时直接跳过
+        self.plugin_menus = {}
+        # 热重载: 计时器每隔 hot_reload_interval 秒在主线程中轮询一次插件目录
+        self.hot_reload_interval = 2.0
+        self.hot_reload_timer = None
+        self.plugin_watcher = None
+        self._hot_reload_generation = 0
+        # 启动方式: deferred 先显示占位菜单再分批加载插件; sync 同步加载 (batch/mayapy下总是同步)
+        self.startup_mode = os.environ.get('CFA_TOOLS_STARTUP_MODE', 'deferred')
+        self.startup_batch_size = 5
+        self.startup_callbacks = []
+        self._pending_specs = None
         
     def get_plugins_directory(self):
-        """获取插件目录路径"""
+        """获取加载插件使用的目录 (已同步本地镜像时为镜像目录)"""
+        if self.active_plugins_dir is not None:
+            return self.active_plugins_dir
+        return self.get_share_plugins_directory()
+    
+    def get_share_plugins_directory(self):
+        """获取框架所在位置 (通常是网络共享) 的插件目录路径"""
         # 获取当前框架文件所在目录
         framework_dir = os.path.dirname(os.path.abspath(__file__))
         plugins_dir = os.path.join(framework_dir, self.plugins_dir)
         return plugins_dir
     
+    def get_plugin_path(self, plugin_name):
+        """获取插件源文件路径"""
+        return os.path.join(self.get_plugins_directory(), plugin_name + '.py')
+    
+    def get_cache_directory(self):
+        """获取缓存目录 (优先使用Maya用户偏好目录，否则放在框架目录下)"""
+        try:
+            prefs_dir = cmds.internalVar(userPrefDir=True)
+        except Exception:
+            prefs_dir = None
+        
+        if not prefs_dir:
+            prefs_dir = os.path.dirname(os.path.abspath(__file__))
+        return os.path.join(prefs_dir, 'cfa_tools_cache')
+    
+    def get_plugin_cache(self):
+        """获取插件清单缓存，首次使用时从磁盘读取"""
+        if self.plugin_cache is None:
+            cache_path = os.path.join(self.get_cache_directory(), 'plugin_manifest.json')
+            self.plugin_cache = PluginManifestCache(cache_path)
+            self.plugin_cache.load()
+        return self.plugin_cache
+    
+    def set_active_plugins_directory(self, plugins_dir):
+        """切换加载插件使用的目录"""
+        if plugins_dir == self.active_plugins_dir:
+            return
+        self.active_plugins_dir = plugins_dir
+        self.plugin_importer = None
+        self.plugin_watcher = None
+    
+    def sync_plugin_mirror(self):
+        """同步插件本地镜像，返回镜像内容是否有变化
+        
+        共享目录没有清单文件或同步失败时直接从共享目录加载插件
+        """
+        if not self.use_plugin_mirror:
+            self.set_active_plugins_directory(None)
+            return False
+        
+        if self.plugin_mirror is None:
+            self.plugin_mirror = PluginMirror(
+                self.get_share_plugins_directory(),
+                os.path.join(self.get_cache_directory(), 'plugins_mirror')
+            )
+        
+        if not self.plugin_mirror.available():
+            self.set_active_plugins_directory(None)
+            return False
+        
+        try:
+            result = self.plugin_mirror.sync()
+        except (MirrorError, OSError) as e:
+            print(f"插件镜像同步失败，直接从共享目录加载: {str(e)}")
+            self.set_active_plugins_directory(None)
+            return False
+        
+        if result['changed']:
+            print(f"插件镜像已同步: 更新 {len(result['copied'])} 个文件, 删除 {len(result['removed'])} 个文件")
+        self.set_active_plugins_directory(self.plugin_mirror.mirror_dir)
+        return result['changed']
+    
+    def get_plugin_importer(self):
+        """获取插件导入器"""
+        if self.plugin_importer is None:
+            self.plugin_importer = PluginImporter(
+                self.get_plugins_directory(),
+                os.path.join(self.get_cache_directory(), 'bytecode')
+            )
+        return self.plugin_importer
+    
     def discover_plugins(self):
         """发现可用的插件"""
         plugins_dir = self.get_plugins_directory()
@@ -28,8 +180,13 @@ class CFAToolsFramework:
             print(f"插件目录不存在: {plugins_dir}")
             return []
         
+        if self.use_plugin_cache:
+            items = self.get_plugin_cache().list_directory(plugins_dir)
+        else:
+            items = sorted(os.listdir(plugins_dir))
+        
         plugins = []
-        for item in os.listdir(plugins_dir):
+        for item in items:
             if item.endswith('.py') and not item.startswith('__'):
                 plugin_name = item[:-3]  # 移除.py扩展名
                 plugins.append(plugin_name)
@@ -37,107 +194,393 @@ class CFAToolsFramework:
         print(f"发现插件: {plugins}")
         return plugins
     
-    def load_plugin(self, plugin_name):
-        """动态加载插件"""
+    def load_plugin(self, plugin_name, spec=None):
+        """动态加载插件
+        
+        spec 为插件发现阶段准备的描述，其中预编译的代码在源文件未变化时直接使用
+        """
         try:
-            plugins_dir = self.get_plugins_directory()
+            code, source_stat = None, None
+            if spec is not None:
+                code, source_stat = spec['code'], spec['source_stat']
             
-            # 添加插件目录到Python路径
-            if plugins_dir not in sys.path:
-                sys.path.append(plugins_dir)
+            # 动态导入插件模块 (cfa_plugins.<插件名>，不修改sys.path)
+            with self.profiler.measure(plugin_name, 'import'):
+                plugin_module = self.get_plugin_importer().import_plugin(
+                    plugin_name, code=code, source_stat=source_stat
+                )
             
-            # 动态导入插件模块
-            plugin_module = importlib.import_module(plugin_name)
-            
-            # 检查插件是否实现了必要的接口
-            if hasattr(plugin_module, 'get_plugin_info') and hasattr(plugin_module, 'register_commands'):
-                plugin_info = plugin_module.get_plugin_info()
-                
-                # 注册插件命令
-                commands = plugin_module.register_commands()
-                
-                self.loaded_plugins[plugin_name] = {
-                    'module': plugin_module,
-                    'info': plugin_info,
-                    'commands': commands
-                }
-                
+            if self.register_plugin_module(plugin_name, plugin_module):
                 print(f"插件 '{plugin_name}' 加载成功")
                 return True
-            else:
-                print(f"插件 '{plugin_name}' 缺少必要的接口")
-                return False
+            return False
                 
         except Exception as e:
             print(f"加载插件 '{plugin_name}' 失败: {str(e)}")
             return False
     
-    def create_menu(self):
-        """创建统一的CFA Tools菜单"""
-        # 删除已存在的菜单
-        if cmds.menu(self.menu_name, exists=True):
-            cmds.deleteUI(self.menu_name)
+    def register_plugin_module(self, plugin_name, plugin_module):
+        """检查插件接口并登记已导入的插件模块"""
+        # 检查插件是否实现了必要的接口
+        if not (hasattr(plugin_module, 'get_plugin_info') and hasattr(plugin_module, 'register_commands')):
+            print(f"插件 '{plugin_name}' 缺少必要的接口")
+            return False
+        
+        with self.profiler.measure(plugin_name, 'get_plugin_info'):
+            plugin_info = plugin_module.get_plugin_info()
+        
+        # 注册插件命令
+        with self.profiler.measure(plugin_name, 'register_commands'):
+            commands = plugin_module.register_commands()
+        
+        self.loaded_plugins[plugin_name] = {
+            'module': plugin_module,
+            'info': plugin_info,
+            'commands': commands
+        }
+        return True
+    
+    def prepare_plugin_specs(self, plugin_names):
+        """在线程池中并发准备插件描述 (读取、哈希、解析、编译)，返回顺序与输入一致"""
+        cache = self.get_plugin_cache() if self.use_plugin_cache else None
+        plugins = [(plugin_name, self.get_plugin_path(plugin_name)) for plugin_name in plugin_names]
+        return plugin_discovery.prepare_plugin_specs(
+            plugins,
+            cache=cache,
+            static_metadata=self.lazy_loading,
+            max_workers=self.discovery_workers
+        )
+    
+    def cache_plugin_metadata(self, plugin_name):
+        """将已导入插件的信息和命令标签写入缓存，下次启动可直接延迟加载"""
+        if not self.use_plugin_cache:
+            return
+        
+        plugin_data = self.loaded_plugins[plugin_name]
+        metadata = {
+            'info': dict(plugin_data['info']),
+            'commands': [{'label': command['label']} for command in plugin_data['commands']]
+        }
+        try:
+            self.get_plugin_cache().put(self.get_plugin_path(plugin_name), metadata)
+        except OSError as e:
+            print(f"插件 '{plugin_name}' 元数据缓存失败: {str(e)}")
+    
+    def invalidate_plugin_cache(self, plugin_name=None):
+        """使单个插件或全部插件的缓存失效"""
+        cache = self.get_plugin_cache()
+        if plugin_name is None:
+            cache.invalidate()
+        else:
+            cache.invalidate(self.get_plugin_path(plugin_name))
+        cache.save()
+    
+    def rebuild_plugin_cache(self):
+        """清空插件缓存并重新创建菜单"""
+        self.invalidate_plugin_cache()
+        self.create_menu()
+        print("插件缓存已重建")
+    
+    def register_lazy_plugin(self, plugin_name, metadata):
+        """根据静态元数据登记插件，命令使用延迟代理"""
+        commands = []
+        for command in metadata['commands']:
+            commands.append({
+                'label': command['label'],
+                'command': LazyCommand(self, plugin_name, command['label'])
+            })
+        
+        self.loaded_plugins[plugin_name] = {
+            'module': None,
+            'info': metadata['info'],
+            'commands': commands
+        }
+        
+        print(f"插件 '{plugin_name}' 已登记 (延迟加载)")
+    
+    def ensure_plugin_loaded(self, plugin_name):
+        """确保插件模块已真正导入，延迟登记的插件导入后与登记时的元数据比较"""
+        plugin_data = self.loaded_plugins.get(plugin_name)
+        if plugin_data is not None and plugin_data['module'] is not None:
+            return True
+        if not self.load_plugin(plugin_name):
+            return False
+        if plugin_data is not None:
+            self.refresh_lazy_plugin(plugin_name, plugin_data)
+        return True
+    
+    def refresh_lazy_plugin(self, plugin_name, lazy_data):
+        """真实的插件信息或命令标签与延迟登记时 (静态元数据或缓存) 不同时，更新缓存并重建该插件的子菜单
+        
+        返回是否有变化
+        """
+        plugin_data = self.loaded_plugins[plugin_name]
+        labels = [command['label'] for command in plugin_data['commands']]
+        lazy_labels = [command['label'] for command in lazy_data['commands']]
+        if labels == lazy_labels and dict(plugin_data['info']) == lazy_data['info']:
+            return False
         
-        # 创建主菜单
-        main_menu = cmds.menu(self.menu_name, label="CFA Tools", parent="MayaWindow")
+        print(f"插件 '{plugin_name}' 的菜单与缓存的元数据不同，已更新")
+        self.cache_plugin_metadata(plugin_name)
+        if self.use_plugin_cache:
+            self.get_plugin_cache().save()
+        if plugin_name in self.plugin_menus:
+            self.create_plugin_submenu(plugin_name)
+            self.apply_menu()
+        return True
+    
+    def create_menu(self):
+        """创建统一的CFA Tools菜单 (与现有菜单比较后只执行必要的修改)"""
+        # 同步创建会取代尚未完成的分批加载
+        self._pending_specs = None
+        self.plugin_menus = {}
+        self.sync_plugin_mirror()
         
         # 发现并加载所有插件
         available_plugins = self.discover_plugins()
         
-        # 为每个插件创建子菜单
-        for plugin_name in available_plugins:
-            if self.load_plugin(plugin_name):
-                self.create_plugin_submenu(main_menu, plugin_name)
+        # 并发准备插件描述，之后在主线程中按顺序创建子菜单
+        plugin_specs = self.prepare_plugin_specs(available_plugins)
         
-        # 添加分隔符
-        cmds.menuItem(divider=True, parent=main_menu)
+        for spec in plugin_specs:
+            self.register_plugin_spec(spec)
         
-        # 添加插件管理器
-        cmds.menuItem(
-            label="插件管理器",
-            parent=main_menu,
-            command=lambda x: self.show_plugin_manager()
-        )
+        self.finish_menu()
+    
+    def register_plugin_spec(self, spec):
+        """根据插件描述登记 (或导入) 插件并创建子菜单描述"""
+        plugin_name = spec['name']
+        self.profiler.record(plugin_name, 'discovery', spec['prepare_time'])
         
-        # 添加关于菜单项
-        cmds.menuItem(
-            label="关于CFA Tools",
-            parent=main_menu,
-            command=lambda x: self.show_about()
-        )
+        if spec['status'] == plugin_discovery.STATUS_INVALID:
+            print(f"跳过插件 '{plugin_name}': {spec['message']}")
+            return False
+        
+        if spec['status'] == plugin_discovery.STATUS_LAZY:
+            self.register_lazy_plugin(plugin_name, spec['metadata'])
+        else:
+            # 元数据无法静态读取的插件立即导入
+            if spec['message']:
+                print(f"插件 '{plugin_name}' {spec['message']}")
+            if not self.load_plugin(plugin_name, spec):
+                return False
+            self.cache_plugin_metadata(plugin_name)
+        
+        with self.profiler.measure(plugin_name, 'submenu'):
+            self.create_plugin_submenu(plugin_name)
+        return True
+    
+    def finish_menu(self):
+        """保存缓存，恢复菜单标题并同步菜单"""
+        if self.use_plugin_cache:
+            self.get_plugin_cache().save()
         
-        print(f"CFA Tools框架菜单已创建，加载了 {len(self.loaded_plugins)} 个插件")
+        self.menu.label = "CFA Tools"
+        self.apply_menu()
+        
+        print(f"CFA Tools框架菜单已创建，登记了 {len(self.loaded_plugins)} 个插件")
+    
+    def build_tool_menu_items(self):
+        """框架自身的菜单项 (插件管理器、热重载开关、关于)"""
+        return [
+            # 添加分隔符
+            menu_model.MenuItemSpec('divider', divider=True),
+            # 添加插件管理器
+            menu_model.MenuItemSpec(
+                'plugin_manager',
+                label="插件管理器",
+                command=menu_model.MenuCallback(self.show_plugin_manager)
+            ),
+            # 添加热重载开关
+            menu_model.MenuItemSpec(
+                'hot_reload',
+                label="插件热重载",
+                check_box=self.hot_reload_timer is not None,
+                command=self.set_hot_reload
+            ),
+            # 添加关于菜单项
+            menu_model.MenuItemSpec(
+                'about',
+                label="关于CFA Tools",
+                command=menu_model.MenuCallback(self.show_about)
+            )
+        ]
+    
+    def apply_menu(self):
+        """把插件子菜单和框架菜单项同步到Maya菜单"""
+        plugin_items = [self.plugin_menus[plugin_name] for plugin_name in sorted(self.plugin_menus)]
+        self.menu.set_section('framework.plugins', plugin_items, order=0)
+        self.menu.set_section('framework.tools', self.build_tool_menu_items(), order=1000)
+        return self.menu.apply(cmds)
+    
+    def remove_menu(self):
+        """移除框架注册的菜单项，菜单中没有其他内容时删除整个菜单"""
+        self.menu.remove_section('framework.plugins')
+        self.menu.remove_section('framework.tools')
+        self.menu.apply(cmds)
     
-    def create_plugin_submenu(self, parent_menu, plugin_name):
-        """为插件创建子菜单"""
+    def create_plugin_submenu(self, plugin_name):
+        """为插件创建子菜单描述"""
         plugin_data = self.loaded_plugins[plugin_name]
         plugin_info = plugin_data['info']
         
-        # 创建插件子菜单
-        submenu = cmds.menuItem(
-            label=plugin_info['name'],
-            subMenu=True,
-            parent=parent_menu,
-            tearOff=True
-        )
-        
         # 添加插件的命令
-        for command in plugin_data['commands']:
-            cmds.menuItem(
+        items = []
+        for index, command in enumerate(plugin_data['commands']):
+            items.append(menu_model.MenuItemSpec(
+                f"command_{index}",
                 label=command['label'],
-                parent=submenu,
                 command=command['command']
-            )
+            ))
         
         # 添加分隔符
-        cmds.menuItem(divider=True, parent=submenu)
+        items.append(menu_model.MenuItemSpec('divider', divider=True))
         
         # 添加插件信息
-        cmds.menuItem(
+        items.append(menu_model.MenuItemSpec(
+            'about',
             label=f"关于 {plugin_info['name']}",
-            parent=submenu,
-            command=lambda x, p=plugin_name: self.show_plugin_info(p)
+            command=menu_model.MenuCallback(self.show_plugin_info, plugin_name)
+        ))
+        
+        submenu = menu_model.MenuItemSpec(
+            plugin_name,
+            label=plugin_info['name'],
+            sub_menu=True,
+            tear_off=True,
+            children=items
+        )
+        self.plugin_menus[plugin_name] = submenu
+        return submenu
+    
+    def remove_plugin(self, plugin_name):
+        """移除插件及其子菜单"""
+        self.plugin_menus.pop(plugin_name, None)
+        self.loaded_plugins.pop(plugin_name, None)
+        self.get_plugin_importer().unload_plugin(plugin_name)
+        if self.use_plugin_cache:
+            self.get_plugin_cache().invalidate(self.get_plugin_path(plugin_name))
+        self.apply_menu()
+        print(f"插件 '{plugin_name}' 已移除")
+    
+    def reload_plugin(self, plugin_name):
+        """重新加载单个插件并重建其子菜单
+        
+        已导入的模块在原模块对象上重新执行源码，尚未导入的插件只重新读取元数据
+        """
+        spec = self.prepare_plugin_specs([plugin_name])[0]
+        if spec['status'] == plugin_discovery.STATUS_INVALID:
+            print(f"重新加载插件 '{plugin_name}' 失败: {spec['message']}")
+            return False
+        
+        plugin_data = self.loaded_plugins.get(plugin_name)
+        plugin_module = plugin_data['module'] if plugin_data is not None else None
+        
+        try:
+            if plugin_module is not None:
+                with self.profiler.measure(plugin_name, 'import'):
+                    plugin_module = self.get_plugin_importer().reload_plugin(plugin_module)
+                if not self.register_plugin_module(plugin_name, plugin_module):
+                    return False
+                self.cache_plugin_metadata(plugin_name)
+            elif spec['status'] == plugin_discovery.STATUS_LAZY:
+                self.register_lazy_plugin(plugin_name, spec['metadata'])
+            elif self.load_plugin(plugin_name, spec):
+                self.cache_plugin_metadata(plugin_name)
+            else:
+                return False
+        except Exception as e:
+            print(f"重新加载插件 '{plugin_name}' 失败: {str(e)}")
+            return False
+        
+        # 只有该插件的子菜单会产生菜单修改
+        self.create_plugin_submenu(plugin_name)
+        self.apply_menu()
+        print(f"插件 '{plugin_name}' 已重新加载")
+        return True
+    
+    def check_plugin_changes(self):
+        """检查插件目录变化，只处理新增、删除和修改的插件"""
+        # 使用本地镜像时先把共享目录的变化同步到镜像
+        self.sync_plugin_mirror()
+        
+        if self.plugin_watcher is None:
+            self.plugin_watcher = PluginWatcher(self.get_plugins_directory())
+            self.plugin_watcher.reset()
+            return False
+        
+        added, removed, changed = self.plugin_watcher.poll()
+        if not (added or removed or changed):
+            return False
+        
+        for plugin_name in removed:
+            if plugin_name in self.loaded_plugins:
+                self.remove_plugin(plugin_name)
+        
+        for plugin_name in added + changed:
+            self.reload_plugin(plugin_name)
+        
+        if self.use_plugin_cache:
+            self.get_plugin_cache().save()
+        return True
+    
+    def _schedule_hot_reload(self):
+        """间隔 hot_reload_interval 秒后把一次轮询排到主线程执行
+        
+        计时器线程只负责等待 (不占用Maya的空闲事件)，文件检查和菜单修改通过
+        maya.utils.executeDeferred 在主线程中进行
+        """
+        import maya.utils
+        timer = threading.Timer(
+            self.hot_reload_interval,
+            maya.utils.executeDeferred,
+            (self._on_hot_reload_timer, self._hot_reload_generation)
         )
+        timer.daemon = True
+        self.hot_reload_timer = timer
+        timer.start()
+    
+    def _on_hot_reload_timer(self, generation):
+        """主线程中的轮询回调，检查完成后重新计时 (热重载已关闭或重新开启时忽略旧的回调)"""
+        if self.hot_reload_timer is None or generation != self._hot_reload_generation:
+            return
+        
+        try:
+            self.check_plugin_changes()
+        except Exception as e:
+            print(f"插件热重载检查失败: {str(e)}")
+        
+        if self.hot_reload_timer is not None and generation == self._hot_reload_generation:
+            self._schedule_hot_reload()
+    
+    def start_hot_reload(self):
+        """开启插件热重载"""
+        if self.hot_reload_timer is not None:
+            return
+        
+        self.plugin_watcher = PluginWatcher(self.get_plugins_directory())
+        self.plugin_watcher.reset()
+        self._hot_reload_generation += 1
+        self._schedule_hot_reload()
+        print("插件热重载已开启")
+    
+    def stop_hot_reload(self):
+        """关闭插件热重载 (已排入主线程的回调在执行时被忽略)"""
+        if self.hot_reload_timer is None:
+            return
+        
+        self.hot_reload_timer.cancel()
+        self.hot_reload_timer = None
+        self._hot_reload_generation += 1
+        print("插件热重载已关闭")
+    
+    def set_hot_reload(self, enabled):
+        """菜单开关回调"""
+        if enabled:
+            self.start_hot_reload()
+        else:
+            self.stop_hot_reload()
+        self.apply_menu()
     
     def show_plugin_manager(self):
         """显示插件管理器"""
@@ -148,15 +591,49 @@ class CFAToolsFramework:
         
         for plugin_name, plugin_data in self.loaded_plugins.items():
             info = plugin_data['info']
-            manager_text += f"• {info['name']} v{info['version']}\n"
+            state = "" if plugin_data['module'] is not None else " (未加载)"
+            manager_text += f"• {info['name']} v{info['version']}{state}\n"
             manager_text += f"  描述: {info['description']}\n"
             manager_text += f"  作者: {info['author']}\n\n"
         
-        cmds.confirmDialog(
+        profile_report = self.profiler.format_report()
+        if profile_report:
+            manager_text += f"加载耗时 (按耗时排序, 单位ms):\n{profile_report}\n"
+        
+        result = cmds.confirmDialog(
             title="CFA Tools 插件管理器",
             message=manager_text,
-            button=["确定"]
+            button=["确定", "重建缓存", "导出性能报告"],
+            defaultButton="确定",
+            cancelButton="确定",
+            dismissString="确定"
         )
+        
+        if result == "重建缓存":
+            self.rebuild_plugin_cache()
+        elif result == "导出性能报告":
+            self.export_profile_report()
+    
+    def export_profile_report(self, file_path=None):
+        """导出插件加载性能报告 (根据扩展名选择JSON或CSV)"""
+        if file_path is None:
+            file_path = cmds.fileDialog2(
+                fileFilter="JSON Files (*.json);;CSV Files (*.csv)",
+                dialogStyle=2,
+                fileMode=0,
+                caption="导出性能报告"
+            )
+            if not file_path:
+                return False
+            file_path = file_path[0]
+        
+        try:
+            self.profiler.export(file_path)
+            print(f"性能报告已导出: {file_path}")
+            return True
+        except OSError as e:
+            print(f"导出性能报告失败: {str(e)}")
+            return False
     
     def show_plugin_info(self, plugin_name):
         """显示插件详细信息"""
@@ -193,15 +670,116 @@ class CFAToolsFramework:
             button=["确定"]
         )
     
+    def use_deferred_startup(self):
+        """是否分批加载插件 (无界面的batch/mayapy会话总是同步加载)"""
+        if self.startup_mode != 'deferred':
+            return False
+        try:
+            return not cmds.about(batch=True)
+        except Exception:
+            return False
+    
+    def add_startup_callback(self, callback):
+        """注册框架初始化完成后的回调，回调参数为 (框架实例, 是否成功)"""
+        self.startup_callbacks.append(callback)
+    
+    def run_startup_callbacks(self, success):
+        """执行初始化完成回调"""
+        for callback in self.startup_callbacks:
+            try:
+                callback(self, success)
+            except Exception as e:
+                print(f"CFA Tools框架初始化完成回调出错: {str(e)}")
+    
+    def start_deferred_startup(self):
+        """先显示占位菜单，之后在空闲时分批加载插件"""
+        self.plugin_menus = {}
+        self.menu.label = "CFA Tools (加载中…)"
+        self.apply_menu()
+        cmds.evalDeferred(self._deferred_discover, lowestPriority=True)
+    
+    def _deferred_discover(self):
+        """分批加载第一步: 发现插件并并发准备插件描述"""
+        try:
+            self.sync_plugin_mirror()
+            self._pending_specs = deque(self.prepare_plugin_specs(self.discover_plugins()))
+        except Exception as e:
+            print(f"CFA Tools框架插件发现失败: {str(e)}")
+            self._finish_deferred_startup(False)
+            return
+        cmds.evalDeferred(self._deferred_load_batch, lowestPriority=True)
+    
+    def _deferred_load_batch(self):
+        """加载一批插件并同步菜单，还有剩余插件时继续排队"""
+        pending = self._pending_specs
+        if pending is None:
+            # 已被同步创建菜单或卸载取消
+            return
+        
+        try:
+            for _ in range(self.startup_batch_size):
+                if not pending:
+                    break
+                self.register_plugin_spec(pending.popleft())
+            self.apply_menu()
+        except Exception as e:
+            print(f"CFA Tools框架加载插件出错: {str(e)}")
+        
+        if pending:
+            cmds.evalDeferred(self._deferred_load_batch, lowestPriority=True)
+        else:
+            self._finish_deferred_startup(True)
+    
+    def _finish_deferred_startup(self, success):
+        """分批加载完成"""
+        self._pending_specs = None
+        try:
+            self.finish_menu()
+        except Exception as e:
+            print(f"CFA Tools框架菜单创建失败: {str(e)}")
+            success = False
+        
+        self.profiler.stop()
+        print(f"CFA Tools框架初始化耗时: {self.profiler.total_time * 1000:.1f} ms")
+        print("CFA Tools框架初始化完成" if success else "CFA Tools框架初始化失败")
+        self.run_startup_callbacks(success)
+    
+    def cancel_deferred_startup(self):
+        """取消尚未完成的分批加载"""
+        self._pending_specs = None
+    
     def initialize_framework(self):
-        """初始化框架"""
+        """初始化框架
+        
+        分批加载模式下立即返回，插件在空闲时陆续加载，全部完成后调用 startup_callbacks
+        """
+        self.profiler = LoadProfiler(trace_memory=self.profile_memory)
+        self.profiler.start()
+        
+        if self.use_deferred_startup():
+            try:
+                self.start_deferred_startup()
+                print("CFA Tools框架开始加载插件")
+                return True
+            except Exception as e:
+                print(f"CFA Tools框架初始化失败: {str(e)}")
+                self.profiler.stop()
+                self.run_startup_callbacks(False)
+                return False
+        
+        success = False
         try:
             self.create_menu()
             print("CFA Tools框架初始化完成")
+            success = True
             return True
         except Exception as e:
             print(f"CFA Tools框架初始化失败: {str(e)}")
             return False
+        finally:
+            self.profiler.stop()
+            print(f"CFA Tools框架初始化耗时: {self.profiler.total_time * 1000:.1f} ms")
+            self.run_startup_callbacks(success)
 
 # 全局框架实例
 cfa_framework_instance = None
@@ -222,9 +800,11 @@ def uninitializePlugin(mobject):
     """Maya插件卸载函数"""
     global cfa_framework_instance
     try:
-        # 删除菜单
-        if cmds.menu("CFAToolsMenu", exists=True):
-            cmds.deleteUI("CFAToolsMenu")
+        if cfa_framework_instance is not None:
+            cfa_framework_instance.cancel_deferred_startup()
+            cfa_framework_instance.stop_hot_reload()
+            # 删除框架的菜单项 (保留其他插件注册的菜单项)
+            cfa_framework_instance.remove_menu()
         
         cfa_framework_instance = None
         print("CFA Tools框架已卸载")
@@ -2,48 +2,53 @@ import maya.cmds as cmds
 import maya.mel as mel
 import os
 
+from cfa_core import menu_model
+
 class CFATools:
     """CFA Tools - ABC导入插件"""
     
     def __init__(self):
         self.plugin_name = "cfa_tools"
         self.menu_name = "CFAToolsMenu"
+        # 与CFA Tools框架共享同一个菜单，只管理自己的分区
+        self.menu = menu_model.get_shared_menu(self.menu_name, "CFA Tools")
     
     def create_menu(self):
         """创建菜单栏"""
-        # 删除已存在的菜单（如果存在）
-        if cmds.menu(self.menu_name, exists=True):
-            cmds.deleteUI(self.menu_name)
-        
-        # 创建主菜单
-        main_menu = cmds.menu(self.menu_name, label="CFA Tools", parent="MayaWindow")
-        
-        # 创建模型插件父级菜单
-        model_plugin_menu = cmds.menuItem(
-            label="模型插件",
-            parent=main_menu,
-            subMenu=True
-        )
-        
-        # 在模型插件菜单下创建ABC导入菜单项
-        cmds.menuItem(
-            label="导入ABC文件",
-            parent=model_plugin_menu,
-            command=lambda x: self.import_abc_file()
-        )
+        items = [
+            # 创建模型插件父级菜单，在其下创建ABC导入菜单项
+            menu_model.MenuItemSpec(
+                'model_plugins',
+                label="模型插件",
+                sub_menu=True,
+                children=[
+                    menu_model.MenuItemSpec(
+                        'import_abc',
+                        label="导入ABC文件",
+                        command=menu_model.MenuCallback(self.import_abc_file)
+                    )
+                ]
+            ),
+            # 添加分隔符
+            menu_model.MenuItemSpec('divider', divider=True),
+            # 添加关于菜单项
+            menu_model.MenuItemSpec(
+                'about',
+                label="关于CFA Tools",
+                command=menu_model.MenuCallback(self.show_about)
+            )
+        ]
         
-        # 添加分隔符
-        cmds.menuItem(divider=True, parent=main_menu)
-        
-        # 添加关于菜单项
-        cmds.menuItem(
-            label="关于CFA Tools",
-            parent=main_menu,
-            command=lambda x: self.show_about()
-        )
+        self.menu.set_section(self.plugin_name, items, order=500)
+        self.menu.apply(cmds)
         
         print("CFA Tools菜单已创建")
     
+    def remove_menu(self):
+        """移除本插件的菜单项，菜单中没有其他内容时删除整个菜单"""
+        self.menu.remove_section(self.plugin_name)
+        self.menu.apply(cmds)
+    
     def import_abc_file(self):
         """导入ABC文件"""
         try:
@@ -126,9 +131,9 @@ def uninitializePlugin(mobject):
     """Maya插件卸载函数"""
     global cfa_tools_instance
     try:
-        # 删除菜单
-        if cmds.menu("CFAToolsMenu", exists=True):
-            cmds.deleteUI("CFAToolsMenu")
+        # 删除本插件的菜单项
+        if cfa_tools_instance is not None:
+            cfa_tools_instance.remove_menu()
         
         cfa_tools_instance = None
         print("CFA Tools插件已卸载")
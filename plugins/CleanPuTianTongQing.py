@@ -1,9 +1,15 @@
 import sys
 import os
+import json
+import time
+import functools
+import timeit
 import maya.cmds as cmds
 import maya.mel as mel
 import maya.api.OpenMaya as om
 
+from cfa_core import scene_signatures
+
 
 def maya_useNewAPI():
     pass
@@ -13,20 +19,88 @@ def syntaxCreator():
     syntax = om.MSyntax()
     syntax.addFlag('sn', 'scriptNode', om.MSyntax.kString)
     syntax.addFlag('sj', 'scriptJob', om.MSyntax.kLong)
+    syntax.addFlag('ls', 'loadSignatures', om.MSyntax.kString)
+    syntax.addFlag('st', 'stats')
+    syntax.addFlag('rs', 'resetStats')
     return syntax
 
 
+class CleanerStats(object):
+    # call counts and cumulative/max time in seconds of the callbacks and cleanup steps
+    timedNames = (
+        'procCallback', 'afterLoadCallback', 'beforeSaveCallback',
+        'overrideProc', 'killScriptJob', 'deleteScriptNode'
+    )
+    counterNames = (
+        'procMatches', 'procsOverridden', 'scriptJobsFound', 'scriptJobsKilled',
+        'scriptNodesFound', 'scriptNodesRemoved', 'userScriptsRemoved'
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.since = time.strftime('%Y-%m-%d %H:%M:%S')
+        self.timings = dict((name, [0, 0.0, 0.0]) for name in self.timedNames)
+        self.counters = dict((name, 0) for name in self.counterNames)
+
+    def addTime(self, name, seconds):
+        timing = self.timings[name]
+        timing[0] += 1
+        timing[1] += seconds
+        if seconds > timing[2]:
+            timing[2] = seconds
+
+    def count(self, name, number=1):
+        self.counters[name] += number
+
+    def toJson(self):
+        timings = {}
+        for name, (calls, total, maximum) in self.timings.items():
+            timings[name] = {
+                'calls': calls,
+                'total': total,
+                'max': maximum,
+                'mean': total / calls if calls else 0.0
+            }
+        return json.dumps(
+            {'since': self.since, 'timings': timings, 'counters': self.counters},
+            sort_keys=True
+        )
+
+
+cleanerStats = CleanerStats()
+
+
+def timed(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            start = timeit.default_timer()
+            try:
+                return func(*args)
+            finally:
+                cleanerStats.addTime(name, timeit.default_timer() - start)
+        return wrapper
+    return decorator
+
+
 class CleanPuTianTongQing(om.MPxCommand):
     kPluginCmdName = "cleanPuTianTongQing"
     callbackIdList = []
-    procList = [
-        'autoUpdatcAttrEd',
-        'autoUpdateAttrEd_SelectSystem',
-        'UI_Mel_Configuration_think',
-        'UI_Mel_Configuration_think_a',
-        'UI_Mel_Configuration_think_b',
-        'autoUpdatoAttrEnd'
-    ]
+    stats = cleanerStats
+    # node, script, proc and scriptJob patterns, see cfa_core/scene_signatures.json
+    signatures = None
+    # procCallback runs on every MEL proc entry and exit, keep the check a set lookup
+    procNames = frozenset()
+    procCallbackId = None
+    cleanupPending = False
+    # remove the proc callback once a cleanup finds nothing, it is added again before the next scene read
+    autoDetach = True
+    # script nodes by MObjectHandle hash: [[handle, attribute/name changed callback ids], ...]
+    scriptNodeIndex = {}
+    # script nodes added, renamed or edited since they were last inspected
+    dirtyScriptNodes = set()
 
     def __init__(self):
         om.MPxCommand.__init__(self)
@@ -38,78 +112,262 @@ class CleanPuTianTongQing(om.MPxCommand):
     def doIt(self, args):
         argData = om.MArgParser(self.syntax(), args)
 
-        if argData.isFlagSet('sn'):
+        if argData.isFlagSet('st') or argData.isFlagSet('rs'):
+            # -stats returns the counters as JSON, -resetStats clears them afterwards
+            if argData.isFlagSet('st'):
+                self.setResult(CleanPuTianTongQing.stats.toJson())
+            if argData.isFlagSet('rs'):
+                CleanPuTianTongQing.stats.reset()
+
+        elif argData.isFlagSet('sn'):
             flagValue = argData.flagArgumentString('sn', 0)
             if cmds.objExists(flagValue):
                 cmds.delete(flagValue)
+                CleanPuTianTongQing.stats.count('scriptNodesRemoved')
                 print 'delete PuTianTongQing scrpitNode.'
 
         elif argData.isFlagSet('sj'):
             flagValue = argData.flagArgumentInt('sj', 0)
             if cmds.scriptJob(exists=flagValue):
                 cmds.scriptJob(kill=flagValue, force=1)
+                CleanPuTianTongQing.stats.count('scriptJobsKilled')
                 print 'kill PuTianTongQing scrpitJob.'
 
+        elif argData.isFlagSet('ls'):
+            flagValue = argData.flagArgumentString('ls', 0)
+            loaded = CleanPuTianTongQing.loadSignatures(flagValue or None)
+            self.setResult(loaded)
+            if loaded:
+                # recheck every script node against the new signatures
+                CleanPuTianTongQing.rescanScriptNodes()
+                CleanPuTianTongQing.cleanup()
+
+    @staticmethod
+    def loadSignatures(path=None):
+        # a missing or broken signature file must not stop the cleaner,
+        # keep the current signatures or fall back to the built-in copy and return False
+        try:
+            signatures = scene_signatures.load_signatures(path)
+        except scene_signatures.SignatureError as e:
+            fallback = 'current' if CleanPuTianTongQing.signatures is not None else 'built-in'
+            sys.stderr.write("%s, using the %s signatures\n" % (e, fallback))
+            if CleanPuTianTongQing.signatures is None:
+                CleanPuTianTongQing.setSignatures(scene_signatures.builtin_signatures())
+            return False
+        CleanPuTianTongQing.setSignatures(signatures)
+        return True
+
+    @staticmethod
+    def setSignatures(signatures):
+        CleanPuTianTongQing.signatures = signatures
+        CleanPuTianTongQing.procNames = signatures.procs
+
     @staticmethod
+    @timed('overrideProc')
     def overrideProc():
         procNum = 0
-        for proc in CleanPuTianTongQing.procList:
+        for proc in sorted(CleanPuTianTongQing.procNames):
             if mel.eval('whatIs("%s")' % proc) != 'Unknown':
                 mel.eval('global proc %s(){}' % proc)
                 procNum += 1
         if procNum:
+            CleanPuTianTongQing.stats.count('procsOverridden', procNum)
             print 'override PuTianTongQing proc.'
+        return procNum
 
     @staticmethod
+    @timed('killScriptJob')
     def killScriptJob():
+        jobNum = 0
         for job in cmds.scriptJob(listJobs=1):
-            if 'autoUpdatoAttrEnd' in job or 'leukocyte.antivirus' in job:
+            if CleanPuTianTongQing.signatures.match_script_job(job):
                 jobId = job.split(':')[0]
                 cmds.evalDeferred('cmds.cleanPuTianTongQing(sj=%s)' % jobId)
+                jobNum += 1
+        CleanPuTianTongQing.stats.count('scriptJobsFound', jobNum)
+        return jobNum
 
     @staticmethod
+    @timed('deleteScriptNode')
     def deleteScriptNode():
-        for node in cmds.ls(type='script'):
-            if 'vaccine_gene' in node:
+        # only nodes changed since the last pass, see rescanScriptNodes for a full pass
+        nodeNum = 0
+        for node in CleanPuTianTongQing.takeDirtyScriptNodes():
+            # the script body is only queried when the node name matches a rule that checks it
+            rule = CleanPuTianTongQing.signatures.match_script_node(
+                node, lambda: cmds.scriptNode(node, q=1, bs=1)
+            )
+            if rule is None:
+                continue
+            nodeNum += 1
+            if rule['action'] == scene_signatures.ACTION_DELETE:
                 cmds.lockNode(node,l = 0)
                 cmds.delete(node)
+                CleanPuTianTongQing.stats.count('scriptNodesRemoved')
+            else:
+                cmds.scriptNode(node, e=1, bs='')
+                cmds.evalDeferred('cmds.cleanPuTianTongQing(sn="%s")' % node)
+
+            if rule['user_scripts']:
                 _maya_dir = cmds.internalVar(userAppDir=True) + 'scripts'
-                vaccine = _maya_dir + '/vaccine.py'
-                vaccine_pyc = _maya_dir + '/vaccine.pyc'
-                usersetup = _maya_dir + '/userSetup.py'
-                if os.path.exists(vaccine):
-                    os.remove(vaccine)
-                if os.path.exists(vaccine_pyc):
-                    os.remove(vaccine_pyc)
-                if os.path.exists(usersetup):
-                    os.remove(usersetup)
-                continue
-            scriptdata = cmds.scriptNode(node, q=1, bs=1)
-            if not scriptdata:
-                continue
-            if 'MayaMelUIConfigurationFile' in node:
-                if 'PuTianTongQing' in scriptdata or 'fuck_All_U' in scriptdata:
-                    cmds.scriptNode(node, e=1, bs='')
-                    cmds.evalDeferred('cmds.cleanPuTianTongQing(sn="%s")' % node)
+                for fileName in rule['user_scripts']:
+                    filePath = _maya_dir + '/' + fileName
+                    if os.path.exists(filePath):
+                        os.remove(filePath)
+                        CleanPuTianTongQing.stats.count('userScriptsRemoved')
+        CleanPuTianTongQing.stats.count('scriptNodesFound', nodeNum)
+        return nodeNum
+
+    @staticmethod
+    def scriptNodeEntries(key):
+        # hashCode() is not unique, each hash maps to a list of [handle, callback ids]
+        # entries of nodes deleted without a removed callback are dropped on lookup
+        bucket = CleanPuTianTongQing.scriptNodeIndex.get(key)
+        if bucket is None:
+            return []
+        for entry in [entry for entry in bucket if not entry[0].isValid()]:
+            try:
+                om.MMessage.removeCallbacks(entry[1])
+            except RuntimeError:
+                pass
+            bucket.remove(entry)
+        if not bucket:
+            del CleanPuTianTongQing.scriptNodeIndex[key]
+        return bucket
+
+    @staticmethod
+    def indexScriptNode(nodeObj):
+        handle = om.MObjectHandle(nodeObj)
+        key = handle.hashCode()
+        if not any(entry[0] == handle for entry in CleanPuTianTongQing.scriptNodeEntries(key)):
+            callbackIds = [
+                om.MNodeMessage.addAttributeChangedCallback(nodeObj, CleanPuTianTongQing.scriptNodeChangedCallback),
+                om.MNodeMessage.addNameChangedCallback(nodeObj, CleanPuTianTongQing.scriptNodeRenamedCallback)
+            ]
+            CleanPuTianTongQing.scriptNodeIndex.setdefault(key, []).append([handle, callbackIds])
+        CleanPuTianTongQing.dirtyScriptNodes.add(key)
+
+    @staticmethod
+    def unindexScriptNode(nodeObj):
+        handle = om.MObjectHandle(nodeObj)
+        key = handle.hashCode()
+        bucket = CleanPuTianTongQing.scriptNodeEntries(key)
+        for entry in bucket:
+            if entry[0] == handle:
+                om.MMessage.removeCallbacks(entry[1])
+                bucket.remove(entry)
+                break
+        if not bucket:
+            CleanPuTianTongQing.scriptNodeIndex.pop(key, None)
+            CleanPuTianTongQing.dirtyScriptNodes.discard(key)
 
-            if 'uiConfigurationScriptNode' in node:
-                if 'look' in scriptdata:
-                    cmds.scriptNode(node, e=1, bs='')
-                    cmds.evalDeferred('cmds.cleanPuTianTongQing(sn="%s")' % node)
     @staticmethod
+    def clearScriptNodeIndex():
+        for bucket in CleanPuTianTongQing.scriptNodeIndex.values():
+            for handle, callbackIds in bucket:
+                try:
+                    om.MMessage.removeCallbacks(callbackIds)
+                except RuntimeError:
+                    pass
+        CleanPuTianTongQing.scriptNodeIndex = {}
+        CleanPuTianTongQing.dirtyScriptNodes = set()
+
+    @staticmethod
+    def rescanScriptNodes():
+        # index any script node the callbacks missed and mark every node for inspection
+        selection = om.MSelectionList()
+        for node in cmds.ls(type='script'):
+            selection.add(node)
+        for i in range(selection.length()):
+            CleanPuTianTongQing.indexScriptNode(selection.getDependNode(i))
+        CleanPuTianTongQing.dirtyScriptNodes = set(CleanPuTianTongQing.scriptNodeIndex)
+
+    @staticmethod
+    def takeDirtyScriptNodes():
+        # a dirty hash marks every node sharing it, inspecting an extra node is harmless
+        nodes = []
+        for key in CleanPuTianTongQing.dirtyScriptNodes:
+            for handle, callbackIds in CleanPuTianTongQing.scriptNodeEntries(key):
+                if handle.isAlive():
+                    nodes.append(om.MFnDependencyNode(handle.object()).name())
+        CleanPuTianTongQing.dirtyScriptNodes = set()
+        return nodes
+
+    @staticmethod
+    def scriptNodeAddedCallback(nodeObj, clientData):
+        CleanPuTianTongQing.indexScriptNode(nodeObj)
+
+    @staticmethod
+    def scriptNodeRemovedCallback(nodeObj, clientData):
+        CleanPuTianTongQing.unindexScriptNode(nodeObj)
+
+    @staticmethod
+    def scriptNodeChangedCallback(msg, plug, otherPlug, clientData):
+        if msg & om.MNodeMessage.kAttributeSet:
+            CleanPuTianTongQing.dirtyScriptNodes.add(om.MObjectHandle(plug.node()).hashCode())
+
+    @staticmethod
+    def scriptNodeRenamedCallback(nodeObj, prevName, clientData):
+        CleanPuTianTongQing.dirtyScriptNodes.add(om.MObjectHandle(nodeObj).hashCode())
+
+    @staticmethod
+    def cleanup():
+        # returns True when no script job or script node needed cleaning
+        CleanPuTianTongQing.cleanupPending = False
+        CleanPuTianTongQing.overrideProc()
+        found = CleanPuTianTongQing.killScriptJob()
+        found += CleanPuTianTongQing.deleteScriptNode()
+        if not found and CleanPuTianTongQing.autoDetach:
+            CleanPuTianTongQing.removeProcCallback()
+        return not found
+
+    @staticmethod
+    def scheduleCleanup():
+        # any number of proc hits before the next idle share one cleanup
+        if CleanPuTianTongQing.cleanupPending:
+            return
+        CleanPuTianTongQing.cleanupPending = True
+        cmds.evalDeferred(CleanPuTianTongQing.deferredCleanup, lowestPriority=True)
+
+    @staticmethod
+    def deferredCleanup():
+        # skipped when a scene callback already cleaned up after the proc hit
+        if CleanPuTianTongQing.cleanupPending:
+            CleanPuTianTongQing.cleanup()
+
+    @staticmethod
+    def addProcCallback():
+        if CleanPuTianTongQing.procCallbackId is None:
+            CleanPuTianTongQing.procCallbackId = om.MCommandMessage.addProcCallback(
+                CleanPuTianTongQing.procCallback
+            )
+
+    @staticmethod
+    def removeProcCallback():
+        if CleanPuTianTongQing.procCallbackId is not None:
+            om.MMessage.removeCallback(CleanPuTianTongQing.procCallbackId)
+            CleanPuTianTongQing.procCallbackId = None
+
+    @staticmethod
+    @timed('procCallback')
     def procCallback(procName, procID, isProcEntry, procType, clientData):
-        if procName in CleanPuTianTongQing.procList:
-            CleanPuTianTongQing.overrideProc()
-            CleanPuTianTongQing.killScriptJob()
-            CleanPuTianTongQing.deleteScriptNode()
+        if isProcEntry and procName in CleanPuTianTongQing.procNames:
+            CleanPuTianTongQing.stats.count('procMatches')
+            CleanPuTianTongQing.scheduleCleanup()
 
     @staticmethod
+    def beforeReadCallback(clientData):
+        # script nodes of the incoming scene may define the procs before afterLoadCallback runs
+        CleanPuTianTongQing.addProcCallback()
+
+    @staticmethod
+    @timed('afterLoadCallback')
     def afterLoadCallback(clientData):
-        CleanPuTianTongQing.overrideProc()
-        CleanPuTianTongQing.killScriptJob()
-        CleanPuTianTongQing.deleteScriptNode()
+        CleanPuTianTongQing.rescanScriptNodes()
+        CleanPuTianTongQing.cleanup()
 
     @staticmethod
+    @timed('beforeSaveCallback')
     def beforeSaveCallback(clientData):
         CleanPuTianTongQing.killScriptJob()
         CleanPuTianTongQing.deleteScriptNode()
@@ -118,6 +376,7 @@ class CleanPuTianTongQing(om.MPxCommand):
 # Initialize the plug-in
 def initializePlugin(obj):
     plugin = om.MFnPlugin(obj)
+    CleanPuTianTongQing.loadSignatures()
     try:
         plugin.registerCommand(
             CleanPuTianTongQing.kPluginCmdName, CleanPuTianTongQing.creator, syntaxCreator
@@ -128,9 +387,19 @@ def initializePlugin(obj):
         )
         raise
 
+    CleanPuTianTongQing.rescanScriptNodes()
+    CleanPuTianTongQing.callbackIdList.append(
+        om.MDGMessage.addNodeAddedCallback(CleanPuTianTongQing.scriptNodeAddedCallback, 'script')
+    )
     CleanPuTianTongQing.callbackIdList.append(
-        om.MCommandMessage.addProcCallback(CleanPuTianTongQing.procCallback)
+        om.MDGMessage.addNodeRemovedCallback(CleanPuTianTongQing.scriptNodeRemovedCallback, 'script')
     )
+    CleanPuTianTongQing.addProcCallback()
+    for message in (om.MSceneMessage.kBeforeOpen, om.MSceneMessage.kBeforeImport,
+                    om.MSceneMessage.kBeforeReference):
+        CleanPuTianTongQing.callbackIdList.append(
+            om.MSceneMessage.addCallback(message, CleanPuTianTongQing.beforeReadCallback)
+        )
     CleanPuTianTongQing.callbackIdList.append(
         om.MSceneMessage.addCallback(om.MSceneMessage.kAfterSceneReadAndRecordEdits, CleanPuTianTongQing.afterLoadCallback)
     )
@@ -140,6 +409,8 @@ def initializePlugin(obj):
     CleanPuTianTongQing.callbackIdList.append(
         om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeExport, CleanPuTianTongQing.beforeSaveCallback)
     )
+    # check the current session once Maya is idle, the proc callback is removed if it is clean
+    CleanPuTianTongQing.scheduleCleanup()
 
 
 # Uninitialize the plug-in
@@ -148,6 +419,10 @@ def uninitializePlugin(obj):
 
     for id in CleanPuTianTongQing.callbackIdList:
         om.MMessage.removeCallback(id)
+    CleanPuTianTongQing.callbackIdList = []
+    CleanPuTianTongQing.removeProcCallback()
+    CleanPuTianTongQing.clearScriptNodeIndex()
+    CleanPuTianTongQing.cleanupPending = False
 
     try:
         plugin.deregisterCommand(CleanPuTianTongQing.kPluginCmdName)
@@ -1,6 +1,72 @@
 import maya.cmds as cmds
-import maya.mel as mel
+import contextlib
+import glob
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cfa_core import abc_dedup, abc_header, abc_metrics, abc_scene, abc_selection, abc_walker, abc_workers, ogawa
+
+# 归档层级信息缓存 (按 路径+修改时间+大小)，首次使用时创建
+_archive_cache = None
+
+# 文件内容哈希缓存 (按 路径+修改时间+大小)，首次使用时创建
+_content_hash_cache = None
+
+# 最近的导入记录 (文件大小、耗时、DAG节点数和内存变化)，可在批量导入结束时导出为CSV/JSON。
+# 只有单个文件导入时统计DAG节点数 (需要列出整个场景)，批量导入时不统计
+_import_metrics = abc_metrics.ImportMetrics(limit=1000, count_nodes=False)
+
+# 批量导入时内容相同的文件只导入一次，其余创建为第一个文件的实例 (分布式引用模式下为引用)
+DEDUPLICATE_FILES = True
+
+# 导入设置的默认值，保存在 optionVar 中 (名称为 OPTION_VAR_PREFIX + 键)
+IMPORT_SETTINGS_DEFAULTS = {
+    'connect_time': True,          # AlembicNode 连接场景时间 (关闭时停留在当前帧)
+    'create_proxy': False,         # 以gpuCache节点代替完整的几何体
+    'preserve_hierarchy': True,    # 关闭时把几何体移到世界下并删除空组
+    'proxy_threshold_mb': 0.0      # 创建代理时只对不小于此大小的文件使用gpuCache，0表示全部
+}
+OPTION_VAR_PREFIX = 'cfaAbcImport_'
+
+# 批量导入时撤销队列的处理方式
+UNDO_CHUNK = 'chunk'      # 整批导入合并为一步撤销
+UNDO_DISABLE = 'disable'  # 导入期间不记录撤销 (保留之前的撤销队列)
+
+# 批量导入的吞吐模式设置
+THROUGHPUT_SETTINGS = {
+    'suspend_refresh': True,
+    'undo_mode': UNDO_CHUNK,
+    'evaluation_mode': None   # 例如 'off'，导入期间切换为DG求值，避免每次导入重建求值图
+}
+
+# 分布式导入生成的场景如何加入当前场景
+RESULT_REFERENCE = 'reference'
+RESULT_IMPORT = 'import'
+
+# 分布式导入设置，workers 为0时在当前Maya中依次导入
+DISTRIBUTED_SETTINGS = {
+    'workers': 0,
+    'result_mode': RESULT_REFERENCE,
+    'max_retries': 1,
+    'task_timeout': None,
+    'output_dir': None        # 默认为工程目录下的 cfa_abc_scenes
+}
+
+# 批量导入查找文件的设置 (通配符与相对路径或文件名匹配)
+WALK_SETTINGS = {
+    'include': [],            # 例如 ['*_anim*']，为空时包含所有ABC文件
+    'exclude': [],            # 例如 ['*/_old', '*_tmp.abc']，与目录匹配时不进入该目录
+    'latest_only': False,     # 同一资产有多个版本 (v001、v002...) 时只导入最新版本
+    'order': abc_walker.ORDER_PATH   # ORDER_SIZE / ORDER_SIZE_DESC 按文件大小排序
+}
+
+# 工作进程启动方式，None 时使用 mayapy (见 set_worker_launcher)
+_worker_launcher = None
+
+# 选择性导入窗口中列表项对应的对象路径
+_selective_paths = []
+SELECTIVE_LIST_LIMIT = 5000
 
 def get_plugin_info():
     """返回插件信息 - 必需接口"""
@@ -22,9 +88,17 @@ def register_commands():
             'label': '批量导入ABC',
             'command': batch_import_abc
         },
+        {
+            'label': '选择性导入ABC',
+            'command': show_selective_import
+        },
         {
             'label': 'ABC导入设置',
             'command': show_import_settings
+        },
+        {
+            'label': '导出ABC导入报告',
+            'command': export_import_report
         }
     ]
 
@@ -40,18 +114,47 @@ def import_abc_file(*args):
         
         if file_path:
             file_path = file_path[0]
-            print(f"正在导入ABC文件: {file_path}")
             
-            # 确保Alembic插件已加载
-            if not cmds.pluginInfo("AbcImport", query=True, loaded=True):
-                cmds.loadPlugin("AbcImport")
+            # 检查文件头，损坏或格式错误的文件不交给AbcImport
+            check = abc_header.check_abc_file(file_path)
+            if not check['ok']:
+                cmds.confirmDialog(
+                    title="导入错误",
+                    message=f"无法导入 {os.path.basename(file_path)}: {check['reason']}",
+                    button=["确定"]
+                )
+                return
+            
+            settings = load_import_settings()
+            
+            # 导入前预览归档内容 (HDF5格式或读取失败时跳过预览)
+            if check['format'] == abc_header.FORMAT_OGAWA:
+                info = read_archive_preview(file_path)
+                get_archive_cache().save()
+                if info is not None:
+                    message = format_archive_preview(info)
+                    if use_proxy(file_path, settings):
+                        message += "\n\n将以GPU缓存代理 (gpuCache) 导入"
+                    result = cmds.confirmDialog(
+                        title="导入预览",
+                        message=message,
+                        button=["导入", "取消"],
+                        defaultButton="导入",
+                        cancelButton="取消",
+                        dismissString="取消"
+                    )
+                    if result != "导入":
+                        return
+            
+            print(f"正在导入ABC文件: {file_path}")
             
             # 执行ABC导入
-            mel.eval(f'AbcImport -mode import "{file_path}";')
+            run_abc_import(file_path, settings, count_nodes=True)
             
             cmds.confirmDialog(
                 title="导入成功",
-                message=f"ABC文件已成功导入: {os.path.basename(file_path)}",
+                message=(f"ABC文件已成功导入: {os.path.basename(file_path)}\n"
+                         f"{abc_metrics.format_record(_import_metrics.last())}"),
                 button=["确定"]
             )
             
@@ -64,8 +167,8 @@ def import_abc_file(*args):
             button=["确定"]
         )
 
-def batch_import_abc(*args):
-    """批量导入ABC文件"""
+def batch_import_abc(*args, selection=None):
+    """批量导入ABC文件，selection 为对所有文件使用的选择条件 (见 resolve_selection)"""
     try:
         # 打开文件夹选择对话框
         folder_path = cmds.fileDialog2(
@@ -76,40 +179,131 @@ def batch_import_abc(*args):
         
         if folder_path:
             folder_path = folder_path[0]
-            abc_files = []
             
-            # 查找所有ABC文件
-            for file in os.listdir(folder_path):
-                if file.lower().endswith('.abc'):
-                    abc_files.append(os.path.join(folder_path, file))
+            # 递归查找ABC文件 (包括子文件夹)
+            entries = abc_walker.walk_abc_files(folder_path, **WALK_SETTINGS)
+            abc_files = [entry['path'] for entry in entries]
+            signatures = {entry['path']: (entry['mtime'], entry['size']) for entry in entries}
             
             if not abc_files:
                 cmds.confirmDialog(
                     title="未找到文件",
-                    message="在选定文件夹中未找到ABC文件",
+                    message="在选定文件夹 (包括子文件夹) 中未找到ABC文件",
+                    button=["确定"]
+                )
+                return
+            
+            # 并发预检查文件头，损坏或格式错误的文件在导入前剔除
+            abc_files, skipped_files = abc_header.split_prescan_results(
+                abc_header.prescan_abc_files(abc_files)
+            )
+            for skipped_file, reason in skipped_files:
+                print(f"跳过 {os.path.basename(skipped_file)}: {reason}")
+            
+            if not abc_files:
+                cmds.confirmDialog(
+                    title="没有可导入的文件",
+                    message="选定文件夹中的ABC文件都无法导入" + format_skipped_files(skipped_files),
                     button=["确定"]
                 )
                 return
             
-            # 确保Alembic插件已加载
-            if not cmds.pluginInfo("AbcImport", query=True, loaded=True):
-                cmds.loadPlugin("AbcImport")
+            settings = load_import_settings()
             
-            # 批量导入
-            imported_count = 0
-            for abc_file in abc_files:
-                try:
-                    mel.eval(f'AbcImport -mode import "{abc_file}";')
-                    imported_count += 1
-                    print(f"已导入: {os.path.basename(abc_file)}")
-                except Exception as e:
-                    print(f"导入失败 {os.path.basename(abc_file)}: {str(e)}")
+            # 当前场景已导入过、未变化且节点仍在场景中的文件默认跳过 (中断后重新运行时继续导入剩余的文件)
+            journal = get_import_journal()
+            imported_files = []
+            if journal is not None:
+                abc_files, imported_files = journal.split(abc_files, signatures, cmds.objExists)
             
-            cmds.confirmDialog(
+            if not abc_files:
+                result = cmds.confirmDialog(
+                    title="批量导入",
+                    message=f"选定文件夹中的 {len(imported_files)} 个ABC文件都已导入到当前场景且未变化",
+                    button=["全部重新导入", "取消"],
+                    defaultButton="取消",
+                    cancelButton="取消",
+                    dismissString="取消"
+                )
+                if result != "全部重新导入":
+                    return
+                abc_files, imported_files = imported_files, []
+            else:
+                # 导入前预览总数据量和对象数量 (内容重复的文件只计算一次)
+                unique_files, duplicates = split_duplicate_files(abc_files)
+                infos = read_archive_previews(unique_files)
+                message = format_batch_preview(unique_files, infos)
+                proxy_count = sum(1 for path in unique_files if use_proxy(path, settings))
+                if proxy_count:
+                    message += f"\n\n其中 {proxy_count} 个文件将以GPU缓存代理 (gpuCache) 导入"
+                if duplicates:
+                    message += (f"\n\n另有 {len(duplicates)} 个文件与上述文件内容相同，"
+                                f"不重复导入，创建为{format_duplicate_mode()}")
+                buttons = ["导入", "取消"]
+                if imported_files:
+                    message += f"\n\n跳过 {len(imported_files)} 个已导入且未变化的文件"
+                    buttons = ["导入", "全部重新导入", "取消"]
+                
+                result = cmds.confirmDialog(
+                    title="批量导入预览",
+                    message=message,
+                    button=buttons,
+                    defaultButton="导入",
+                    cancelButton="取消",
+                    dismissString="取消"
+                )
+                if result == "全部重新导入":
+                    abc_files, imported_files = abc_files + imported_files, []
+                elif result != "导入":
+                    return
+            
+            # 内容相同的文件只导入第一个 (哈希已缓存，预览后再次查找不需要重新读取文件)
+            abc_files, duplicates = split_duplicate_files(abc_files)
+            
+            # 批量导入 (暂停视口刷新等，显示进度，可在文件之间取消)
+            start_time = time.perf_counter()
+            if DISTRIBUTED_SETTINGS['workers'] > 0:
+                results = distributed_import_abc_files(
+                    abc_files, journal=journal, settings=settings, selection=selection,
+                    **DISTRIBUTED_SETTINGS
+                )
+            else:
+                results = import_abc_files(
+                    abc_files, journal=journal, settings=settings, selection=selection,
+                    **THROUGHPUT_SETTINGS
+                )
+            duplicate_results = []
+            if duplicates:
+                with throughput_mode(**THROUGHPUT_SETTINGS):
+                    duplicate_results = create_duplicate_files(
+                        results, duplicates, journal, DISTRIBUTED_SETTINGS['result_mode']
+                    )
+            elapsed = time.perf_counter() - start_time
+            imported_count = sum(1 for result in results + duplicate_results if result['ok'])
+            collapsed_count = sum(1 for result in duplicate_results if result['ok'])
+            total_count = len(abc_files) + len(duplicates)
+            
+            message = f"成功导入 {imported_count}/{total_count + len(skipped_files)} 个ABC文件"
+            message += f"，用时 {format_duration(elapsed)}"
+            if collapsed_count:
+                message += (f"\n\n合并了 {collapsed_count} 个内容重复的文件 "
+                            f"(创建为{format_duplicate_mode()}，未重复导入)")
+            unfinished_count = total_count - len(results) - len(duplicate_results)
+            if unfinished_count:
+                message += f"\n\n已取消，{unfinished_count} 个文件未导入"
+            if imported_files:
+                message += f"\n\n跳过 {len(imported_files)} 个已导入且未变化的文件"
+            
+            result = cmds.confirmDialog(
                 title="批量导入完成",
-                message=f"成功导入 {imported_count}/{len(abc_files)} 个ABC文件",
-                button=["确定"]
+                message=message + format_skipped_files(skipped_files),
+                button=["确定", "导出报告"],
+                defaultButton="确定",
+                cancelButton="确定",
+                dismissString="确定"
             )
+            if result == "导出报告":
+                export_import_report()
             
     except Exception as e:
         error_msg = f"批量导入ABC文件时出错: {str(e)}"
@@ -120,6 +314,742 @@ def batch_import_abc(*args):
             button=["确定"]
         )
 
+def load_import_settings():
+    """从 optionVar 读取导入设置，没有保存过的项使用默认值"""
+    settings = dict(IMPORT_SETTINGS_DEFAULTS)
+    for key, default in IMPORT_SETTINGS_DEFAULTS.items():
+        name = OPTION_VAR_PREFIX + key
+        if cmds.optionVar(exists=name):
+            settings[key] = type(default)(cmds.optionVar(query=name))
+    return settings
+
+def store_import_settings(settings):
+    """把导入设置保存到 optionVar (随Maya偏好设置保存)"""
+    for key, default in IMPORT_SETTINGS_DEFAULTS.items():
+        value = settings.get(key, default)
+        name = OPTION_VAR_PREFIX + key
+        if isinstance(default, bool):
+            cmds.optionVar(intValue=(name, int(bool(value))))
+        else:
+            cmds.optionVar(floatValue=(name, float(value)))
+
+def use_proxy(file_path, settings):
+    """按设置判断文件是否以gpuCache代理导入"""
+    if not settings['create_proxy']:
+        return False
+    threshold = settings['proxy_threshold_mb'] * 1024 * 1024
+    try:
+        return os.path.getsize(file_path) >= threshold
+    except OSError:
+        return False
+
+def scene_import_options(settings):
+    """传给 abc_scene.import_archive 的参数"""
+    return {
+        'connect_time': settings['connect_time'],
+        'preserve_hierarchy': settings['preserve_hierarchy']
+    }
+
+def resolve_selection(file_path, selection):
+    """把选择条件转换为 abc_scene.import_archive 的参数
+
+    selection 为 {'include': [通配符], 'exclude': [通配符], 'frame_range': (起始帧, 结束帧)}，
+    通配符与对象的完整路径 (例如 /set/tree_01) 或对象名匹配。
+    include 在文件中没有匹配的对象时抛出 abc_selection.SelectionError
+    """
+    options = {}
+    if not selection:
+        return options
+    
+    include = selection.get('include')
+    exclude = selection.get('exclude')
+    if include or exclude:
+        # 有层级信息时按完整路径匹配，HDF5格式的文件只能按对象名匹配
+        info = read_archive_preview(file_path)
+        flags = abc_selection.build_filter_flags(info['objects'] if info else None, include, exclude)
+        if flags is None:
+            raise abc_selection.SelectionError("没有与过滤条件匹配的对象")
+        options.update(flags)
+    
+    if selection.get('frame_range'):
+        options['frame_range'] = list(selection['frame_range'])
+    return options
+
+def run_abc_import(file_path, settings=None, selection=None, count_nodes=None):
+    """按导入设置和选择条件导入单个文件，返回新的顶层节点列表
+
+    以gpuCache代理导入的文件总是包含整个归档。每次导入记录到 _import_metrics，
+    count_nodes 为是否统计导入前后的DAG节点数 (省略时使用 _import_metrics 的设置)
+    """
+    if settings is None:
+        settings = load_import_settings()
+    if use_proxy(file_path, settings):
+        with _import_metrics.measure(cmds, file_path, 'proxy', count_nodes):
+            return abc_scene.create_gpu_cache(cmds, file_path)
+    
+    options = scene_import_options(settings)
+    options.update(resolve_selection(file_path, selection))
+    with _import_metrics.measure(cmds, file_path, 'import', count_nodes):
+        return abc_scene.import_archive(cmds, file_path, **options)
+
+@contextlib.contextmanager
+def throughput_mode(suspend_refresh=True, undo_mode=UNDO_CHUNK, evaluation_mode=None):
+    """导入期间暂停视口刷新、调整撤销队列和求值模式，退出时恢复之前的状态 (导入出错时也会恢复)"""
+    restore_actions = []
+    try:
+        if suspend_refresh:
+            try:
+                already_suspended = cmds.refresh(query=True, suspend=True)
+            except (TypeError, RuntimeError):
+                already_suspended = False
+            if not already_suspended:
+                cmds.refresh(suspend=True)
+                restore_actions.append(lambda: cmds.refresh(suspend=False))
+        
+        if undo_mode == UNDO_DISABLE:
+            if cmds.undoInfo(query=True, state=True):
+                # stateWithoutFlush 不清空已有的撤销队列
+                cmds.undoInfo(stateWithoutFlush=False)
+                restore_actions.append(lambda: cmds.undoInfo(stateWithoutFlush=True))
+        elif undo_mode == UNDO_CHUNK:
+            cmds.undoInfo(openChunk=True, chunkName="CFA批量导入ABC")
+            restore_actions.append(lambda: cmds.undoInfo(closeChunk=True))
+        
+        if evaluation_mode:
+            previous_mode = cmds.evaluationManager(query=True, mode=True)[0]
+            if previous_mode != evaluation_mode:
+                cmds.evaluationManager(mode=evaluation_mode)
+                restore_actions.append(lambda: cmds.evaluationManager(mode=previous_mode))
+        
+        yield
+    finally:
+        for action in reversed(restore_actions):
+            try:
+                action()
+            except Exception as e:
+                print(f"恢复导入前的状态失败: {str(e)}")
+
+class ImportProgress:
+    """批量导入进度窗口，按已导入的数据量估算剩余时间"""
+    
+    def __init__(self, file_paths, title="批量导入ABC"):
+        self.sizes = {}
+        for path in file_paths:
+            try:
+                self.sizes[path] = os.path.getsize(path)
+            except OSError:
+                self.sizes[path] = 0
+        self.total_bytes = sum(self.sizes.values())
+        self.total = len(file_paths)
+        self.title = title
+        self.done = 0
+        self.done_bytes = 0
+        self.start_time = None
+        self.last_seconds = None
+        # 命令行模式下没有进度窗口
+        self.enabled = not cmds.about(batch=True)
+    
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        if self.enabled:
+            cmds.progressWindow(
+                title=self.title,
+                progress=0,
+                maxValue=max(self.total, 1),
+                status=f"准备导入 {self.total} 个文件",
+                isInterruptable=True
+            )
+        return self
+    
+    def __exit__(self, *exc_info):
+        if self.enabled:
+            cmds.progressWindow(endProgress=True)
+    
+    def cancelled(self):
+        return self.enabled and cmds.progressWindow(query=True, isCancelled=True)
+    
+    def remaining_time(self):
+        """剩余时间估算 (秒)，还没有导入完成的文件时返回None"""
+        if not self.done:
+            return None
+        # 按实际经过的时间估算，并行导入时同样适用
+        elapsed = time.perf_counter() - self.start_time
+        if self.total_bytes and self.done_bytes:
+            return elapsed * (self.total_bytes - self.done_bytes) / self.done_bytes
+        return elapsed * (self.total - self.done) / self.done
+    
+    def start_file(self, file_path):
+        self.set_status(f"正在导入 {self.done + 1}/{self.total}: {os.path.basename(file_path)}")
+    
+    def set_status(self, text):
+        if self.enabled:
+            cmds.progressWindow(edit=True, status=text + self._eta_text())
+    
+    def finish_file(self, file_path, seconds):
+        self.done += 1
+        self.done_bytes += self.sizes.get(file_path, 0)
+        self.last_seconds = seconds
+        if self.enabled:
+            cmds.progressWindow(edit=True, progress=self.done)
+    
+    def _eta_text(self):
+        remaining = self.remaining_time()
+        if remaining is None:
+            return ""
+        return (f"\n上一个文件用时 {format_duration(self.last_seconds)}，"
+                f"剩余约 {format_duration(remaining)}")
+
+def import_abc_files(abc_files, suspend_refresh=True, undo_mode=UNDO_CHUNK, evaluation_mode=None,
+                     journal=None, settings=None, selection=None):
+    """依次导入文件，返回每个已处理文件的 {'path', 'ok', 'seconds', 'error', 'roots'}
+
+    在进度窗口中取消时，当前文件导入完成后停止，返回的列表比输入短。
+    journal 为导入日志 (abc_walker.ImportJournal)，每导入完成一个文件记录一次，结束时写入磁盘；
+    settings 为导入设置，省略时从 optionVar 读取；selection 为对所有文件使用的选择条件
+    """
+    if settings is None:
+        settings = load_import_settings()
+    results = []
+    with ImportProgress(abc_files) as progress, \
+            throughput_mode(suspend_refresh, undo_mode, evaluation_mode):
+        for abc_file in abc_files:
+            if progress.cancelled():
+                print(f"批量导入已取消，剩余 {len(abc_files) - len(results)} 个文件")
+                break
+            
+            progress.start_file(abc_file)
+            result = {'path': abc_file, 'ok': False, 'seconds': 0.0, 'error': None, 'roots': []}
+            start = time.perf_counter()
+            try:
+                result['roots'] = run_abc_import(abc_file, settings, selection)
+                result['ok'] = True
+            except Exception as e:
+                result['error'] = str(e)
+            result['seconds'] = time.perf_counter() - start
+            progress.finish_file(abc_file, result['seconds'])
+            results.append(result)
+            
+            if result['ok']:
+                if journal is not None:
+                    journal.record(abc_file, result['roots'])
+                print(f"已导入: {os.path.basename(abc_file)} "
+                      f"({abc_metrics.format_record(_import_metrics.last())})")
+            else:
+                print(f"导入失败 {os.path.basename(abc_file)}: {result['error']}")
+    if journal is not None:
+        journal.flush()
+    return results
+
+def get_import_journal():
+    """当前场景的导入日志，场景未保存时返回None (无法区分不同的未命名场景)"""
+    scene_path = cmds.file(query=True, sceneName=True)
+    if not scene_path:
+        return None
+    journal_dir = os.path.join(get_cache_directory(), 'abc_import_journal')
+    return abc_walker.ImportJournal(abc_walker.journal_path(journal_dir, scene_path))
+
+def set_worker_launcher(launcher):
+    """设置分布式导入的工作进程启动方式 (abc_workers.WorkerLauncher)，None 恢复为 mayapy"""
+    global _worker_launcher
+    _worker_launcher = launcher
+
+def get_worker_output_directory():
+    """分布式导入生成的场景目录 (工程目录下的 cfa_abc_scenes)"""
+    return os.path.join(cmds.workspace(query=True, rootDirectory=True), 'cfa_abc_scenes')
+
+def load_worker_scene(scene_path, source_path, result_mode=RESULT_REFERENCE):
+    """把工作进程生成的场景引用或导入到当前场景，命名空间使用源文件名，返回新的顶层节点列表"""
+    namespace = os.path.splitext(os.path.basename(source_path))[0]
+    if result_mode == RESULT_IMPORT:
+        nodes = cmds.file(scene_path, i=True, namespace=namespace, returnNewNodes=True)
+    else:
+        nodes = cmds.file(scene_path, reference=True, namespace=namespace, returnNewNodes=True)
+    return cmds.ls(nodes or [], assemblies=True, long=True) or []
+
+def distributed_import_abc_files(abc_files, workers=4, result_mode=RESULT_REFERENCE, max_retries=1,
+                                 task_timeout=None, output_dir=None, journal=None, settings=None,
+                                 selection=None):
+    """在 workers 个无界面mayapy进程中并行导入，再把生成的场景引用 (或导入) 到当前场景
+
+    以gpuCache代理导入的文件不需要工作进程，直接在当前场景中创建。
+    返回与 import_abc_files 相同格式的结果 (另有 'output' 为生成的场景)，取消时未开始的文件不包含在内；
+    引用模式下不返回 'roots' (引用的节点不用于创建实例)
+    """
+    if settings is None:
+        settings = load_import_settings()
+    proxy_files = [path for path in abc_files if use_proxy(path, settings)]
+    abc_files = [path for path in abc_files if path not in proxy_files]
+    
+    # 选择条件在当前进程中按层级信息解析，没有匹配对象的文件不交给工作进程
+    task_options = {}
+    unmatched = []
+    for path in abc_files:
+        try:
+            task_options[path] = resolve_selection(path, selection)
+        except abc_selection.SelectionError as e:
+            unmatched.append({'path': path, 'ok': False, 'output': None, 'seconds': 0.0, 'error': str(e)})
+            print(f"导入失败 {os.path.basename(path)}: {str(e)}")
+    abc_files = [path for path in abc_files if path in task_options]
+    
+    pool = abc_workers.WorkerPool(
+        _worker_launcher or abc_workers.MayapyLauncher(),
+        output_dir or get_worker_output_directory(),
+        os.path.join(get_cache_directory(), 'abc_worker_logs'),
+        workers=workers,
+        max_retries=max_retries,
+        task_timeout=task_timeout,
+        import_options=scene_import_options(settings)
+    )
+    
+    with ImportProgress(abc_files, title="分布式导入ABC") as progress:
+        pool.start(abc_files, task_options)
+        reported = 0
+        while True:
+            finished = pool.wait(0.2)
+            completed = pool.completed_results()
+            for result in completed[reported:]:
+                progress.finish_file(result['path'], result['seconds'])
+                if result['ok']:
+                    print(f"已导入: {os.path.basename(result['path'])} "
+                          f"({result['seconds']:.2f}s, 工作进程 {result['worker']})")
+                else:
+                    print(f"导入失败 {os.path.basename(result['path'])}: {result['error']}")
+            reported = len(completed)
+            if finished:
+                break
+            if progress.cancelled():
+                pool.cancel()
+            progress.set_status(f"已完成 {reported}/{len(abc_files)} ({workers} 个工作进程)")
+    
+    # 取消时未开始的文件不计入结果，工作进程无法启动时作为失败的文件返回
+    results = pool.results()
+    if pool.cancelled:
+        results = [result for result in results if result['attempts'] > 0]
+    results.extend(unmatched)
+    
+    # 把生成的场景加入当前场景
+    with throughput_mode(**THROUGHPUT_SETTINGS):
+        if not pool.cancelled:
+            for proxy_file in proxy_files:
+                results.append(import_proxy_file(proxy_file, journal))
+        
+        for result in results:
+            if not result['ok'] or result['output'] is None:
+                continue
+            try:
+                with _import_metrics.measure(cmds, result['path'], 'worker_' + result_mode):
+                    roots = load_worker_scene(result['output'], result['path'], result_mode)
+                if result_mode == RESULT_IMPORT:
+                    result['roots'] = roots
+                if journal is not None:
+                    journal.record(result['path'], roots, output=result['output'])
+            except Exception as e:
+                result['ok'] = False
+                result['error'] = f"无法加载生成的场景: {str(e)}"
+                print(f"导入失败 {os.path.basename(result['path'])}: {result['error']}")
+    if journal is not None:
+        journal.flush()
+    return results
+
+def import_proxy_file(file_path, journal=None):
+    """在当前场景中为文件创建gpuCache代理，返回与 import_abc_files 相同格式的结果"""
+    result = {'path': file_path, 'ok': False, 'output': None, 'seconds': 0.0, 'error': None, 'roots': []}
+    start = time.perf_counter()
+    try:
+        with _import_metrics.measure(cmds, file_path, 'proxy'):
+            result['roots'] = abc_scene.create_gpu_cache(cmds, file_path)
+        result['ok'] = True
+        if journal is not None:
+            journal.record(file_path, result['roots'])
+        print(f"已创建GPU缓存代理: {os.path.basename(file_path)}")
+    except Exception as e:
+        result['error'] = str(e)
+        print(f"导入失败 {os.path.basename(file_path)}: {result['error']}")
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+def get_content_hash_cache():
+    """获取文件内容哈希缓存"""
+    global _content_hash_cache
+    if _content_hash_cache is None:
+        _content_hash_cache = abc_dedup.ContentHashCache(
+            os.path.join(get_cache_directory(), 'abc_content_hash.json')
+        )
+    return _content_hash_cache
+
+def split_duplicate_files(abc_files):
+    """按内容查找重复文件，返回 (要导入的文件列表, {重复文件: 内容相同的第一个文件})"""
+    if not DEDUPLICATE_FILES or len(abc_files) < 2:
+        return abc_files, {}
+    return abc_dedup.find_duplicates(abc_files, get_content_hash_cache())
+
+def create_duplicate_files(results, duplicates, journal=None, result_mode=RESULT_REFERENCE):
+    """为内容重复的文件创建第一个相同文件导入结果的实例 (没有节点列表时再次引用生成的场景)
+
+    results 为 import_abc_files 或 distributed_import_abc_files 的结果，
+    返回相同格式的结果 (另有 'duplicate_of')，第一个文件未处理 (已取消) 的重复文件不包含在内
+    """
+    results_by_path = {result['path']: result for result in results}
+    duplicate_results = []
+    for duplicate_file, original_file in duplicates.items():
+        source = results_by_path.get(original_file)
+        if source is None:
+            continue
+        
+        result = {'path': duplicate_file, 'ok': False, 'seconds': 0.0, 'error': None,
+                  'roots': [], 'duplicate_of': original_file}
+        start = time.perf_counter()
+        try:
+            if not source['ok']:
+                raise RuntimeError(f"内容相同的 {os.path.basename(original_file)} 导入失败")
+            if 'roots' in source:
+                with _import_metrics.measure(cmds, duplicate_file, 'instance'):
+                    nodes = result['roots'] = abc_scene.instance_roots(cmds, source['roots'], duplicate_file)
+            else:
+                with _import_metrics.measure(cmds, duplicate_file, 'worker_' + result_mode):
+                    nodes = load_worker_scene(source['output'], duplicate_file, result_mode)
+            result['ok'] = True
+            if journal is not None:
+                journal.record(duplicate_file, nodes, duplicate_of=original_file)
+            print(f"已创建 {os.path.basename(duplicate_file)} "
+                  f"(与 {os.path.basename(original_file)} 内容相同)")
+        except Exception as e:
+            result['error'] = str(e)
+            print(f"导入失败 {os.path.basename(duplicate_file)}: {result['error']}")
+        result['seconds'] = time.perf_counter() - start
+        duplicate_results.append(result)
+    if journal is not None:
+        journal.flush()
+    return duplicate_results
+
+def format_duplicate_mode():
+    """重复文件的创建方式说明"""
+    if DISTRIBUTED_SETTINGS['workers'] > 0 and DISTRIBUTED_SETTINGS['result_mode'] == RESULT_REFERENCE:
+        return "第一个相同文件生成场景的引用"
+    return "第一个相同文件的实例"
+
+def get_import_metrics():
+    """获取导入记录 (abc_metrics.ImportMetrics)"""
+    return _import_metrics
+
+def export_import_report(*args, file_path=None):
+    """导出最近的导入记录 (根据扩展名选择CSV或JSON)"""
+    if not len(_import_metrics):
+        cmds.confirmDialog(title="导出报告", message="还没有导入记录", button=["确定"])
+        return False
+    
+    if file_path is None:
+        file_path = cmds.fileDialog2(
+            fileFilter="CSV Files (*.csv);;JSON Files (*.json)",
+            dialogStyle=2,
+            fileMode=0,
+            caption="导出ABC导入报告"
+        )
+        if not file_path:
+            return False
+        file_path = file_path[0]
+    
+    try:
+        _import_metrics.export(file_path)
+        print(f"导入报告已导出: {file_path} ({len(_import_metrics)} 条记录)")
+        return True
+    except OSError as e:
+        print(f"导出导入报告失败: {str(e)}")
+        return False
+
+def format_duration(seconds):
+    """格式化时长"""
+    if seconds < 60:
+        return f"{seconds:.1f} 秒"
+    minutes, seconds = divmod(int(seconds), 60)
+    if minutes < 60:
+        return f"{minutes} 分 {seconds} 秒"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} 小时 {minutes} 分"
+
+def format_skipped_files(skipped_files, limit=20):
+    """生成跳过文件及原因的说明文字"""
+    if not skipped_files:
+        return ""
+    
+    text = f"\n\n跳过 {len(skipped_files)} 个文件:"
+    for skipped_file, reason in skipped_files[:limit]:
+        text += f"\n  {os.path.basename(skipped_file)}: {reason}"
+    if len(skipped_files) > limit:
+        text += f"\n  ... 以及其他 {len(skipped_files) - limit} 个文件"
+    return text
+
+def get_cache_directory():
+    """获取缓存目录 (与框架相同，优先使用Maya用户偏好目录)"""
+    try:
+        prefs_dir = cmds.internalVar(userPrefDir=True)
+    except Exception:
+        prefs_dir = None
+    
+    if not prefs_dir:
+        prefs_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(prefs_dir, 'cfa_tools_cache')
+
+def get_archive_cache():
+    """获取归档层级信息缓存"""
+    global _archive_cache
+    if _archive_cache is None:
+        _archive_cache = ogawa.ArchiveInfoCache(
+            os.path.join(get_cache_directory(), 'abc_archive_info.json')
+        )
+    return _archive_cache
+
+def read_archive_preview(file_path):
+    """读取归档的层级、帧范围和数据量，无法读取时返回None"""
+    try:
+        return get_archive_cache().read(file_path)
+    except (OSError, ogawa.OgawaError) as e:
+        print(f"无法读取 {os.path.basename(file_path)} 的层级信息: {str(e)}")
+        return None
+
+def read_archive_previews(file_paths):
+    """在线程池中读取多个归档的信息，返回 {路径: 信息}，读取失败的文件不包含在内"""
+    if not file_paths:
+        return {}
+    
+    workers = min(abc_header.MAX_WORKERS, len(file_paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        infos = dict(zip(file_paths, executor.map(read_archive_preview, file_paths)))
+    get_archive_cache().save()
+    return {path: info for path, info in infos.items() if info is not None}
+
+def format_size(size):
+    """格式化字节数"""
+    if size < 1024:
+        return f"{size} B"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024.0
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+
+def format_frame_range(info):
+    """格式化帧范围，有均匀时间采样时换算为帧，否则显示秒"""
+    if info['start_time'] is None:
+        return "无"
+    if info['fps']:
+        start = info['start_time'] * info['fps']
+        end = info['end_time'] * info['fps']
+        return f"{start:g} - {end:g} 帧 ({info['fps']:g} fps)"
+    return f"{info['start_time']:g} - {info['end_time']:g} 秒"
+
+def estimate_import_cost(infos):
+    """汇总导入规模: {'files', 'bytes', 'objects', 'by_schema'}"""
+    cost = {'files': len(infos), 'bytes': 0, 'objects': 0, 'by_schema': {}}
+    for info in infos:
+        summary = ogawa.summarize(info)
+        cost['bytes'] += info['file_size']
+        cost['objects'] += summary['objects']
+        for schema, count in summary['by_schema'].items():
+            cost['by_schema'][schema] = cost['by_schema'].get(schema, 0) + count
+    return cost
+
+def short_schema(schema):
+    """简短的对象类型名，例如 AbcGeom_PolyMesh_v1 显示为 PolyMesh"""
+    return schema.split('_')[1] if schema.startswith('AbcGeom_') else schema or '未知'
+
+def format_schema_counts(by_schema):
+    """格式化各类型对象数量"""
+    parts = []
+    for schema, count in sorted(by_schema.items(), key=lambda item: -item[1]):
+        parts.append(f"{short_schema(schema)} {count}")
+    return ", ".join(parts)
+
+def format_archive_preview(info, object_limit=15):
+    """生成单个归档的预览说明"""
+    summary = ogawa.summarize(info)
+    text = (
+        f"文件: {os.path.basename(info['path'])}\n"
+        f"大小: {format_size(info['file_size'])}\n"
+        f"帧范围: {format_frame_range(info)}\n"
+        f"对象: {summary['objects']} 个 ({format_schema_counts(summary['by_schema'])})"
+    )
+    
+    # 按数据量列出最大的对象
+    largest = sorted(info['objects'], key=lambda entry: -entry['total_size'])[:object_limit]
+    if largest:
+        text += "\n\n数据量最大的对象:"
+        for entry in largest:
+            text += f"\n  {entry['path']}  {format_size(entry['total_size'])}"
+    return text
+
+def format_batch_preview(file_paths, infos, limit=20):
+    """生成批量导入的预览说明"""
+    cost = estimate_import_cost(list(infos.values()))
+    text = (
+        f"将导入 {len(file_paths)} 个ABC文件\n"
+        f"总大小: {format_size(sum(os.path.getsize(path) for path in file_paths))}\n"
+        f"对象: {cost['objects']} 个 ({format_schema_counts(cost['by_schema'])})"
+    )
+    if len(infos) < len(file_paths):
+        text += f"\n({len(file_paths) - len(infos)} 个文件无法预览层级)"
+    
+    text += "\n"
+    for path in file_paths[:limit]:
+        info = infos.get(path)
+        if info is None:
+            text += f"\n  {os.path.basename(path)}"
+        else:
+            text += (
+                f"\n  {os.path.basename(path)}: {len(info['objects'])} 个对象, "
+                f"{format_frame_range(info)}"
+            )
+    if len(file_paths) > limit:
+        text += f"\n  ... 以及其他 {len(file_paths) - limit} 个文件"
+    return text
+
+def show_selective_import(*args):
+    """显示选择性导入窗口: 从层级列表中选择对象，或输入包含/排除通配符和帧范围"""
+    window = "abc_selective_import_window"
+    
+    if cmds.window(window, exists=True):
+        cmds.deleteUI(window)
+    
+    cmds.window(window, title="选择性导入ABC", width=480)
+    cmds.columnLayout(adjustableColumn=True, rowSpacing=4)
+    
+    cmds.textFieldButtonGrp(
+        "abc_sel_file",
+        label="ABC文件",
+        buttonLabel="浏览...",
+        editable=False,
+        buttonCommand=browse_selective_file
+    )
+    
+    cmds.text(label="对象层级 (选中的对象及其子对象会被导入)", align="left")
+    cmds.textScrollList("abc_sel_objects", allowMultiSelection=True, height=260)
+    
+    cmds.textFieldGrp(
+        "abc_sel_include",
+        label="包含",
+        annotation="对象路径或名称的通配符，以空格分隔，例如 /set/tree_* rock*"
+    )
+    cmds.textFieldGrp(
+        "abc_sel_exclude",
+        label="排除",
+        annotation="对象路径或名称的通配符，以空格分隔"
+    )
+    
+    cmds.checkBoxGrp(
+        "abc_sel_use_range",
+        numberOfCheckBoxes=1,
+        label="限制帧范围",
+        value1=False,
+        changeCommand=lambda value: cmds.floatFieldGrp("abc_sel_range", edit=True, enable=value)
+    )
+    cmds.floatFieldGrp(
+        "abc_sel_range",
+        numberOfFields=2,
+        label="帧范围",
+        value1=1.0,
+        value2=100.0,
+        enable=False
+    )
+    
+    cmds.separator(height=10)
+    cmds.button(label="导入", command=import_selected_objects)
+    cmds.button(
+        label="用以上条件批量导入文件夹",
+        command=lambda *args: batch_import_abc(selection=read_selection_ui(include_list=False))
+    )
+    
+    cmds.showWindow(window)
+
+def browse_selective_file(*args):
+    """选择文件并显示其对象层级"""
+    file_path = cmds.fileDialog2(
+        fileFilter="Alembic Files (*.abc)",
+        dialogStyle=2,
+        caption="选择ABC文件"
+    )
+    if file_path:
+        cmds.textFieldButtonGrp("abc_sel_file", edit=True, text=file_path[0])
+        show_object_hierarchy(file_path[0])
+
+def show_object_hierarchy(file_path):
+    """在列表中显示文件的对象层级，并以文件的帧范围作为默认帧范围"""
+    global _selective_paths
+    cmds.textScrollList("abc_sel_objects", edit=True, removeAll=True)
+    _selective_paths = []
+    
+    info = read_archive_preview(file_path)
+    get_archive_cache().save()
+    if info is None:
+        cmds.textScrollList(
+            "abc_sel_objects", edit=True, append="(无法读取层级，只能使用通配符按对象名过滤)"
+        )
+        return
+    
+    for entry in info['objects'][:SELECTIVE_LIST_LIMIT]:
+        label = (f"{'    ' * entry['depth']}{entry['name']}  "
+                 f"({short_schema(entry['schema'])} {format_size(entry['total_size'])})")
+        cmds.textScrollList("abc_sel_objects", edit=True, append=label)
+        _selective_paths.append(entry['path'])
+    if len(info['objects']) > SELECTIVE_LIST_LIMIT:
+        cmds.textScrollList(
+            "abc_sel_objects", edit=True,
+            append=f"... 以及其他 {len(info['objects']) - SELECTIVE_LIST_LIMIT} 个对象 (请使用通配符)"
+        )
+    
+    if info['start_time'] is not None and info['fps']:
+        cmds.floatFieldGrp(
+            "abc_sel_range", edit=True,
+            value1=info['start_time'] * info['fps'],
+            value2=info['end_time'] * info['fps']
+        )
+
+def read_selection_ui(include_list=True):
+    """从选择性导入窗口读取选择条件"""
+    include = abc_selection.split_patterns(cmds.textFieldGrp("abc_sel_include", query=True, text=True))
+    exclude = abc_selection.split_patterns(cmds.textFieldGrp("abc_sel_exclude", query=True, text=True))
+    
+    if include_list:
+        # 列表中选中的对象按完整路径精确匹配
+        for index in cmds.textScrollList("abc_sel_objects", query=True, selectIndexedItem=True) or []:
+            if index <= len(_selective_paths):
+                include.append(glob.escape(_selective_paths[index - 1]))
+    
+    selection = {'include': include, 'exclude': exclude, 'frame_range': None}
+    if cmds.checkBoxGrp("abc_sel_use_range", query=True, value1=True):
+        start = cmds.floatFieldGrp("abc_sel_range", query=True, value1=True)
+        end = cmds.floatFieldGrp("abc_sel_range", query=True, value2=True)
+        selection['frame_range'] = (min(start, end), max(start, end))
+    return selection
+
+def import_selected_objects(*args):
+    """按窗口中的选择条件导入文件"""
+    file_path = cmds.textFieldButtonGrp("abc_sel_file", query=True, text=True)
+    if not file_path:
+        cmds.confirmDialog(title="未选择文件", message="请先选择ABC文件", button=["确定"])
+        return
+    
+    check = abc_header.check_abc_file(file_path)
+    if not check['ok']:
+        cmds.confirmDialog(
+            title="导入错误",
+            message=f"无法导入 {os.path.basename(file_path)}: {check['reason']}",
+            button=["确定"]
+        )
+        return
+    
+    try:
+        selection = read_selection_ui()
+        roots = run_abc_import(file_path, selection=selection, count_nodes=True)
+        cmds.confirmDialog(
+            title="导入成功",
+            message=(f"已导入 {os.path.basename(file_path)}: {len(roots)} 个顶层节点\n"
+                     f"{abc_metrics.format_record(_import_metrics.last())}"),
+            button=["确定"]
+        )
+    except Exception as e:
+        error_msg = f"导入ABC文件时出错: {str(e)}"
+        print(error_msg)
+        cmds.confirmDialog(title="导入错误", message=error_msg, button=["确定"])
+
 def show_import_settings(*args):
     """显示ABC导入设置对话框"""
     settings_window = "abc_import_settings_window"
@@ -135,26 +1065,37 @@ def show_import_settings(*args):
     cmds.text(label="ABC导入选项", align="center")
     cmds.separator(height=10)
     
+    settings = load_import_settings()
+    
     # 添加设置选项
     cmds.checkBoxGrp(
         "abc_connect_time",
         numberOfCheckBoxes=1,
         label="连接时间",
-        value1=True
+        value1=settings['connect_time']
     )
     
     cmds.checkBoxGrp(
         "abc_create_proxy",
         numberOfCheckBoxes=1,
         label="创建代理几何体",
-        value1=False
+        value1=settings['create_proxy'],
+        annotation="以GPU缓存 (gpuCache) 节点代替完整的几何体"
+    )
+    
+    cmds.floatFieldGrp(
+        "abc_proxy_threshold",
+        numberOfFields=1,
+        label="代理阈值 (MB)",
+        value1=settings['proxy_threshold_mb'],
+        annotation="只对不小于此大小的文件创建代理，0表示全部"
     )
     
     cmds.checkBoxGrp(
         "abc_preserve_hierarchy",
         numberOfCheckBoxes=1,
         label="保持层级结构",
-        value1=True
+        value1=settings['preserve_hierarchy']
     )
     
     cmds.separator(height=10)
@@ -174,15 +1115,18 @@ def show_import_settings(*args):
 def save_import_settings(*args):
     """保存导入设置"""
     try:
-        connect_time = cmds.checkBoxGrp("abc_connect_time", query=True, value1=True)
-        create_proxy = cmds.checkBoxGrp("abc_create_proxy", query=True, value1=True)
-        preserve_hierarchy = cmds.checkBoxGrp("abc_preserve_hierarchy", query=True, value1=True)
+        settings = {
+            'connect_time': cmds.checkBoxGrp("abc_connect_time", query=True, value1=True),
+            'create_proxy': cmds.checkBoxGrp("abc_create_proxy", query=True, value1=True),
+            'proxy_threshold_mb': max(0.0, cmds.floatFieldGrp("abc_proxy_threshold", query=True, value1=True)),
+            'preserve_hierarchy': cmds.checkBoxGrp("abc_preserve_hierarchy", query=True, value1=True)
+        }
+        store_import_settings(settings)
         
-        # 这里可以保存设置到配置文件
         print(f"ABC导入设置已保存:")
-        print(f"  连接时间: {connect_time}")
-        print(f"  创建代理几何体: {create_proxy}")
-        print(f"  保持层级结构: {preserve_hierarchy}")
+        print(f"  连接时间: {settings['connect_time']}")
+        print(f"  创建代理几何体: {settings['create_proxy']} (阈值 {settings['proxy_threshold_mb']} MB)")
+        print(f"  保持层级结构: {settings['preserve_hierarchy']}")
         
         cmds.confirmDialog(
             title="设置已保存",
@@ -196,9 +1140,12 @@ def save_import_settings(*args):
 def reset_import_settings(*args):
     """重置导入设置为默认值"""
     try:
-        cmds.checkBoxGrp("abc_connect_time", edit=True, value1=True)
-        cmds.checkBoxGrp("abc_create_proxy", edit=True, value1=False)
-        cmds.checkBoxGrp("abc_preserve_hierarchy", edit=True, value1=True)
+        defaults = IMPORT_SETTINGS_DEFAULTS
+        cmds.checkBoxGrp("abc_connect_time", edit=True, value1=defaults['connect_time'])
+        cmds.checkBoxGrp("abc_create_proxy", edit=True, value1=defaults['create_proxy'])
+        cmds.floatFieldGrp("abc_proxy_threshold", edit=True, value1=defaults['proxy_threshold_mb'])
+        cmds.checkBoxGrp("abc_preserve_hierarchy", edit=True, value1=defaults['preserve_hierarchy'])
+        store_import_settings(defaults)
         
         cmds.confirmDialog(
             title="设置已重置",
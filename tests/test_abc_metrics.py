@@ -0,0 +1,48 @@
+"""cfa_core.abc_metrics - 导入统计"""
+import pytest
+
+from cfa_core import abc_metrics
+
+
+class _FakeCmds:
+    def __init__(self):
+        self.nodes = ['|persp', '|top']
+        self.ls_calls = 0
+
+    def ls(self, dag=False):
+        self.ls_calls += 1
+        return list(self.nodes)
+
+    def memory(self, heapMemory=False, megaByte=False):
+        return 100.0 + len(self.nodes)
+
+
+def test_node_count_disabled_by_default(tmp_path):
+    cmds = _FakeCmds()
+    metrics = abc_metrics.ImportMetrics()
+    with metrics.measure(cmds, str(tmp_path / 'missing.abc')):
+        cmds.nodes.append('|grp')
+    record = metrics.last()
+    assert cmds.ls_calls == 0
+    assert record['ok'] and record['nodes_before'] is None and record['nodes_after'] is None
+    assert record['memory_after'] - record['memory_before'] == 1.0
+    assert '节点' not in abc_metrics.format_record(record)
+
+
+def test_node_count(tmp_path):
+    cmds = _FakeCmds()
+    metrics = abc_metrics.ImportMetrics()
+    with metrics.measure(cmds, str(tmp_path / 'missing.abc'), count_nodes=True):
+        cmds.nodes.append('|grp')
+    assert cmds.ls_calls == 2
+    assert '+1 节点' in abc_metrics.format_record(metrics.last())
+
+
+def test_failed_import_is_recorded(tmp_path):
+    metrics = abc_metrics.ImportMetrics(limit=1, count_nodes=True)
+    with pytest.raises(RuntimeError):
+        with metrics.measure(_FakeCmds(), str(tmp_path / 'missing.abc')):
+            raise RuntimeError('AbcImport failed')
+    record = metrics.last()
+    assert not record['ok'] and record['error'] == 'AbcImport failed'
+    assert record['nodes_after'] == record['nodes_before'] == 2
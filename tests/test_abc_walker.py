@@ -0,0 +1,60 @@
+"""cfa_core.abc_walker - 导入日志"""
+import os
+
+from cfa_core import abc_walker
+
+
+def _write(path, content=b'abc'):
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_journal_checks_recorded_nodes(tmp_path):
+    first = _write(tmp_path / 'a.abc')
+    second = _write(tmp_path / 'b.abc')
+    journal = abc_walker.ImportJournal(str(tmp_path / 'journal.json'))
+    journal.record(first, ['|a_grp'])
+    journal.record(second, ['|b_grp'])
+
+    scene = {'|a_grp'}
+    assert journal.split([first, second]) == ([], [first, second])
+    assert journal.split([first, second], node_exists=scene.__contains__) == ([second], [first])
+
+
+def test_journal_batches_writes(tmp_path):
+    journal_path = str(tmp_path / 'journal.json')
+    files = [_write(tmp_path / f'{index}.abc') for index in range(5)]
+    journal = abc_walker.ImportJournal(journal_path, save_every=3, save_interval=3600)
+
+    journal.record(files[0])
+    journal.record(files[1])
+    assert not os.path.exists(journal_path)
+    journal.record(files[2])
+    assert abc_walker.ImportJournal(journal_path).split(files) == (files[3:], files[:3])
+
+    journal.record(files[3])
+    journal.flush()
+    assert abc_walker.ImportJournal(journal_path).split(files) == (files[4:], files[:4])
+
+
+def test_journal_changed_file(tmp_path):
+    path = _write(tmp_path / 'a.abc')
+    journal = abc_walker.ImportJournal(str(tmp_path / 'journal.json'))
+    journal.record(path)
+    _write(tmp_path / 'a.abc', b'changed')
+    assert not journal.is_imported(path)
+
+
+def test_walk_files_extensions(tmp_path):
+    (tmp_path / 'shot' / '_old').mkdir(parents=True)
+    for name in ['shot/a.ABC', 'shot/b.ma', 'shot/_old/c.abc', 'notes.txt']:
+        _write(tmp_path / name)
+
+    def walk(*args, **options):
+        return [entry['relative_path'] for entry in abc_walker.walk_files(str(tmp_path), *args, **options)]
+
+    assert walk() == ['notes.txt', 'shot/_old/c.abc', 'shot/a.ABC', 'shot/b.ma']
+    assert walk(('.ma',)) == ['shot/b.ma']
+    assert [entry['relative_path'] for entry in abc_walker.walk_abc_files(str(tmp_path), exclude=['_old'])] == [
+        'shot/a.ABC'
+    ]
@@ -0,0 +1,153 @@
+"""cfa_core.abc_workers - 用普通Python运行的假工作进程代替mayapy
+
+假工作进程按文件名决定结果: flaky 第一次失败、broken 总是失败、crash 直接退出，其他文件写出输出场景
+"""
+import os
+import sys
+import textwrap
+
+import pytest
+
+from cfa_core import abc_workers
+
+
+STUB_WORKER = textwrap.dedent('''
+    import json
+    import os
+    import sys
+
+    PREFIX = %r
+
+    def emit(message):
+        sys.stdout.write(PREFIX + json.dumps(message) + '\\n')
+        sys.stdout.flush()
+
+    print('stub worker %%d starting' %% os.getpid())
+    emit({'ready': True, 'pid': os.getpid()})
+    for line in sys.stdin:
+        task = json.loads(line)
+        name = os.path.basename(task['path'])
+        print('importing ' + task['path'])
+        if name.startswith('crash') and task['attempts'] == 1:
+            sys.exit(3)
+        if name.startswith('broken') or (name.startswith('flaky') and task['attempts'] == 1):
+            sys.stderr.write('cannot import ' + name + '\\n')
+            emit({'id': task['id'], 'ok': False, 'error': 'bad file ' + name, 'seconds': 0.0})
+            continue
+        with open(task['output'], 'w') as f:
+            f.write(json.dumps(task['options']))
+        emit({'id': task['id'], 'ok': True, 'error': None, 'seconds': 0.01})
+''') % abc_workers.RESULT_PREFIX
+
+
+class StubLauncher(abc_workers.WorkerLauncher):
+    def __init__(self, script):
+        self.script = script
+
+    def command(self):
+        return [sys.executable, '-u', self.script]
+
+
+@pytest.fixture
+def pool(tmp_path):
+    script = tmp_path / 'stub_worker.py'
+    script.write_text(STUB_WORKER, encoding='utf-8')
+    return abc_workers.WorkerPool(
+        StubLauncher(str(script)), str(tmp_path / 'out'), str(tmp_path / 'logs'),
+        workers=2, max_retries=1, task_timeout=30, startup_timeout=30,
+        import_options={'connect_time': True}
+    )
+
+
+def abc_files(tmp_path, *names):
+    paths = []
+    for name in names:
+        path = tmp_path / 'abc' / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'')
+        paths.append(str(path))
+    return paths
+
+
+def test_results_in_input_order(pool, tmp_path):
+    paths = abc_files(tmp_path, *[f'shot{i:02d}.abc' for i in range(6)])
+    results = pool.run(paths, options={paths[2]: {'connect_time': False}})
+
+    assert [result['path'] for result in results] == paths
+    assert all(result['ok'] and result['attempts'] == 1 for result in results)
+    assert sorted(pool.completed_results(), key=lambda r: paths.index(r['path'])) == results
+    for path, result in zip(paths, results):
+        assert result['output'] == pool.output_path(path)
+        assert os.path.isfile(result['output'])
+    with open(results[2]['output']) as f:
+        assert f.read() == '{"connect_time": false}'
+
+
+def test_retry_bad_file(pool, tmp_path):
+    results = pool.run(abc_files(tmp_path, 'flaky.abc'))
+    assert results[0]['ok']
+    assert results[0]['attempts'] == 2
+    assert results[0]['error'] is None
+
+
+def test_failure_after_retries(pool, tmp_path):
+    paths = abc_files(tmp_path, 'broken.abc', 'good.abc')
+    broken, good = pool.run(paths)
+    assert not broken['ok']
+    assert broken['attempts'] == pool.max_retries + 1
+    assert broken['output'] is None
+    assert broken['error'] == 'bad file broken.abc'
+    assert not os.path.exists(pool.output_path(paths[0]))
+    assert good['ok']
+
+
+def test_worker_restarted_after_crash(pool, tmp_path):
+    pool.workers = 1
+    crash, after = pool.run(abc_files(tmp_path, 'crash.abc', 'after.abc'))
+    assert crash['ok'] and crash['attempts'] == 2
+    assert after['ok']
+    with open(pool.log_path(0), encoding='utf-8') as f:
+        log = f.read()
+    assert '意外退出 (返回值 3)' in log
+    assert log.count('工作进程已就绪') == 2
+
+
+def test_per_worker_logs(pool, tmp_path):
+    paths = abc_files(tmp_path, *[f'broken{i}.abc' for i in range(4)])
+    results = pool.run(paths)
+    workers = {result['worker'] for result in results}
+    assert workers <= {0, 1}
+
+    logs = {}
+    for index in range(pool.workers):
+        with open(pool.log_path(index), encoding='utf-8') as f:
+            logs[index] = f.read()
+    for index in workers:
+        # 标准输出的普通行和标准错误都写入该工作进程自己的日志
+        assert 'stub worker' in logs[index]
+        assert 'cannot import' in logs[index]
+    for result in results:
+        assert os.path.basename(result['path']) in logs[result['worker']]
+
+
+def test_distinct_output_names(pool, tmp_path):
+    first = tmp_path / 'a' / 'shot.abc'
+    second = tmp_path / 'b' / 'shot.abc'
+    for path in (first, second):
+        path.parent.mkdir()
+        path.write_bytes(b'')
+    results = pool.run([str(first), str(second)])
+
+    outputs = [result['output'] for result in results]
+    assert len(set(outputs)) == 2
+    assert all(os.path.basename(output).startswith('shot-') for output in outputs)
+    assert all(os.path.isfile(output) for output in outputs)
+
+
+def test_launch_failure_reported(tmp_path):
+    launcher = StubLauncher(str(tmp_path / 'missing_worker.py'))
+    pool = abc_workers.WorkerPool(launcher, str(tmp_path / 'out'), str(tmp_path / 'logs'),
+                                  workers=1, startup_timeout=30)
+    results = pool.run(abc_files(tmp_path, 'shot.abc'))
+    assert not results[0]['ok']
+    assert '工作进程' in results[0]['error']
@@ -0,0 +1,144 @@
+"""cfa_tools_framework - 使用 benchmarks.fake_maya 在没有Maya的机器上测试框架"""
+import sys
+import textwrap
+import time
+
+import pytest
+
+from benchmarks import fake_maya
+from cfa_core import menu_model
+
+
+PLUGIN_SOURCE = '''
+def get_plugin_info():
+    return {'name': 'Demo', 'version': '1.0', 'description': '', 'author': ''}
+
+def register_commands():
+    return [{'label': %r, 'command': run}]
+
+def run(*args):
+    CALLS.append(args)
+
+CALLS = []
+'''
+
+
+@pytest.fixture
+def cmds(tmp_path, monkeypatch):
+    """安装假的maya模块，测试结束后恢复 sys.modules"""
+    prefs_dir = tmp_path / 'prefs'
+    prefs_dir.mkdir()
+    saved = {name: sys.modules.get(name) for name in ('maya', 'maya.cmds', 'maya.mel', 'maya.utils')}
+    fake_cmds = fake_maya.install(str(prefs_dir))
+    import cfa_tools_framework
+    monkeypatch.setattr(cfa_tools_framework, 'cmds', fake_cmds)
+    yield fake_cmds
+
+    for name in list(sys.modules):
+        if name.startswith('cfa_plugins.'):
+            del sys.modules[name]
+    for name, module in saved.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+
+
+@pytest.fixture
+def framework(cmds, tmp_path):
+    import cfa_tools_framework
+    plugins_dir = tmp_path / 'plugins'
+    plugins_dir.mkdir()
+
+    framework = cfa_tools_framework.CFAToolsFramework()
+    framework.plugins_dir = str(plugins_dir)
+    framework.use_plugin_mirror = False
+    framework.startup_mode = 'sync'
+    framework.menu = menu_model.MenuTree(framework.menu_name, "CFA Tools")
+    return framework
+
+
+def write_plugin(framework, name, label):
+    with open(framework.get_plugin_path(name), 'w', encoding='utf-8') as f:
+        f.write(textwrap.dedent(PLUGIN_SOURCE % label))
+
+
+def menu_labels(framework, plugin_name):
+    submenu = framework.plugin_menus[plugin_name]
+    return [child.label for child in submenu.children if not child.divider]
+
+
+def test_lazy_menu_imports_on_first_click(framework):
+    write_plugin(framework, 'demo', '运行')
+    framework.create_menu()
+    assert framework.loaded_plugins['demo']['module'] is None
+
+    framework.loaded_plugins['demo']['commands'][0]['command']()
+    plugin_data = framework.loaded_plugins['demo']
+    assert plugin_data['module'] is not None
+    assert plugin_data['module'].CALLS == [()]
+
+
+def test_stale_lazy_labels_are_refreshed(framework, cmds):
+    write_plugin(framework, 'demo', '新名称')
+    framework.register_lazy_plugin('demo', {
+        'info': {'name': 'Demo', 'version': '1.0', 'description': '', 'author': ''},
+        'commands': [{'label': '旧名称'}]
+    })
+    framework.create_plugin_submenu('demo')
+    framework.apply_menu()
+    assert menu_labels(framework, 'demo')[0] == '旧名称'
+
+    stale_command = framework.loaded_plugins['demo']['commands'][0]['command']
+    cmds.calls = []
+    stale_command()
+
+    assert menu_labels(framework, 'demo')[0] == '新名称'
+    edits = [kwargs for name, args, kwargs in cmds.calls
+             if name == 'menuItem' and kwargs.get('edit')]
+    assert any(kwargs.get('label') == '新名称' for kwargs in edits)
+
+    cached = framework.get_plugin_cache().get(framework.get_plugin_path('demo'))
+    assert [command['label'] for command in cached['commands']] == ['新名称']
+
+
+def test_matching_lazy_labels_leave_menu_alone(framework, cmds):
+    write_plugin(framework, 'demo', '运行')
+    framework.create_menu()
+    cmds.calls = []
+    framework.loaded_plugins['demo']['commands'][0]['command']()
+    assert not [call for call in cmds.calls if call[0] == 'menuItem']
+
+
+def wait_for_deferred(cmds, timeout=5.0):
+    deadline = time.time() + timeout
+    while not cmds.deferred and time.time() < deadline:
+        time.sleep(0.01)
+    return bool(cmds.deferred)
+
+
+def test_hot_reload_timer(framework, cmds):
+    write_plugin(framework, 'demo', '运行')
+    framework.create_menu()
+    framework.hot_reload_interval = 0.01
+    framework.start_hot_reload()
+    try:
+        # 轮询由计时器排到主线程，没有使用空闲事件
+        assert not [call for call in cmds.calls if call[0] == 'scriptJob']
+        assert wait_for_deferred(cmds)
+        write_plugin(framework, 'second', '第二个')
+        cmds.run_deferred()
+        assert 'second' in framework.plugin_menus
+
+        # 每次轮询后重新计时
+        assert wait_for_deferred(cmds)
+    finally:
+        framework.stop_hot_reload()
+    assert framework.hot_reload_timer is None
+
+    # 关闭后已排队的回调不再轮询
+    write_plugin(framework, 'third', '第三个')
+    cmds.run_deferred()
+    time.sleep(0.05)
+    cmds.run_deferred()
+    assert 'third' not in framework.plugin_menus
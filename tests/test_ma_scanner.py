@@ -0,0 +1,99 @@
+"""cfa_core.ma_scanner - 用小的 .ma 文件检查脚本节点的解析、扫描和清理"""
+import os
+
+import pytest
+
+from cfa_core import ma_scanner
+
+
+HEADER = '//Maya ASCII 2024 scene\n//Name: test.ma\nrequires maya "2024";\n'
+FOOTER = 'createNode transform -n "pCube1";\n\tsetAttr ".t" -type "double3" 0 1 0 ;\n// End of test.ma\n'
+
+SINGLE_LINE_NODE = (
+    'createNode script -n "MayaMelUIConfigurationFile";\n'
+    '\tsetAttr ".b" -type "string" "python(\\"import base64; PuTianTongQing\\")";\n'
+    '\tsetAttr ".st" 1;\n'
+)
+PARENTHESISED_NODE = (
+    'createNode script -n "MayaMelUIConfigurationFile";\n'
+    '\tsetAttr ".b" -type "string" (\n'
+    '\t\t"python(\\"import base64; exec(base64.urlsafe_b64decode(\\\\\\"'
+    'aW1wb3J0IG9z\\\\\\")) # Pu"\n'
+    '\t\t+ "TianTongQing\\")");\n'
+    '\tsetAttr ".st" 1;\n'
+)
+CLEAN_NODE = (
+    'createNode script -n "uiConfigurationScriptNode";\n'
+    '\tsetAttr ".b" -type "string" (\n'
+    '\t\t"// Maya Mel UI Configuration File.\\n"\n'
+    '\t\t+ "//\\n");\n'
+    '\tsetAttr ".st" 3;\n'
+)
+
+
+@pytest.fixture
+def write_scene(tmp_path):
+    def write(*nodes, name='test.ma'):
+        path = tmp_path / name
+        path.write_bytes((HEADER + ''.join(nodes) + FOOTER).encode('utf-8'))
+        return str(path)
+    return write
+
+
+def _node_block(text):
+    return text.encode('utf-8')
+
+
+def test_parse_single_line():
+    script = ma_scanner.parse_before_script(_node_block(SINGLE_LINE_NODE))
+    assert script == 'python("import base64; PuTianTongQing")'
+
+
+def test_parse_parenthesised():
+    script = ma_scanner.parse_before_script(_node_block(PARENTHESISED_NODE))
+    assert script.startswith('python("import base64;')
+    assert script.endswith('# PuTianTongQing")')
+
+
+def test_parse_clean_node():
+    script = ma_scanner.parse_before_script(_node_block(CLEAN_NODE))
+    assert script == '// Maya Mel UI Configuration File.\n//\n'
+
+
+@pytest.mark.parametrize('node', [SINGLE_LINE_NODE, PARENTHESISED_NODE], ids=['single_line', 'parenthesised'])
+def test_scan_infected(write_scene, node):
+    findings = ma_scanner.scan_file(write_scene(CLEAN_NODE, node))
+    assert findings == [{'node': 'MayaMelUIConfigurationFile', 'reason': 'PuTianTongQing'}]
+
+
+def test_scan_clean_file(write_scene, tmp_path):
+    path = write_scene(CLEAN_NODE)
+    assert ma_scanner.scan_file(path) == []
+    assert ma_scanner.clean_file(path, str(tmp_path / 'out' / 'test.ma')) == []
+    assert not (tmp_path / 'out').exists()
+
+
+def test_scan_not_maya_ascii(tmp_path):
+    path = tmp_path / 'binary.ma'
+    path.write_bytes(b'FOR4\x00\x00')
+    with pytest.raises(ma_scanner.ScanError):
+        ma_scanner.scan_file(str(path))
+
+
+def test_clean_copy(write_scene, tmp_path):
+    path = write_scene(SINGLE_LINE_NODE, CLEAN_NODE, PARENTHESISED_NODE)
+    output_path = tmp_path / 'out' / 'test.ma'
+    removed = ma_scanner.clean_file(path, str(output_path))
+    assert [finding['node'] for finding in removed] == ['MayaMelUIConfigurationFile'] * 2
+    assert output_path.read_text(encoding='utf-8') == HEADER + CLEAN_NODE + FOOTER
+    assert ma_scanner.scan_file(str(output_path)) == []
+
+
+def test_scan_tree(write_scene, tmp_path):
+    write_scene(CLEAN_NODE, name='clean.ma')
+    write_scene(PARENTHESISED_NODE, name='infected.ma')
+    results = ma_scanner.scan_tree(str(tmp_path), clean_dir=str(tmp_path / 'out'), workers=1, cache_path=None)
+    assert [(os.path.basename(result['path']), result['infected']) for result in results] == [
+        ('clean.ma', False), ('infected.ma', True)
+    ]
+    assert (tmp_path / 'out' / 'infected.ma').exists()
@@ -0,0 +1,104 @@
+"""cfa_core.menu_model - 比较新旧菜单树后只执行必要的 menuItem 调用"""
+import pytest
+
+from benchmarks.fake_maya import FakeCmds
+from cfa_core import menu_model
+
+
+def items(*labels):
+    return [menu_model.MenuItemSpec(label, label=label, command=menu_model.MenuCallback(print, label))
+            for label in labels]
+
+
+def menu_item_calls(cmds):
+    return [(name, kwargs) for name, args, kwargs in cmds.calls if name in ('menuItem', 'deleteUI')]
+
+
+def applied_labels(menu):
+    return [item.spec.label for _, item in menu.applied]
+
+
+@pytest.fixture
+def cmds(tmp_path):
+    return FakeCmds(str(tmp_path))
+
+
+@pytest.fixture
+def menu(cmds):
+    menu = menu_model.MenuTree('CFAToolsMenu', 'CFA Tools')
+    menu.set_section('framework.plugins', items('a', 'b', 'c', 'd'))
+    assert menu.apply(cmds) == {'create': 4, 'edit': 0, 'delete': 0}
+    cmds.calls = []
+    return menu
+
+
+def test_reapply_is_noop(menu, cmds):
+    menu.set_section('framework.plugins', items('a', 'b', 'c', 'd'))
+    assert menu.apply(cmds) == {'create': 0, 'edit': 0, 'delete': 0}
+    assert menu_item_calls(cmds) == []
+
+
+def test_single_label_edit(menu, cmds):
+    specs = items('a', 'b', 'c', 'd')
+    specs[1] = menu_model.MenuItemSpec('b', label='B', command=specs[1].command)
+    menu.set_section('framework.plugins', specs)
+    assert menu.apply(cmds) == {'create': 0, 'edit': 1, 'delete': 0}
+    assert menu_item_calls(cmds) == [('menuItem', {'edit': True, 'label': 'B'})]
+
+
+def test_reorder_moves_only_items_outside_the_longest_kept_run(menu, cmds):
+    menu.set_section('framework.plugins', items('b', 'c', 'd', 'a'))
+    assert menu.apply(cmds) == {'create': 1, 'edit': 0, 'delete': 1}
+    assert applied_labels(menu) == ['b', 'c', 'd', 'a']
+    created = [kwargs for name, kwargs in menu_item_calls(cmds) if name == 'menuItem']
+    assert created[0]['label'] == 'a'
+    assert created[0]['insertAfter'] == menu.applied[2][1].path
+
+
+def test_insert_and_delete(menu, cmds):
+    menu.set_section('framework.plugins', items('a', 'x', 'c', 'd'))
+    assert menu.apply(cmds) == {'create': 1, 'edit': 0, 'delete': 1}
+    assert applied_labels(menu) == ['a', 'x', 'c', 'd']
+
+
+def test_submenu_child_edit(cmds):
+    def submenu(child_label):
+        return menu_model.MenuItemSpec('demo', label='Demo', sub_menu=True, tear_off=True,
+                                       children=items('run', child_label))
+
+    menu = menu_model.MenuTree('CFAToolsMenu', 'CFA Tools')
+    menu.set_section('framework.plugins', [submenu('one')])
+    assert menu.apply(cmds) == {'create': 3, 'edit': 0, 'delete': 0}
+
+    menu.set_section('framework.plugins', [submenu('two')])
+    assert menu.apply(cmds) == {'create': 1, 'edit': 0, 'delete': 1}
+
+
+def test_shared_sections(menu, cmds):
+    menu.set_section('cfa_tools', items('legacy'), order=500)
+    assert menu.apply(cmds) == {'create': 1, 'edit': 0, 'delete': 0}
+    assert applied_labels(menu) == ['a', 'b', 'c', 'd', 'legacy']
+
+    # 框架重新注册自己的分区不影响旧版插件的菜单项
+    cmds.calls = []
+    menu.set_section('framework.plugins', items('a', 'b'))
+    assert menu.apply(cmds) == {'create': 0, 'edit': 0, 'delete': 2}
+    assert applied_labels(menu) == ['a', 'b', 'legacy']
+
+    # 两个分区中相同的键互不冲突
+    menu.set_section('cfa_tools', items('a'), order=500)
+    assert menu.apply(cmds) == {'create': 1, 'edit': 0, 'delete': 1}
+    assert applied_labels(menu) == ['a', 'b', 'a']
+
+    menu.remove_section('framework.plugins')
+    assert menu.apply(cmds) == {'create': 0, 'edit': 0, 'delete': 2}
+    assert cmds.menu('CFAToolsMenu', exists=True)
+
+    menu.remove_section('cfa_tools')
+    menu.apply(cmds)
+    assert not cmds.menu('CFAToolsMenu', exists=True)
+    assert menu.applied is None
+
+
+def test_shared_menu_is_per_name():
+    assert menu_model.get_shared_menu('TestSharedMenu', 'Test') is menu_model.get_shared_menu('TestSharedMenu', 'X')
@@ -0,0 +1,139 @@
+"""cfa_core.ogawa - 用测试中生成的最小Alembic归档检查读取和损坏文件的处理"""
+import struct
+
+import pytest
+
+from cfa_core import ogawa
+
+
+class _ArchiveWriter:
+    """按Ogawa格式追加组和数据块，最后写入根组偏移"""
+
+    def __init__(self):
+        self.buffer = bytearray(ogawa.OGAWA_MAGIC + b'\xff\x00\x01' + b'\0' * 8)
+
+    def data(self, content):
+        position = len(self.buffer)
+        self.buffer += struct.pack('<Q', len(content)) + content
+        return position | ogawa.DATA_FLAG
+
+    def group(self, children):
+        position = len(self.buffer)
+        self.buffer += struct.pack(f'<Q{len(children)}Q', len(children), *children)
+        return position
+
+    def finish(self, root):
+        self.buffer[8:16] = struct.pack('<Q', root)
+        return bytes(self.buffer)
+
+
+def _object_headers(names):
+    content = b''.join(struct.pack('<I', len(name)) + name.encode() + b'\0' for name in names)
+    return content + b'\0' * ogawa.OBJECT_HEADER_HASH_SIZE
+
+
+def _archive_root(writer, top):
+    time_samplings = struct.pack('<IdId', 1, 1.0, 1, 0.0) + struct.pack('<IdId', 48, 1 / 24.0, 1, 1 / 24.0)
+    return writer.group([
+        writer.data(struct.pack('<i', 1)),
+        writer.data(struct.pack('<i', 10703)),
+        top,
+        writer.data(b'_ai_Application=Maya;_ai_DateWritten=today'),
+        writer.data(time_samplings)
+    ])
+
+
+def build_archive():
+    """/grp/mesh 两层对象，mesh有一个属性数据块"""
+    writer = _ArchiveWriter()
+    properties = writer.group([writer.data(b'x' * 100)])
+    mesh = writer.group([properties, writer.data(_object_headers([]))])
+    grp = writer.group([0, mesh, writer.data(_object_headers(['mesh']))])
+    top = writer.group([0, grp, writer.data(_object_headers(['grp']))])
+    return writer.finish(_archive_root(writer, top))
+
+
+def build_cyclic_archive():
+    """对象grp的子对象组指向顶层对象组自身"""
+    writer = _ArchiveWriter()
+    headers = writer.data(_object_headers(['grp']))
+    top = len(writer.buffer)
+    writer.group([0, top, headers])
+    return writer.finish(_archive_root(writer, top))
+
+
+def build_cyclic_properties_archive():
+    """属性组包含自身"""
+    writer = _ArchiveWriter()
+    properties = len(writer.buffer)
+    writer.group([properties])
+    mesh = writer.group([properties, writer.data(_object_headers([]))])
+    top = writer.group([0, mesh, writer.data(_object_headers(['mesh']))])
+    return writer.finish(_archive_root(writer, top))
+
+
+def build_deep_archive(depth):
+    """depth 层嵌套的对象"""
+    writer = _ArchiveWriter()
+    group = writer.group([0, writer.data(_object_headers([]))])
+    for _ in range(depth):
+        group = writer.group([0, group, writer.data(_object_headers(['child']))])
+    return writer.finish(_archive_root(writer, group))
+
+
+@pytest.fixture
+def write_file(tmp_path):
+    def write(content, name='test.abc'):
+        path = tmp_path / name
+        path.write_bytes(content)
+        return str(path)
+    return write
+
+
+def test_read_archive(write_file):
+    info = ogawa.read_archive(write_file(build_archive()))
+    assert info['archive_version'] == 1
+    assert info['library_version'] == 10703
+    assert info['metadata']['_ai_Application'] == 'Maya'
+    assert info['fps'] == 24.0
+    assert [(entry['path'], entry['depth']) for entry in info['objects']] == [('/grp', 0), ('/grp/mesh', 1)]
+    # 属性数据块 + 空的子对象头 (只有哈希)
+    assert info['objects'][1]['size'] == 100 + ogawa.OBJECT_HEADER_HASH_SIZE
+    assert info['objects'][0]['total_size'] == info['objects'][0]['size'] + info['objects'][1]['size']
+
+
+@pytest.mark.parametrize('length', [4, ogawa.HEADER_SIZE, 40, -8])
+def test_truncated_archive(write_file, length):
+    content = build_archive()
+    with pytest.raises(ogawa.OgawaError):
+        ogawa.read_archive(write_file(content[:length]))
+
+
+def test_not_ogawa(write_file):
+    with pytest.raises(ogawa.OgawaError):
+        ogawa.read_archive(write_file(b'//Maya ASCII 2024 scene\n'))
+
+
+def test_unfrozen_archive(write_file):
+    content = bytearray(build_archive())
+    content[5] = 0
+    with pytest.raises(ogawa.OgawaError):
+        ogawa.read_archive(write_file(bytes(content)))
+
+
+@pytest.mark.parametrize('compute_sizes', [True, False])
+def test_cyclic_objects(write_file, compute_sizes):
+    with pytest.raises(ogawa.OgawaError, match='循环'):
+        ogawa.read_archive(write_file(build_cyclic_archive()), compute_sizes=compute_sizes)
+
+
+def test_cyclic_properties(write_file):
+    with pytest.raises(ogawa.OgawaError, match='循环'):
+        ogawa.read_archive(write_file(build_cyclic_properties_archive()))
+
+
+def test_depth_limit(write_file):
+    info = ogawa.read_archive(write_file(build_deep_archive(ogawa.MAX_DEPTH)))
+    assert len(info['objects']) == ogawa.MAX_DEPTH
+    with pytest.raises(ogawa.OgawaError, match='过深'):
+        ogawa.read_archive(write_file(build_deep_archive(ogawa.MAX_DEPTH + 2)))
@@ -0,0 +1,124 @@
+"""cfa_core.plugin_metadata / plugin_discovery - 插件元数据静态提取"""
+import textwrap
+
+import pytest
+
+from cfa_core import plugin_discovery, plugin_metadata
+
+
+def extract(source):
+    return plugin_metadata.extract_metadata(textwrap.dedent(source))
+
+
+def test_literal_metadata():
+    metadata = extract('''
+        import maya.cmds as cmds
+
+        def get_plugin_info():
+            return {'name': 'Demo', 'version': '1.0', 'tags': ['abc']}
+
+        def register_commands():
+            return [
+                {'label': '第一个', 'command': first},
+                {'label': '第二个', 'command': lambda *args: None},
+            ]
+    ''')
+    assert metadata['info'] == {'name': 'Demo', 'version': '1.0', 'tags': ['abc']}
+    assert metadata['commands'] == [
+        {'label': '第一个', 'function': 'first'},
+        {'label': '第二个', 'function': None},
+    ]
+
+
+def test_module_constants():
+    metadata = extract('''
+        TOOL_NAME = 'Demo'
+        VERSION = '2.' + '1'
+
+        def get_plugin_info():
+            return {'name': TOOL_NAME, 'version': VERSION}
+
+        def register_commands():
+            prefix = 'CFA '
+            commands = [{'label': prefix + TOOL_NAME, 'command': run}]
+            return commands
+    ''')
+    assert metadata['info'] == {'name': 'Demo', 'version': '2.1'}
+    assert metadata['commands'] == [{'label': 'CFA Demo', 'function': 'run'}]
+
+
+@pytest.mark.parametrize('mutation', [
+    "commands.append({'label': 'B', 'command': b})",
+    "commands.extend([{'label': 'B', 'command': b}])",
+    "commands.insert(0, {'label': 'B', 'command': b})",
+    "commands += [{'label': 'B', 'command': b}]",
+    "if DEBUG:\n    commands = [{'label': 'B', 'command': b}]",
+    "for extra in EXTRA:\n    commands.append(extra)",
+    "try:\n    commands = load()\nexcept ImportError:\n    pass",
+], ids=['append', 'extend', 'insert', 'augmented', 'if', 'for', 'try'])
+def test_mutated_list_is_dynamic(mutation):
+    body = textwrap.indent(mutation, ' ' * 4)
+    source = (
+        "def get_plugin_info():\n"
+        "    return {'name': 'Demo'}\n"
+        "\n"
+        "def register_commands():\n"
+        "    commands = [{'label': 'A', 'command': a}]\n"
+        f"{body}\n"
+        "    return commands\n"
+    )
+    with pytest.raises(plugin_metadata.DynamicMetadataError):
+        plugin_metadata.extract_metadata(source)
+
+
+@pytest.mark.parametrize('source', [
+    # 函数调用
+    '''
+    def get_plugin_info():
+        return {'name': get_name()}
+
+    def register_commands():
+        return []
+    ''',
+    # 多个 return
+    '''
+    def get_plugin_info():
+        return {'name': 'Demo'}
+
+    def register_commands():
+        if DEBUG:
+            return []
+        return [{'label': 'A', 'command': a}]
+    ''',
+    # 接口函数在条件语句中定义
+    '''
+    try:
+        from demo_impl import get_plugin_info, register_commands
+    except ImportError:
+        pass
+    ''',
+], ids=['call', 'multiple_returns', 'conditional_import'])
+def test_dynamic_metadata(source):
+    with pytest.raises(plugin_metadata.DynamicMetadataError):
+        extract(source)
+
+
+def test_not_a_plugin():
+    with pytest.raises(plugin_metadata.NotAPluginError):
+        extract('HELPER = 1\n')
+
+
+def test_dynamic_plugin_falls_back_to_import(tmp_path):
+    path = tmp_path / 'dynamic_plugin.py'
+    path.write_text(textwrap.dedent('''
+        def get_plugin_info():
+            return {'name': 'Dynamic'}
+
+        def register_commands():
+            commands = [{'label': 'A', 'command': a}]
+            commands.append({'label': 'B', 'command': b})
+            return commands
+    '''), encoding='utf-8')
+    spec = plugin_discovery.prepare_plugin_spec('dynamic_plugin', str(path))
+    assert spec['status'] == plugin_discovery.STATUS_IMPORT
+    assert spec['metadata'] is None and spec['code'] is not None
@@ -0,0 +1,106 @@
+"""cfa_core.plugin_mirror - 用两个本地临时目录代替网络共享和本地镜像"""
+import os
+
+import pytest
+
+from cfa_core import plugin_mirror
+
+
+@pytest.fixture
+def share(tmp_path):
+    share_dir = tmp_path / 'share'
+    (share_dir / 'icons').mkdir(parents=True)
+    (share_dir / 'a.py').write_text('A = 1\n', encoding='utf-8')
+    (share_dir / 'b.py').write_text('B = 2\n', encoding='utf-8')
+    (share_dir / 'icons' / 'a.png').write_bytes(b'\x89PNG')
+    plugin_mirror.build_manifest(str(share_dir))
+    return share_dir
+
+
+@pytest.fixture
+def mirror(share, tmp_path):
+    return plugin_mirror.PluginMirror(str(share), str(tmp_path / 'mirror'), max_workers=2)
+
+
+def bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+def test_initial_copy(mirror, tmp_path):
+    result = mirror.sync()
+    assert result['changed']
+    assert result['copied'] == ['a.py', 'b.py', 'icons/a.png']
+    assert (tmp_path / 'mirror' / 'icons' / 'a.png').read_bytes() == b'\x89PNG'
+
+
+def test_unchanged_revision_is_noop(mirror):
+    mirror.sync()
+    manifest_stat = os.stat(mirror.local_manifest_path)
+    result = mirror.sync()
+    assert not result['changed'] and result['copied'] == [] and result['removed'] == []
+    assert os.stat(mirror.local_manifest_path).st_mtime == manifest_stat.st_mtime
+
+
+def test_copy_changed_and_delete_removed(mirror, share, tmp_path):
+    mirror.sync()
+    (share / 'a.py').write_text('A = 10\n', encoding='utf-8')
+    bump_mtime(share / 'a.py')
+    (share / 'b.py').unlink()
+    plugin_mirror.build_manifest(str(share))
+
+    result = mirror.sync()
+    assert result['copied'] == ['a.py']
+    assert result['removed'] == ['b.py']
+    assert (tmp_path / 'mirror' / 'a.py').read_text(encoding='utf-8') == 'A = 10\n'
+    assert not (tmp_path / 'mirror' / 'b.py').exists()
+
+
+def test_share_edit_without_new_manifest(mirror, share, tmp_path):
+    mirror.sync()
+    (share / 'a.py').write_text('A = 3\n', encoding='utf-8')
+    bump_mtime(share / 'a.py')
+
+    assert mirror.sync()['copied'] == ['a.py']
+    assert (tmp_path / 'mirror' / 'a.py').read_text(encoding='utf-8') == 'A = 3\n'
+    # 已复制的修改不会在之后的同步中反复复制
+    assert mirror.sync()['copied'] == []
+
+
+def test_corrupted_mirror_copy_is_repaired(mirror, tmp_path):
+    mirror.sync()
+    local = tmp_path / 'mirror' / 'b.py'
+    local.write_text('corrupted\n', encoding='utf-8')
+    (tmp_path / 'mirror' / 'stray.py').write_text('X = 1\n', encoding='utf-8')
+
+    result = mirror.sync()
+    assert result['copied'] == ['b.py']
+    assert result['removed'] == ['stray.py']
+    assert local.read_text(encoding='utf-8') == 'B = 2\n'
+    assert not (tmp_path / 'mirror' / 'stray.py').exists()
+
+
+def test_missing_mirror_file_is_restored(mirror, tmp_path):
+    mirror.sync()
+    (tmp_path / 'mirror' / 'a.py').unlink()
+    assert mirror.sync()['copied'] == ['a.py']
+
+
+def test_path_outside_mirror(mirror):
+    with pytest.raises(plugin_mirror.MirrorError):
+        mirror._local_path('../escape.py')
+
+
+def test_bad_manifest(mirror, share):
+    (share / plugin_mirror.MANIFEST_NAME).write_text('{"version": 99}', encoding='utf-8')
+    with pytest.raises(plugin_mirror.MirrorError):
+        mirror.sync()
+
+
+def test_path_on_other_drive(mirror, monkeypatch):
+    # Windows下路径位于不同盘符时 commonpath 抛出 ValueError
+    def commonpath(paths):
+        raise ValueError("Paths don't have the same drive")
+    monkeypatch.setattr(plugin_mirror.os.path, 'commonpath', commonpath)
+    with pytest.raises(plugin_mirror.MirrorError):
+        mirror._local_path('a.py')
@@ -0,0 +1,123 @@
+"""cfa_core.scene_signatures - 特征库的读取、格式检查和合并正则的匹配"""
+import json
+
+import pytest
+
+from cfa_core import scene_signatures
+
+
+def rule(**fields):
+    data = {'id': 'test', 'node': ['MayaMelUIConfigurationFile']}
+    data.update(fields)
+    return data
+
+
+def database(**fields):
+    data = {'version': 1}
+    data.update(fields)
+    return scene_signatures.SignatureDatabase(data)
+
+
+def test_default_database(monkeypatch):
+    monkeypatch.delenv(scene_signatures.PATH_ENV, raising=False)
+    signatures = scene_signatures.load_signatures()
+    assert 'autoUpdatoAttrEnd' in signatures.procs
+    assert signatures.match_script_node('vaccine_gene', '')['action'] == scene_signatures.ACTION_DELETE
+    assert signatures.match_script_node('MayaMelUIConfigurationFile', 'python("PuTianTongQing")')['id'] == 'PuTianTongQing'
+    assert signatures.match_script_node('MayaMelUIConfigurationFile', '// clean') is None
+    assert signatures.match_script_job('12: event=["SelectionChanged", "autoUpdatoAttrEnd()"]')
+    assert not signatures.match_script_job('13: event=["SelectionChanged", "print 1"]')
+
+
+def test_builtin_copy_matches_default_file():
+    with open(scene_signatures.DEFAULT_PATH, encoding='utf-8') as f:
+        assert json.load(f) == scene_signatures.BUILTIN_SIGNATURES
+    assert scene_signatures.builtin_signatures().digest == scene_signatures.load_signatures(
+        scene_signatures.DEFAULT_PATH).digest
+
+
+def test_load_from_environment(tmp_path, monkeypatch):
+    path = tmp_path / 'signatures.json'
+    path.write_text(json.dumps({'version': 1, 'procs': ['evilProc']}), encoding='utf-8')
+    monkeypatch.setenv(scene_signatures.PATH_ENV, str(path))
+    assert scene_signatures.load_signatures().procs == frozenset(['evilProc'])
+
+
+@pytest.mark.parametrize('content', ['', '{"version": 1', '[]', '{"version": 2}'])
+def test_unreadable_file(tmp_path, content):
+    path = tmp_path / 'signatures.json'
+    path.write_text(content, encoding='utf-8')
+    with pytest.raises(scene_signatures.SignatureError):
+        scene_signatures.load_signatures(str(path))
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(scene_signatures.SignatureError, match='无法读取特征库'):
+        scene_signatures.load_signatures(str(tmp_path / 'missing.json'))
+
+
+@pytest.mark.parametrize('fields', [
+    {'script_nodes': [{'node': ['a']}]},
+    {'script_nodes': [{'id': 'no_node'}]},
+    {'script_nodes': [rule(node=[])]},
+    {'script_nodes': [rule(action='rename')]},
+    {'script_nodes': ['MayaMelUIConfigurationFile']},
+], ids=['missing_id', 'missing_node', 'empty_node', 'bad_action', 'rule_not_object'])
+def test_invalid_rule(fields):
+    with pytest.raises(scene_signatures.SignatureError, match='特征库格式错误'):
+        database(**fields)
+
+
+@pytest.mark.parametrize('fields', [
+    {'script_nodes': [rule(node='MayaMelUIConfigurationFile')]},
+    {'script_nodes': [rule(body=[''])]},
+    {'script_nodes': [rule(body=[None])]},
+    {'procs': 'autoUpdatoAttrEnd'},
+    {'script_jobs': ['']},
+], ids=['string_node', 'empty_body', 'non_string_body', 'string_procs', 'empty_job'])
+def test_bad_pattern(fields):
+    # 字符串会被拆成单个字符、空字符串匹配任何文本，都会误删节点
+    with pytest.raises(scene_signatures.SignatureError):
+        database(**fields)
+
+
+def test_patterns_are_literals():
+    signatures = database(script_nodes=[rule(body=['a.b(c)'])], script_jobs=['leukocyte.antivirus'])
+    assert signatures.match_script_node('MayaMelUIConfigurationFile', 'x = a.b(c)')
+    assert not signatures.match_script_node('MayaMelUIConfigurationFile', 'x = aXb(c)')
+    assert not signatures.match_script_job('leukocyteXantivirus')
+
+
+def test_literal_matcher_reports_overlapping_literals():
+    matcher = scene_signatures.LiteralMatcher(['think', 'think_a', 'Configuration_think_a', 'look'])
+    assert matcher.find('UI_Mel_Configuration_think_a()') == {'think', 'think_a', 'Configuration_think_a'}
+    assert matcher.find('lookthink') == {'look', 'think'}
+    assert matcher.find('') == set()
+    assert matcher.search('a think b')
+    assert not matcher.search('nothing here')
+    assert scene_signatures.LiteralMatcher([]).find('think') == set()
+
+
+def test_combined_rules_first_match_wins():
+    signatures = database(script_nodes=[
+        rule(id='body_rule', node=['ConfigurationFile'], body=['evil']),
+        rule(id='name_rule', node=['MayaMelUI'], action='delete'),
+    ])
+    assert signatures.match_script_node('MayaMelUIConfigurationFile', 'evil()')['id'] == 'body_rule'
+    assert signatures.match_script_node('MayaMelUIConfigurationFile', 'clean()')['id'] == 'name_rule'
+    assert signatures.match_script_node('ConfigurationFile', 'clean()') is None
+
+
+def test_body_only_queried_when_needed():
+    calls = []
+
+    def body():
+        calls.append(1)
+        return 'PuTianTongQing'
+
+    signatures = scene_signatures.builtin_signatures()
+    assert signatures.match_script_node('pCube1', body) is None
+    assert signatures.match_script_node('vaccine_gene', body)['id'] == 'vaccine_gene'
+    assert calls == []
+    assert signatures.match_script_node('MayaMelUIConfigurationFile', body)['id'] == 'PuTianTongQing'
+    assert calls == [1]